@@ -5,6 +5,8 @@ Entry point for intelligent multi-server environment setup
 """
 
 import sys
+import json
+import time
 import argparse
 import logging
 # from typing import Dict, List, Optional  # Currently unused
@@ -12,8 +14,16 @@ from dataclasses import dataclass
 from enum import Enum
 
 from tools.system_detector import SystemDetector
+from tools.detection_cache import DetectionCache
+from tools.telemetry import TelemetrySampler
 from tools.dependency_resolver import DependencyResolver
 from tools.network_scanner import NetworkScanner
+from tools.hostname_resolver import HostnameResolver
+from tools.network_monitor import JsonLinesSink, NetworkMonitor, UnixSocketSink
+from tools.topology_cache import TopologyCache
+from tools.topology_history import TopologyHistory
+from tools.tailscale import TailscaleSource
+from tools.passive_discovery import PassiveListener
 from tools.config_validator import ConfigValidator
 from tools.preconditions import explain_environment
 from tools import __init__ as tools_init  # keep namespace import stable
@@ -87,15 +97,51 @@ class MasterWizard:
         )
     }
 
-    def __init__(self, language: str = "en"):
+    def __init__(self, language: str = "en", scan_engine: str = "asyncio", scan_sweep: str = "full",
+                 cache_max_age: float = TopologyCache.DEFAULT_MAX_AGE, scan_rate: float = None,
+                 scan_max_sockets: int = 256, scan_fingerprint: bool = False, scan_ipv6: bool = False,
+                 tailscale: TailscaleSource = None, passive_window: float = None,
+                 scan_profile: str = None, scan_roles: list = None, scan_trace: str = None,
+                 scan_interfaces: list = None, scan_exclude_interfaces: list = None):
         """Initialize master wizard with language preference."""
         self.language = language
-        self.system_detector = SystemDetector()
-        self.dependency_resolver = DependencyResolver()
-        self.network_scanner = NetworkScanner()
+        # Load and memory samples let health checks see sustained pressure; started by run(),
+        # since only the interactive menu offers a health check
+        self.telemetry = TelemetrySampler()
+        # Static detection results are kept on disk for the current boot
+        detection_cache = DetectionCache(path=DetectionCache.default_path())
+        self.system_detector = SystemDetector(cache=detection_cache, telemetry=self.telemetry)
+        self.dependency_resolver = DependencyResolver(detection_cache=detection_cache)
+        resolver = HostnameResolver(path=HostnameResolver.default_path())
+        # Listen for mDNS/SSDP announcements in the background while the wizard runs
+        self.passive_listener = None
+        if passive_window is not None:
+            self.passive_listener = PassiveListener(resolver=resolver, window=passive_window)
+            self.passive_listener.start()
+        self.network_scanner = NetworkScanner(engine=scan_engine, sweep=scan_sweep,
+                                              cache=TopologyCache(max_age=cache_max_age),
+                                              resolver=resolver,
+                                              history=TopologyHistory(),
+                                              packets_per_second=scan_rate,
+                                              max_concurrency=scan_max_sockets,
+                                              fingerprint=scan_fingerprint,
+                                              ipv6=scan_ipv6,
+                                              tailscale=tailscale,
+                                              passive=self.passive_listener,
+                                              profile=scan_profile,
+                                              roles=scan_roles,
+                                              trace=scan_trace,
+                                              interfaces=scan_interfaces,
+                                              exclude_interfaces=scan_exclude_interfaces)
         self.config_validator = ConfigValidator()
         self.setup_logging()
 
+    def close(self):
+        """Stop the background work started by the wizard."""
+        self.telemetry.stop()
+        if self.passive_listener is not None:
+            self.passive_listener.stop()
+
     def setup_logging(self):
         """Configure logging for the wizard."""
         log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -138,8 +184,17 @@ Available ecosystems: {self.get_network_summary()}
 
     def get_network_summary(self) -> str:
         """Get brief network ecosystem summary."""
+        found = 0
+
+        def show_progress(_server):
+            nonlocal found
+            found += 1
+            print(f"\r🔎 {found} servers found…", end="", flush=True)
+
         try:
-            servers = self.network_scanner.scan_ecosystem()
+            servers = self.network_scanner.scan_ecosystem(on_server=show_progress)
+            if found:
+                print("\r\033[K", end="", flush=True)  # Clear progress line
             return f"{len(servers)} servers discovered"
         except Exception as e:
             self.logger.warning(f"Could not scan network: {e}")
@@ -262,6 +317,8 @@ Available ecosystems: {self.get_network_summary()}
 
     def run(self, dry_run: bool = False):
         """Main wizard execution loop."""
+        # Sample from the start so a health check chosen later has a window of readings
+        self.telemetry.start()
         self.display_banner()
 
         while True:
@@ -286,6 +343,21 @@ Available ecosystems: {self.get_network_summary()}
             input("\nPress Enter to continue / Stiskněte Enter pro pokračování...")
 
 
+def run_monitor(scanner: NetworkScanner, output: str = None, socket_path: str = None):
+    """Run the network monitor in the foreground until interrupted."""
+    sinks = [JsonLinesSink(output or sys.stdout)]
+    if socket_path:
+        sinks.append(UnixSocketSink(socket_path))
+    monitor = NetworkMonitor(scanner, sinks=sinks)
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for sink in sinks:
+            sink.close()
+
+
 def main():
     """Main entry point with argument parsing."""
     parser = argparse.ArgumentParser(
@@ -312,6 +384,134 @@ def main():
         action="store_true",
         help="Simulate execution without making system changes"
     )
+    parser.add_argument(
+        "--scan-engine",
+        choices=list(NetworkScanner.ENGINES),
+        default="asyncio",
+        help="Network scan engine (thread pool or single asyncio event loop)"
+    )
+    parser.add_argument(
+        "--scan-profile",
+        choices=list(NetworkScanner.SCAN_PROFILES),
+        default=None,
+        help="Ports to probe: common only (quick), common then role ports of candidate hosts "
+             "(ecosystem, default), everything at once (full) or the roles given by --scan-roles (custom)"
+    )
+    parser.add_argument(
+        "--scan-roles",
+        nargs="+",
+        default=None,
+        metavar="ROLE",
+        help="Server roles to look for, e.g. database monitoring (default: all)"
+    )
+    parser.add_argument(
+        "--scan-trace",
+        default=None,
+        metavar="FILE",
+        help="Append per-stage timings and every port probe of network scans to FILE as JSON lines"
+    )
+    parser.add_argument(
+        "--scan-interfaces",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help="Scan the subnets of these interfaces concurrently (names or globs, e.g. eth0 'wlan*'; "
+             "'*' for all) instead of only the primary one"
+    )
+    parser.add_argument(
+        "--scan-exclude-interfaces",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help="Scan every interface subnet except these (names or globs, e.g. 'docker*' 'veth*')"
+    )
+    parser.add_argument(
+        "--scan-sweep",
+        choices=list(NetworkScanner.SWEEP_MODES),
+        default="full",
+        help="Subnet sweep: all addresses, ARP neighbors first then the rest in background, or neighbors only"
+    )
+    parser.add_argument(
+        "--scan-rate",
+        type=float,
+        default=None,
+        help="Maximum probe packets per second during network scans (default: unlimited)"
+    )
+    parser.add_argument(
+        "--scan-max-sockets",
+        type=int,
+        default=256,
+        help="Maximum probe sockets open at once during network scans"
+    )
+    parser.add_argument(
+        "--scan-fingerprint",
+        action="store_true",
+        help="Grab service banners (SSH, HTTP, Ollama API) to identify products behind open ports"
+    )
+    parser.add_argument(
+        "--scan-ipv6",
+        action="store_true",
+        help="Also discover IPv6 neighbors and probe dual-stack machines over their faster address family"
+    )
+    parser.add_argument(
+        "--tailscale",
+        action="store_true",
+        help="Discover servers from the Tailscale peer list instead of sweeping the local subnet"
+    )
+    parser.add_argument(
+        "--tailscale-status",
+        default=None,
+        metavar="FILE",
+        help="Read Tailscale peers from a saved `tailscale status --json` output (implies --tailscale)"
+    )
+    parser.add_argument(
+        "--passive",
+        nargs="?",
+        type=float,
+        const=0.0,
+        default=None,
+        metavar="SECONDS",
+        help="Listen for mDNS/SSDP announcements during the wizard and add the announcing hosts to "
+             "discovered topologies; optionally listen at least SECONDS before the first discovery"
+    )
+    parser.add_argument(
+        "--monitor",
+        action="store_true",
+        help="Keep monitoring the network and emit change events as JSON lines until interrupted"
+    )
+    parser.add_argument(
+        "--monitor-output",
+        default=None,
+        help="File receiving monitor events (default: standard output)"
+    )
+    parser.add_argument(
+        "--monitor-socket",
+        default=None,
+        help="Unix socket path broadcasting monitor events to connected clients"
+    )
+    parser.add_argument(
+        "--changes-since",
+        type=float,
+        metavar="HOURS",
+        default=None,
+        help="Print topology changes recorded in the last HOURS as JSON (no rescan) and exit"
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=TopologyCache.DEFAULT_MAX_AGE,
+        help="Seconds a cached network scan result stays valid"
+    )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Invalidate the network topology cache and rescan from scratch"
+    )
+    parser.add_argument(
+        "--redetect",
+        action="store_true",
+        help="Invalidate cached system detection results and detect again"
+    )
 
     args = parser.parse_args()
 
@@ -319,8 +519,41 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    tailscale = None
+    if args.tailscale or args.tailscale_status:
+        tailscale = TailscaleSource(status_file=args.tailscale_status)
+
     # Create and run wizard
-    wizard = MasterWizard(language=args.language)
+    wizard = MasterWizard(language=args.language, scan_engine=args.scan_engine,
+                          scan_sweep=args.scan_sweep, cache_max_age=args.cache_max_age,
+                          scan_rate=args.scan_rate, scan_max_sockets=args.scan_max_sockets,
+                          scan_fingerprint=args.scan_fingerprint, scan_ipv6=args.scan_ipv6,
+                          tailscale=tailscale, passive_window=args.passive,
+                          scan_profile=args.scan_profile, scan_roles=args.scan_roles,
+                          scan_trace=args.scan_trace, scan_interfaces=args.scan_interfaces,
+                          scan_exclude_interfaces=args.scan_exclude_interfaces)
+    try:
+        run_wizard(wizard, args)
+    finally:
+        wizard.close()
+
+
+def run_wizard(wizard: MasterWizard, args: argparse.Namespace):
+    """Carry out what the command line asked of a created wizard."""
+    if args.rescan:
+        wizard.network_scanner.invalidate_cache()
+    if args.redetect:
+        wizard.system_detector.invalidate_cache()
+
+    if args.changes_since is not None:
+        scanner = wizard.network_scanner
+        diff = scanner.history.changes_since(time.time() - args.changes_since * 3600, scope=scanner.history_scope())
+        print(json.dumps(diff.to_dict(), indent=2))
+        return
+
+    if args.monitor:
+        run_monitor(wizard.network_scanner, args.monitor_output, args.monitor_socket)
+        return
 
     if args.scenario:
         # Direct scenario execution
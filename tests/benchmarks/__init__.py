@@ -0,0 +1,4 @@
+"""
+Scanner Benchmarks
+Synthetic loopback network and NetworkScanner performance measurements
+"""
@@ -0,0 +1,172 @@
+"""
+Scanner Benchmark
+Hosts/sec, probe latency and resource use of each NetworkScanner engine
+
+Run: python -m tests.benchmarks.scanner_benchmark [--scale N] [--engines thread asyncio]
+"""
+
+import os
+import time
+import argparse
+import threading
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+
+from tools.hostname_resolver import HostnameResolver
+from tools.network_scanner import NetworkScanner
+from tests.benchmarks.synthetic_network import SyntheticNetwork
+
+
+# Emulated servers per profile at scale 1
+DEFAULT_PROFILES = {"llm_server": 4, "orchestration": 2, "database": 3, "monitoring": 2, "workstation": 1}
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one scan."""
+    engine: str
+    hosts_scanned: int
+    servers_found: int
+    correctly_classified: int
+    duration: float
+    hosts_per_sec: float
+    probe_p50_ms: float
+    probe_p99_ms: float
+    peak_threads: int
+    peak_sockets: int
+
+    def row(self) -> str:
+        return (f"{self.engine:<8} {self.hosts_scanned:>6} {self.servers_found:>6} {self.correctly_classified:>6} "
+                f"{self.duration:>8.2f} {self.hosts_per_sec:>9.1f} {self.probe_p50_ms:>8.2f} "
+                f"{self.probe_p99_ms:>8.2f} {self.peak_threads:>8} {self.peak_sockets:>8}")
+
+
+HEADER = (f"{'engine':<8} {'hosts':>6} {'found':>6} {'typed':>6} {'secs':>8} {'hosts/s':>9} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'threads':>8} {'sockets':>8}")
+
+
+class InstrumentedScanner(NetworkScanner):
+    """NetworkScanner recording the latency of every port probe."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.probe_latencies: List[float] = []
+        self._latency_lock = threading.Lock()
+
+    def _record(self, started: float):
+        with self._latency_lock:
+            self.probe_latencies.append((time.monotonic() - started) * 1000.0)
+
+    def scan_port(self, ip, port, timeout=1.0):
+        started = time.monotonic()
+        try:
+            return super().scan_port(ip, port, timeout)
+        finally:
+            self._record(started)
+
+    async def _async_scan_port(self, ip, port, timeout, limit):
+        started = time.monotonic()
+        try:
+            return await super()._async_scan_port(ip, port, timeout, limit)
+        finally:
+            self._record(started)
+
+
+class ResourceSampler:
+    """Sample thread and open socket counts of this process in the background."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_threads = 0
+        self.peak_sockets = 0
+        self._baseline_sockets = self.count_sockets()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def count_sockets() -> int:
+        count = 0
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                    count += 1
+            except OSError:
+                pass
+        return count
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            self.peak_sockets = max(self.peak_sockets, self.count_sockets() - self._baseline_sockets)
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "ResourceSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_benchmark(network: SyntheticNetwork, engine: str, timeout: float = 0.5,
+                  max_concurrency: int = 256) -> BenchmarkResult:
+    """Scan the synthetic subnet once with engine and measure it."""
+    # Synthetic hosts have no reverse DNS; real PTR queries would only add noise to the numbers
+    resolver = HostnameResolver(local_names=False, reverse_lookups=False)
+    scanner = InstrumentedScanner(engine=engine, ports=network.ports, max_concurrency=max_concurrency,
+                                  resolver=resolver)
+    expected = {host.ip_address: host.server_type for host in network.hosts}
+
+    with ResourceSampler() as sampler:
+        started = time.monotonic()
+        servers = scanner.scan_subnet(network.subnet, timeout=timeout, use_cache=False)
+        duration = time.monotonic() - started
+
+    found = [s for s in servers if s.ip_address in expected]
+    hosts_scanned = network.network.num_addresses - 2
+    return BenchmarkResult(
+        engine=engine,
+        hosts_scanned=hosts_scanned,
+        servers_found=len(found),
+        correctly_classified=sum(1 for s in found if s.server_type == expected[s.ip_address]),
+        duration=duration,
+        hosts_per_sec=hosts_scanned / duration if duration else 0.0,
+        probe_p50_ms=percentile(scanner.probe_latencies, 50),
+        probe_p99_ms=percentile(scanner.probe_latencies, 99),
+        peak_threads=sampler.peak_threads,
+        peak_sockets=sampler.peak_sockets,
+    )
+
+
+def run_suite(scale: int = 1, engines: Optional[List[str]] = None, subnet: str = "127.77.0.0/24",
+              blackhole_every: int = 5, timeout: float = 0.5) -> List[BenchmarkResult]:
+    """Benchmark every engine against one synthetic network."""
+    profiles: Dict[str, int] = {name: count * scale for name, count in DEFAULT_PROFILES.items()}
+    with SyntheticNetwork(profiles, subnet=subnet, blackhole_every=blackhole_every) as network:
+        return [run_benchmark(network, engine, timeout) for engine in engines or NetworkScanner.ENGINES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NetworkScanner engines on a synthetic loopback network")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply the number of emulated servers")
+    parser.add_argument("--subnet", default="127.77.0.0/24", help="Loopback subnet to emulate (inside 127.0.0.0/8)")
+    parser.add_argument("--engines", nargs="+", choices=list(NetworkScanner.ENGINES), default=None)
+    parser.add_argument("--blackhole-every", type=int, default=5, help="Blackhole one port on every N-th server")
+    parser.add_argument("--timeout", type=float, default=0.5, help="Port connect timeout ceiling (s)")
+    args = parser.parse_args()
+
+    print(HEADER)
+    for result in run_suite(args.scale, args.engines, args.subnet, args.blackhole_every, args.timeout):
+        print(result.row())
+
+
+if __name__ == "__main__":
+    main()
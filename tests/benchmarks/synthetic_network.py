@@ -0,0 +1,157 @@
+"""
+Synthetic Network Fixture
+Ecosystem-like hosts emulated with listening sockets on 127.0.0.0/8 addresses
+"""
+
+import time
+import errno
+import socket
+import selectors
+import ipaddress
+import threading
+from typing import Dict, List, Optional, Set
+from dataclasses import dataclass, field
+
+from tools.network_scanner import NetworkScanner
+
+
+@dataclass
+class SyntheticHost:
+    """One emulated server."""
+    ip_address: str
+    server_type: Optional[str]
+    open_ports: List[int]
+    blackholed_ports: List[int] = field(default_factory=list)
+
+
+class SyntheticNetwork:
+    """Emulate an ecosystem on loopback aliases, no real network needed.
+
+    Linux routes all of 127.0.0.0/8 to the loopback interface, so every address of the
+    subnet answers liveness probes and each emulated host binds its profile's ports
+    (NetworkScanner.ECOSYSTEM_SERVERS) on its own address. SSH ports send an OpenSSH
+    banner, optionally after `banner_delay` seconds. Blackholed ports stand in for
+    filtered ones: a listen(0) socket whose backlog is filled, so further SYNs are
+    dropped and connects hang until the prober gives up.
+
+    Usage: `with SyntheticNetwork({"llm_server": 4, "database": 2}) as network: ...`
+    """
+
+    SSH_BANNER = b"SSH-2.0-OpenSSH_9.6p1 Synthetic\r\n"
+
+    def __init__(self, profiles: Dict[str, int], subnet: str = "127.77.0.0/24",
+                 blackhole_every: int = 0, banner_delay: float = 0.0):
+        self.network = ipaddress.IPv4Network(subnet)
+        self.profiles = profiles
+        self.blackhole_every = blackhole_every
+        self.banner_delay = banner_delay
+        self.hosts: List[SyntheticHost] = []
+        self._listeners: List[socket.socket] = []
+        self._backlog_fillers: List[socket.socket] = []
+        self._selector = selectors.DefaultSelector()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def subnet(self) -> str:
+        return str(self.network)
+
+    @property
+    def ports(self) -> List[int]:
+        """Every port used by the emulated profiles."""
+        ports: Set[int] = set()
+        for host in self.hosts:
+            ports.update(host.open_ports + host.blackholed_ports)
+        return sorted(ports)
+
+    def __enter__(self) -> "SyntheticNetwork":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        addresses = self.network.hosts()
+        index = 0
+        for server_type, count in self.profiles.items():
+            ports = NetworkScanner.ECOSYSTEM_SERVERS[server_type]["ports"]
+            for _ in range(count):
+                ip = str(next(addresses))
+                index += 1
+                host = SyntheticHost(ip_address=ip, server_type=server_type, open_ports=[])
+                for port in ports:
+                    # Blackhole one non-SSH port on every n-th host
+                    if (self.blackhole_every and index % self.blackhole_every == 0
+                            and not host.blackholed_ports and port not in NetworkScanner.SSH_PORTS):
+                        self._blackhole(ip, port)
+                        host.blackholed_ports.append(port)
+                    else:
+                        self._listen(ip, port)
+                        host.open_ports.append(port)
+                host.open_ports.sort()
+                self.hosts.append(host)
+
+        self._thread = threading.Thread(target=self._serve, name="synthetic-network", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(2)
+        for sock in self._listeners + self._backlog_fillers:
+            sock.close()
+        self._selector.close()
+
+    def _listen(self, ip: str, port: int):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((ip, port))
+        sock.listen(128)
+        sock.setblocking(False)
+        self._selector.register(sock, selectors.EVENT_READ, port)
+        self._listeners.append(sock)
+
+    def _blackhole(self, ip: str, port: int):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((ip, port))
+        sock.listen(0)
+        self._listeners.append(sock)
+        # Fill the accept queue; the kernel then drops new SYNs
+        for _ in range(2):
+            filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            filler.setblocking(False)
+            err = filler.connect_ex((ip, port))
+            if err not in (0, errno.EINPROGRESS):
+                filler.close()
+                continue
+            self._backlog_fillers.append(filler)
+
+    def _serve(self):
+        """Accept connections on every open port; SSH ports send their banner."""
+        pending = []  # (send at, connection)
+        while not self._stop.is_set():
+            wait = 0.05
+            if pending:
+                wait = max(0.0, min(wait, pending[0][0] - time.monotonic()))
+            for key, _events in self._selector.select(wait):
+                try:
+                    conn, _ = key.fileobj.accept()
+                except OSError:
+                    continue
+                if key.data in NetworkScanner.SSH_PORTS:
+                    pending.append((time.monotonic() + self.banner_delay, conn))
+                else:
+                    conn.close()
+
+            now = time.monotonic()
+            while pending and pending[0][0] <= now:
+                _, conn = pending.pop(0)
+                try:
+                    conn.sendall(self.SSH_BANNER)
+                except OSError:
+                    pass
+                conn.close()
+        for _, conn in pending:
+            conn.close()
@@ -0,0 +1,69 @@
+"""
+Smoke tests for the synthetic network fixture and scanner benchmark
+"""
+
+import socket
+import unittest
+from unittest.mock import patch
+
+from tools.network_scanner import NetworkScanner
+from tests.benchmarks.synthetic_network import SyntheticNetwork
+from tests.benchmarks.scanner_benchmark import percentile, run_benchmark
+
+
+PROFILES = {"llm_server": 2, "database": 2, "monitoring": 1, "workstation": 1}
+
+
+class TestSyntheticNetwork(unittest.TestCase):
+    """Test the loopback network emulation"""
+
+    def test_hosts_serve_profile_ports(self):
+        with SyntheticNetwork({"orchestration": 1}, subnet="127.77.1.0/29", banner_delay=0.05) as network:
+            host, = network.hosts
+            self.assertEqual(host.open_ports, sorted(NetworkScanner.ECOSYSTEM_SERVERS["orchestration"]["ports"]))
+            with socket.create_connection((host.ip_address, 22), timeout=2) as conn:
+                conn.settimeout(2)
+                self.assertTrue(conn.recv(64).startswith(b"SSH-2.0-OpenSSH"))
+
+    def test_blackholed_port_times_out(self):
+        with SyntheticNetwork({"database": 1}, subnet="127.77.1.8/29", blackhole_every=1) as network:
+            host, = network.hosts
+            port, = host.blackholed_ports
+            self.assertNotIn(port, NetworkScanner.SSH_PORTS)
+            with self.assertRaises(socket.timeout):
+                socket.create_connection((host.ip_address, port), timeout=0.2)
+
+
+class TestScannerBenchmark(unittest.TestCase):
+    """Test both engines against the synthetic network"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.network = SyntheticNetwork(PROFILES, subnet="127.77.2.0/27", blackhole_every=3)
+        cls.network.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.network.stop()
+
+    def test_engines_find_every_host(self):
+        for engine in NetworkScanner.ENGINES:
+            with self.subTest(engine=engine):
+                with patch('tools.hostname_resolver.socket.gethostbyaddr') as ptr:
+                    result = run_benchmark(self.network, engine, timeout=0.3)
+                ptr.assert_not_called()
+                self.assertEqual(result.hosts_scanned, 30)
+                self.assertEqual(result.servers_found, len(self.network.hosts))
+                self.assertEqual(result.correctly_classified, len(self.network.hosts))
+                self.assertGreater(result.hosts_per_sec, 0)
+                self.assertLessEqual(result.probe_p50_ms, result.probe_p99_ms)
+                self.assertGreater(result.peak_threads, 0)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile([3.0, 1.0, 2.0], 50), 2.0)
+        self.assertEqual(percentile(list(range(101)), 99), 99)
+
+
+if __name__ == '__main__':
+    unittest.main()
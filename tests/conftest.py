@@ -0,0 +1,15 @@
+"""
+Shared test setup: keep the suite away from the user's own configuration
+"""
+
+import tempfile
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_config_home(monkeypatch):
+    """Point XDG_CONFIG_HOME at an empty directory so user server profiles never leak into tests."""
+    with tempfile.TemporaryDirectory() as config_home:
+        monkeypatch.setenv("XDG_CONFIG_HOME", config_home)
+        yield config_home
@@ -12,6 +12,7 @@ from unittest.mock import patch, MagicMock
 
 from tools.network_scanner import NetworkScanner
 from tools.config_validator import ConfigValidator
+from tools.path_index import PATH_INDEX
 
 
 class TestSSHChaosScenarios(unittest.TestCase):
@@ -242,8 +243,9 @@ Host LLMS
         # Can't install tmux without SSH
         # Can't test connectivity without network tools
 
-        with patch('subprocess.run') as mock_run:
-            # Simulate all commands failing initially
+        with patch('subprocess.run') as mock_run, \
+                patch.object(PATH_INDEX, 'which', return_value=None):
+            # Simulate all commands missing and failing initially
             mock_run.side_effect = subprocess.CalledProcessError(127, ['command'], stderr="Command not found")
 
             # Should handle missing tools gracefully
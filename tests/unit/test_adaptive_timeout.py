@@ -0,0 +1,47 @@
+import unittest
+
+from tools.adaptive_timeout import AdaptiveTimeouts
+
+
+class TestAdaptiveTimeouts(unittest.TestCase):
+    def setUp(self):
+        self.timeouts = AdaptiveTimeouts(multiplier=4.0, floor=0.05, liveness_floor=0.25)
+
+    def test_unknown_host_gets_ceiling(self):
+        self.assertEqual(self.timeouts.port_timeout("10.0.0.5", 1.0), 1.0)
+        self.assertEqual(self.timeouts.liveness_timeout(["10.0.0.5"], 2.0), 2.0)
+
+    def test_lan_host_uses_floor(self):
+        self.timeouts.observe("192.168.0.41", 0.4)
+        self.assertEqual(self.timeouts.port_timeout("192.168.0.41", 1.0), 0.05)
+        # Unmeasured host in the same /24 inherits the subnet estimate
+        self.assertEqual(self.timeouts.port_timeout("192.168.0.58", 1.0), 0.05)
+        self.assertEqual(self.timeouts.liveness_timeout(["192.168.0.1"], 2.0), 0.25)
+
+    def test_wan_host_scales_with_rtt(self):
+        self.timeouts.observe("100.64.0.7", 40.0)
+        # bound = srtt + 4 * rttvar = 40 + 4 * 20 = 120 ms; x4 = 480 ms
+        self.assertAlmostEqual(self.timeouts.port_timeout("100.64.0.7", 1.0), 0.48)
+        self.assertEqual(self.timeouts.port_timeout("100.64.0.7", 0.3), 0.3)
+
+    def test_liveness_needs_history_for_every_subnet(self):
+        self.timeouts.observe("192.168.0.41", 0.4)
+        self.assertEqual(self.timeouts.liveness_timeout(["192.168.0.2", "10.0.0.2"], 2.0), 2.0)
+
+    def test_ipv6_hosts_grouped_by_64(self):
+        self.assertEqual(self.timeouts.subnet_of("2001:db8:0:1::42"), "2001:db8:0:1::/64")
+        self.assertEqual(self.timeouts.subnet_of("fe80::1%eth0"), "fe80::/64%eth0")
+        self.timeouts.observe("2001:db8:0:1::42", 0.4)
+        self.assertEqual(self.timeouts.port_timeout("2001:db8:0:1::99", 1.0), 0.05)
+        self.assertEqual(self.timeouts.port_timeout("2001:db8:0:2::99", 1.0), 1.0)
+
+    def test_report_lists_hosts_and_subnets(self):
+        self.timeouts.observe("192.168.0.41", 1.0)
+        report = self.timeouts.report()
+        self.assertIn("192.168.0.41", report)
+        self.assertIn("192.168.0.0/24", report)
+        self.assertEqual(report["192.168.0.41"]["samples"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
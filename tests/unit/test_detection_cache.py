@@ -0,0 +1,124 @@
+import os
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tools.dependency_resolver import DependencyResolver, PackageManager
+from tools.detection_cache import DetectionCache
+from tools.probe_runner import ProbeRunner
+from tools.system_detector import SystemDetector
+
+
+class TestDetectionCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "detection.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_values_expire_after_max_age(self):
+        cache = DetectionCache()
+        cache.put("resources", {"memory_available": 1}, ttl=5.0)
+        self.assertEqual(cache.get("resources", 5.0).value, {"memory_available": 1})
+        with patch('tools.detection_cache.time.time', return_value=cache._values["resources"].detected_at + 6):
+            self.assertIsNone(cache.get("resources", 5.0))
+        self.assertIsNone(cache.get("resources", 0.0))
+
+    def test_values_are_copies(self):
+        cache = DetectionCache()
+        zones = ["thermal_zone0"]
+        cache.put("zones", zones, ttl=DetectionCache.BOOT)
+        zones.append("thermal_zone1")
+        cache.get("zones", DetectionCache.BOOT).value.append("thermal_zone2")
+        self.assertEqual(cache.get("zones", DetectionCache.BOOT).value, ["thermal_zone0"])
+
+    def test_long_lived_values_persist_for_the_boot(self):
+        cache = DetectionCache(path=self.path)
+        cache.put("os_distribution", "Debian GNU/Linux 12", ttl=DetectionCache.BOOT)
+        cache.put("resources", {"memory_available": 1}, ttl=5.0)
+        cache.save()
+
+        warm = DetectionCache(path=self.path)
+        self.assertEqual(warm.get("os_distribution", DetectionCache.BOOT).value, "Debian GNU/Linux 12")
+        self.assertIsNone(warm.get("resources", 5.0))
+
+        with patch.object(DetectionCache, 'read_boot_id', return_value="another-boot"):
+            self.assertIsNone(DetectionCache(path=self.path).get("os_distribution", DetectionCache.BOOT))
+
+    def test_unreadable_file_is_ignored(self):
+        with open(self.path, 'w') as f:
+            f.write("{not json")
+        with self.assertLogs("tools.detection_cache", level="WARNING"):
+            cache = DetectionCache(path=self.path)
+        self.assertIsNone(cache.get("os_distribution", DetectionCache.BOOT))
+
+    def test_invalidate_clears_disk(self):
+        cache = DetectionCache(path=self.path)
+        cache.put("os_distribution", "Debian", ttl=DetectionCache.BOOT)
+        cache.save()
+        cache.invalidate()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["probes"], {})
+
+
+class TestCachedProbes(unittest.TestCase):
+    def test_runner_skips_fresh_probes(self):
+        calls = []
+        runner = ProbeRunner(cache=DetectionCache())
+        runner.register("arch", lambda: calls.append("arch") or "x86_64", ttl=DetectionCache.BOOT)
+        runner.register("load", lambda: calls.append("load") or 0.5)
+        runner.register("summary", lambda arch, load: f"{arch} {load}", requires=["arch", "load"])
+
+        runner.run()
+        results = runner.run()
+        self.assertEqual(calls, ["arch", "load", "load"])
+        self.assertEqual(results["arch"].status, "cached")
+        self.assertEqual(results["summary"].value, "x86_64 0.5")
+
+    def test_failures_are_not_cached(self):
+        runner = ProbeRunner(cache=DetectionCache())
+        runner.register("flaky", lambda: 1 / 0, ttl=60.0, default=0)
+        with self.assertLogs("tools.probe_runner", level="WARNING"):
+            runner.run()
+        self.assertIsNone(runner.cache.get("flaky", 60.0))
+
+    def test_detector_refreshes_only_volatile_fields(self):
+        detector = SystemDetector()
+        first = detector.detect_comprehensive_info()
+        detector.cache.invalidate(["resources"])  # As if its 5 second TTL had passed
+        with patch.object(detector.runner.probes["package_managers"], "func", side_effect=AssertionError), \
+                patch('tools.system_detector.psutil.virtual_memory') as memory:
+            memory.return_value.available = 12345
+            second = detector.detect_comprehensive_info()
+        self.assertEqual(second.memory_available, 12345)
+        self.assertEqual(second.memory_total, first.memory_total)
+        self.assertEqual(second.package_managers, first.package_managers)
+
+    def test_failed_sensors_run_is_retried(self):
+        detector = SystemDetector()
+        failed = subprocess.CompletedProcess(["sensors"], 1, stdout="", stderr="No sensors found!")
+        with patch.object(detector, '_command_exists', return_value=True), \
+                patch('tools.system_detector.subprocess.run', return_value=failed), \
+                self.assertLogs("tools.probe_runner", level="WARNING"):
+            detector.detect_all()
+        self.assertIsNone(detector.cache.get("sensors_output", DetectionCache.BOOT))
+
+    def test_install_refreshes_dependent_probes(self):
+        cache = DetectionCache()
+        for name in ("sensors_output", "package_managers", "hardware"):
+            cache.put(name, "old", DetectionCache.BOOT)
+        resolver = DependencyResolver(detection_cache=cache)
+        package = DependencyResolver.COMMON_PACKAGES["git"]
+        with patch('tools.dependency_resolver.subprocess.run'):
+            self.assertTrue(resolver._install_with_system_manager([package], PackageManager.APT, dry_run=False))
+        self.assertIsNone(cache.get("sensors_output", DetectionCache.BOOT))
+        self.assertIsNone(cache.get("package_managers", DetectionCache.BOOT))
+        self.assertEqual(cache.get("hardware", DetectionCache.BOOT).value, "old")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import json
+import socket
+import threading
+import unittest
+from unittest.mock import patch
+
+from tools.fingerprint import ServiceFingerprinter
+from tools.network_scanner import NetworkScanner
+
+
+class CannedServer:
+    """Loopback TCP server answering every connection via respond(request) -> bytes."""
+
+    def __init__(self, respond, banner: bytes = b""):
+        self.respond = respond
+        self.banner = banner
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.requests = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    if self.banner:
+                        conn.sendall(self.banner)
+                    conn.settimeout(1.0)
+                    request = conn.recv(4096)
+                    if request:
+                        self.requests.append(request)
+                    conn.sendall(self.respond(request))
+                except OSError:
+                    pass
+
+    def close(self):
+        self.sock.close()
+
+
+def http_response(status: str, headers: str = "", body: bytes = b"") -> bytes:
+    return f"HTTP/1.1 {status}\r\n{headers}Content-Length: {len(body)}\r\n\r\n".encode() + body
+
+
+def ollama(request: bytes) -> bytes:
+    if request.startswith(b"GET /api/version"):
+        return http_response("200 OK", body=json.dumps({"version": "0.5.7"}).encode())
+    if request.startswith(b"GET /api/tags"):
+        return http_response("200 OK", body=json.dumps({"models": [{"name": "llama3:8b"}]}).encode())
+    return http_response("200 OK")
+
+
+class TestServiceFingerprinter(unittest.TestCase):
+    def setUp(self):
+        self.servers = []
+        self.fingerprinter = ServiceFingerprinter()
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+
+    def serve(self, respond, banner: bytes = b"") -> int:
+        server = CannedServer(respond, banner)
+        self.servers.append(server)
+        return server.port
+
+    def test_ssh_banner(self):
+        port = self.serve(lambda _: b"", banner=b"SSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13\r\n")
+        with patch.object(ServiceFingerprinter, 'SSH_PORTS', (port,)):
+            fp = self.fingerprinter.fingerprint("127.0.0.1", [port])[port]
+        self.assertEqual((fp.service, fp.product, fp.version), ("ssh", "OpenSSH", "9.6p1"))
+        self.assertEqual(fp.banner, "SSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13")
+
+    def test_ssh_on_unexpected_port_recognized_from_banner(self):
+        port = self.serve(lambda _: b"", banner=b"SSH-2.0-dropbear_2022.83\r\n")
+        fp = self.fingerprinter.fingerprint("127.0.0.1", [port])[port]
+        self.assertEqual((fp.service, fp.product, fp.version), ("ssh", "dropbear", "2022.83"))
+
+    def test_http_server_header(self):
+        port = self.serve(lambda _: http_response("200 OK", "Server: nginx/1.24.0 (Ubuntu)\r\n"))
+        fp = self.fingerprinter.fingerprint("127.0.0.1", [port])[port]
+        self.assertEqual((fp.service, fp.product, fp.version), ("http", "nginx", "1.24.0"))
+        self.assertEqual(fp.describe(), "http (nginx 1.24.0)")
+
+    def test_http_header_keywords_name_service(self):
+        port = self.serve(lambda _: http_response("200 OK", "X-Elastic-Product: Elasticsearch\r\n"))
+        with patch.object(ServiceFingerprinter, 'OLLAMA_PORTS', ()):
+            fp = self.fingerprinter.fingerprint("127.0.0.1", [port])[port]
+        self.assertEqual(fp.service, "elasticsearch")
+
+    def test_ollama_api(self):
+        port = self.serve(ollama)
+        with patch.object(ServiceFingerprinter, 'OLLAMA_PORTS', (port,)):
+            fp = self.fingerprinter.fingerprint("127.0.0.1", [port])[port]
+        self.assertEqual((fp.service, fp.product, fp.version), ("ollama", "Ollama", "0.5.7"))
+        self.assertEqual(fp.models, ["llama3:8b"])
+
+    def test_silent_and_closed_ports_left_out(self):
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+        probe.close()
+        silent_port = self.serve(lambda _: b"")
+
+        results = self.fingerprinter.fingerprint("127.0.0.1", [closed_port, silent_port], timeout=0.3)
+        self.assertEqual(results, {})
+
+
+class TestScannerFingerprinting(unittest.TestCase):
+    def setUp(self):
+        self.servers = [CannedServer(ollama), CannedServer(lambda _: b"", banner=b"SSH-2.0-OpenSSH_9.6\r\n")]
+        self.ports = [server.port for server in self.servers]
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+
+    def test_fingerprints_populate_services_and_classification(self):
+        ollama_port, ssh_port = self.ports
+        for engine in NetworkScanner.ENGINES:
+            with self.subTest(engine=engine), \
+                    patch.object(ServiceFingerprinter, 'OLLAMA_PORTS', (ollama_port,)), \
+                    patch.object(NetworkScanner, 'resolve_hostname', return_value=None), \
+                    patch.object(NetworkScanner, 'ping_host', return_value=0.1):
+                scanner = NetworkScanner(engine=engine, ports=self.ports, fingerprint=True)
+                server = scanner.scan_hosts(["127.0.0.1"], timeout=1.0)[0]
+
+                self.assertEqual(server.services[str(ollama_port)], "ollama (Ollama 0.5.7)")
+                self.assertEqual(server.services[str(ssh_port)], "ssh (OpenSSH 9.6)")
+                self.assertEqual(server.fingerprints[str(ollama_port)]["models"], ["llama3:8b"])
+                # Neither port matches llm_server's port list, the product does
+                self.assertEqual(server.server_type, "llm_server")
+
+    def test_fingerprinting_is_optional(self):
+        with patch.object(NetworkScanner, 'resolve_hostname', return_value=None), \
+                patch.object(NetworkScanner, 'ping_host', return_value=0.1):
+            server = NetworkScanner(ports=self.ports).scan_hosts(["127.0.0.1"], timeout=1.0)[0]
+        self.assertEqual(server.fingerprints, {})
+        self.assertEqual(server.services, {})
+        self.assertEqual(self.servers[0].requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from tools.hostname_resolver import HostnameResolver
+
+
+class TestHostnameResolver(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, "hostnames.json")
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_lookup_never_blocks_and_fills_in_later(self):
+        release = threading.Event()
+
+        def slow_ptr(ip):
+            release.wait(5)
+            return ("nas.lan", [], [ip])
+
+        resolver = HostnameResolver(local_names=False)
+        seen = []
+        with patch('tools.hostname_resolver.socket.gethostbyaddr', side_effect=slow_ptr):
+            started = time.monotonic()
+            self.assertIsNone(resolver.lookup("192.168.0.10", seen.append))
+            self.assertLess(time.monotonic() - started, 0.1)
+            release.set()
+            self.assertTrue(resolver.wait(5))
+        self.assertEqual(seen, ["nas.lan"])
+        self.assertEqual(resolver.lookup("192.168.0.10"), "nas.lan")
+
+    def test_wait_returns_after_callbacks_applied_the_answer(self):
+        resolver = HostnameResolver(local_names=False)
+        applied = []
+
+        def slow_callback(hostname):
+            time.sleep(0.2)
+            applied.append(hostname)
+
+        with patch('tools.hostname_resolver.socket.gethostbyaddr', return_value=("nas.lan", [], [])):
+            resolver.lookup("192.168.0.10", slow_callback)
+            self.assertTrue(resolver.wait(5))
+            self.assertEqual(applied, ["nas.lan"])
+
+    def test_offline_resolver_never_queries(self):
+        resolver = HostnameResolver(local_names=False, reverse_lookups=False)
+        resolver.add_names({"192.168.0.10": "nas.local"})
+        with patch('tools.hostname_resolver.socket.gethostbyaddr') as ptr:
+            self.assertEqual(resolver.lookup("192.168.0.10"), "nas.local")
+            self.assertIsNone(resolver.lookup("192.168.0.11"))
+            self.assertIsNone(resolver.resolve("192.168.0.11", timeout=5))
+            self.assertTrue(resolver.wait(0))
+        ptr.assert_not_called()
+
+    def test_lookups_run_concurrently(self):
+        barrier = threading.Barrier(4, timeout=5)
+
+        def ptr(ip):
+            barrier.wait()  # Only passes when all four lookups are in flight together
+            return (f"host-{ip.rsplit('.', 1)[1]}", [], [ip])
+
+        resolver = HostnameResolver(local_names=False)
+        ips = [f"10.0.0.{i}" for i in range(1, 5)]
+        with patch('tools.hostname_resolver.socket.gethostbyaddr', side_effect=ptr):
+            resolver.submit(ips)
+            self.assertTrue(resolver.wait(5))
+        self.assertEqual([resolver.lookup(ip) for ip in ips], ["host-1", "host-2", "host-3", "host-4"])
+
+    def test_negative_answers_cached_and_persisted(self):
+        resolver = HostnameResolver(path=self.cache_path, local_names=False)
+        with patch('tools.hostname_resolver.socket.gethostbyaddr',
+                   side_effect=socket.herror("Unknown host")) as ptr:
+            self.assertIsNone(resolver.resolve("192.168.0.41", timeout=5))
+            self.assertIsNone(resolver.resolve("192.168.0.41", timeout=5))
+        self.assertEqual(ptr.call_count, 1)
+
+        with patch('tools.hostname_resolver.socket.gethostbyaddr') as ptr:
+            reloaded = HostnameResolver(path=self.cache_path, local_names=False)
+            self.assertIsNone(reloaded.resolve("192.168.0.41", timeout=5))
+        ptr.assert_not_called()
+
+    def test_expired_answers_are_looked_up_again(self):
+        resolver = HostnameResolver(local_names=False, negative_ttl=0)
+        with patch('tools.hostname_resolver.socket.gethostbyaddr',
+                   side_effect=[socket.herror("Unknown host"), ("nas.lan", [], [])]):
+            self.assertIsNone(resolver.resolve("192.168.0.10", timeout=5))
+            self.assertEqual(resolver.resolve("192.168.0.10", timeout=5), "nas.lan")
+
+    def test_local_names_win_over_ptr(self):
+        hosts = self.write("hosts", "127.0.0.1 localhost\n192.168.0.41 llm-server llm # lab\n")
+        ssh_config = self.write("ssh_config", (
+            "Host *\n    ServerAliveInterval 30\n"
+            "Host orchestrator orch\n    HostName 192.168.0.58\n    User admin\n"
+            "Host github\n    HostName github.com\n"
+        ))
+        with patch.object(HostnameResolver, 'HOSTS_PATH', hosts), \
+                patch.object(HostnameResolver, 'SSH_CONFIG_PATHS', [ssh_config]), \
+                patch('tools.hostname_resolver.socket.gethostbyaddr') as ptr:
+            resolver = HostnameResolver()
+            resolver.add_names({"192.168.0.77": "printer.local"})
+            self.assertEqual(resolver.lookup("192.168.0.41"), "llm-server")
+            self.assertEqual(resolver.lookup("192.168.0.58"), "orchestrator")
+            self.assertEqual(resolver.lookup("192.168.0.77"), "printer.local")
+        ptr.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
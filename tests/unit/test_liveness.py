@@ -0,0 +1,78 @@
+import socket
+import unittest
+from unittest.mock import patch
+
+from tools.liveness import LivenessProber, _checksum, _echo_request, same_address, sockaddr
+
+
+class TestLivenessProber(unittest.TestCase):
+    def test_echo_request_checksum_valid(self):
+        packet = _echo_request(0x1234, 7)
+        # A packet including its own checksum sums to zero
+        self.assertEqual(_checksum(packet), 0)
+
+    def test_loopback_is_alive(self):
+        rtt = LivenessProber().probe("127.0.0.1", timeout=1.0)
+        self.assertIsInstance(rtt, float)
+        self.assertGreaterEqual(rtt, 0.0)
+
+    def test_tcp_fallback_counts_refusal_as_alive(self):
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+        probe.close()
+
+        prober = LivenessProber(tcp_ports=[closed_port])
+        alive = []
+        with patch.object(prober, '_open_icmp_socket', return_value=(None, None)):
+            results = prober.probe_many(["127.0.0.1", "127.0.0.2"], timeout=1.0,
+                                        callback=lambda ip, rtt: alive.append(ip))
+        self.assertIsNotNone(results["127.0.0.1"])
+        self.assertIsNotNone(results["127.0.0.2"])
+        self.assertEqual(sorted(alive), ["127.0.0.1", "127.0.0.2"])
+
+    def test_hosts_silent_to_icmp_get_tcp_probes(self):
+        prober = LivenessProber(tcp_ports=[1])
+        icmp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        with patch.object(prober, '_open_icmp_socket', return_value=(icmp_sock, "dgram")), \
+                patch.object(prober, '_probe_icmp') as probe_icmp, \
+                patch.object(prober, '_probe_tcp', wraps=prober._probe_tcp) as probe_tcp:
+            results = prober.probe_many(["127.0.0.1"], timeout=1.0)
+        probe_icmp.assert_called_once()
+        self.assertEqual(probe_tcp.call_args[0][0], ["127.0.0.1"])
+        self.assertIsNotNone(results["127.0.0.1"])
+
+    def test_fallback_timeout_follows_echo_rtts(self):
+        prober = LivenessProber()
+        self.assertEqual(prober._fallback_timeout([], 2.0), 2.0)
+        self.assertEqual(prober._fallback_timeout([1.0, 3.0], 2.0), LivenessProber.FALLBACK_MIN_TIMEOUT)
+        self.assertAlmostEqual(prober._fallback_timeout([150.0], 2.0), 0.6)
+        self.assertEqual(prober._fallback_timeout([900.0], 2.0), 2.0)
+
+    def test_ipv6_loopback_is_alive(self):
+        results = LivenessProber().probe_many(["127.0.0.1", "::1"], timeout=1.0)
+        self.assertIsNotNone(results["127.0.0.1"])
+        self.assertIsNotNone(results["::1"])
+
+    def test_tcp_fallback_over_ipv6(self):
+        prober = LivenessProber(tcp_ports=[1])
+        with patch.object(prober, '_open_icmp_socket', return_value=(None, None)):
+            self.assertIsNotNone(prober.probe("::1", timeout=1.0))
+
+    def test_sockaddr_turns_zone_into_scope_id(self):
+        self.assertEqual(sockaddr("192.168.0.41", 22), (socket.AF_INET, ("192.168.0.41", 22)))
+        family, address = sockaddr("fe80::1%lo", 22)
+        self.assertEqual(family, socket.AF_INET6)
+        self.assertEqual(address[:2], ("fe80::1", 22))
+        self.assertEqual(address[3], socket.if_nametoindex("lo"))
+        self.assertTrue(same_address("fe80::1%lo", "FE80:0::1"))
+        self.assertFalse(same_address("::1", "127.0.0.1"))
+
+    def test_socket_failure_reports_dead(self):
+        with patch('tools.liveness.socket.socket', side_effect=OSError("Network is unreachable")):
+            results = LivenessProber().probe_many(["192.168.0.41"], timeout=0.2)
+        self.assertEqual(results, {"192.168.0.41": None})
+
+
+if __name__ == '__main__':
+    unittest.main()
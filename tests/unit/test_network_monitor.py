@@ -0,0 +1,122 @@
+import io
+import os
+import json
+import socket
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from tools.network_monitor import ChangeEvent, JsonLinesSink, NetworkMonitor, UnixSocketSink
+from tools.network_scanner import ServerInfo
+
+
+def server(ip: str, ports, rtt: float = 1.0) -> ServerInfo:
+    return ServerInfo(ip, None, list(ports), 22 if 22 in ports else None, {}, rtt, None)
+
+
+class TestNetworkMonitor(unittest.TestCase):
+    def setUp(self):
+        self.scanner = MagicMock()
+        self.scanner.iter_scan_subnet.side_effect = lambda *args, **kwargs: iter(self.network.values())
+        self.scanner.scan_hosts.side_effect = lambda hosts, timeout: [self.network[ip] for ip in hosts
+                                                                      if ip in self.network]
+        self.network = {"192.168.0.41": server("192.168.0.41", [22, 11434])}
+        self.events = []
+        self.monitor = NetworkMonitor(self.scanner, subnets=["192.168.0.0/24"], sinks=[self.events.append],
+                                      min_interval=10, max_interval=80, sweep_interval=1000)
+
+    def kinds(self):
+        return [(e.kind, e.ip_address, e.details.get("port")) for e in self.events]
+
+    def test_sweep_reports_new_hosts(self):
+        wait = self.monitor.poll(now=0)
+        self.assertEqual(self.kinds(), [("host_up", "192.168.0.41", None)])
+        self.assertEqual(wait, 10)
+        self.assertEqual([s.ip_address for s in self.monitor.servers()], ["192.168.0.41"])
+
+    def test_port_changes_reported(self):
+        self.monitor.poll(now=0)
+        self.network["192.168.0.41"] = server("192.168.0.41", [22, 8080])
+        self.monitor.poll(now=10)
+        self.assertEqual(self.kinds()[1:], [
+            ("port_opened", "192.168.0.41", 8080),
+            ("port_closed", "192.168.0.41", 11434),
+        ])
+
+    def test_quiet_hosts_back_off_and_changes_reset_interval(self):
+        self.monitor.poll(now=0)
+        due_times = []
+        now = 0
+        for _ in range(4):
+            now += self.monitor.poll(now=now)
+            due_times.append(now)
+            self.monitor.poll(now=now)
+        self.assertEqual(due_times, [10, 30, 70, 150])  # 10, 20, 40, then capped at 80
+        self.assertEqual(self.scanner.scan_hosts.call_count, 4)
+
+        self.network["192.168.0.41"] = server("192.168.0.41", [22])
+        self.monitor.poll(now=230)
+        self.assertEqual(self.monitor.hosts["192.168.0.41"].interval, 10)
+
+    def test_host_down_after_consecutive_misses_and_back_up(self):
+        self.monitor.poll(now=0)
+        gone = self.network.pop("192.168.0.41")
+        self.monitor.poll(now=10)
+        self.assertEqual(len(self.events), 1)  # One miss is not enough
+        self.monitor.poll(now=20)
+        self.assertEqual(self.kinds()[-1], ("host_down", "192.168.0.41", None))
+        self.assertEqual(self.monitor.servers(), [])
+
+        self.network["192.168.0.41"] = gone
+        self.monitor.poll(now=1000)  # Next sweep
+        self.assertEqual(self.kinds()[-1], ("host_up", "192.168.0.41", None))
+
+    def test_rtt_regression(self):
+        self.monitor.poll(now=0)
+        now = 0
+        for _ in range(3):
+            now += self.monitor.poll(now=now)
+            self.monitor.poll(now=now)
+        self.assertEqual(len(self.events), 1)
+
+        self.network["192.168.0.41"] = server("192.168.0.41", [22, 11434], rtt=40.0)
+        now += self.monitor.poll(now=now)
+        self.monitor.poll(now=now)
+        self.assertEqual(self.events[-1].kind, "rtt_regression")
+        self.assertEqual(self.events[-1].details["rtt_ms"], 40.0)
+
+
+class TestEventSinks(unittest.TestCase):
+    EVENT = ChangeEvent(kind="port_opened", ip_address="192.168.0.41", timestamp=1.5, details={"port": 8080})
+
+    def test_json_lines_sink(self):
+        stream = io.StringIO()
+        JsonLinesSink(stream)(self.EVENT)
+        self.assertEqual(json.loads(stream.getvalue()),
+                         {"kind": "port_opened", "ip_address": "192.168.0.41", "timestamp": 1.5,
+                          "details": {"port": 8080}})
+
+    def test_unix_socket_sink_broadcasts(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "monitor.sock")
+            sink = UnixSocketSink(path)
+            try:
+                client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                client.connect(path)
+                client.settimeout(2)
+                for _ in range(200):  # Wait until the sink accepted the client
+                    if sink._clients:
+                        break
+                    time.sleep(0.01)
+                sink(self.EVENT)
+                line = client.makefile().readline()
+                self.assertEqual(json.loads(line)["details"], {"port": 8080})
+                client.close()
+            finally:
+                sink.close()
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,472 @@
+import os
+import asyncio
+import socket
+import tempfile
+import time
+import unittest
+from collections import namedtuple
+from unittest.mock import call, patch
+
+from tools.hostname_resolver import HostnameResolver
+from tools.network_scanner import NetworkScanner, NetworkTopology, ServerInfo
+from tools.server_classifier import ServerClassifier
+
+
+def offline_resolver() -> HostnameResolver:
+    """Resolver answering only from names it was given; no reverse lookup is ever queued."""
+    return HostnameResolver(local_names=False, reverse_lookups=False)
+
+
+class TestNetworkScannerEngines(unittest.TestCase):
+    def setUp(self):
+        # One listening port on loopback, one port that is known to be closed
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        self.open_port = self.listener.getsockname()[1]
+
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(("127.0.0.1", 0))
+        self.closed_port = probe.getsockname()[1]
+        probe.close()
+
+    def tearDown(self):
+        self.listener.close()
+
+    def test_unknown_engine_rejected(self):
+        with self.assertRaises(ValueError):
+            NetworkScanner(engine="fork-bomb")
+
+    def test_engines_return_same_servers(self):
+        ports = [self.open_port, self.closed_port]
+        results = {}
+        for engine in NetworkScanner.ENGINES:
+            scanner = NetworkScanner(engine=engine, ports=ports, resolver=offline_resolver())
+            scanner.resolver.add_names({"127.0.0.1": "localhost"})
+            results[engine] = scanner.scan_subnet("127.0.0.1/32", timeout=0.5)
+
+        for engine, servers in results.items():
+            self.assertEqual(len(servers), 1, engine)
+            self.assertEqual(servers[0].ip_address, "127.0.0.1")
+            self.assertEqual(servers[0].open_ports, [self.open_port])
+            self.assertEqual(servers[0].hostname, "localhost")
+            self.assertIsInstance(servers[0].ping_time, float)
+            # Loopback RTT is tiny, so the adaptive connect timeout sits at its floor
+            self.assertLessEqual(servers[0].probe_timeout, 0.5)
+
+    def test_engines_skip_dead_hosts(self):
+        for engine in NetworkScanner.ENGINES:
+            scanner = NetworkScanner(engine=engine, ports=[self.open_port])
+            with patch.object(scanner.prober, 'probe_many', return_value={}):
+                self.assertEqual(scanner.scan_subnet("127.0.0.0/30"), [], engine)
+
+    def test_budget_caps_open_sockets(self):
+        ports = [self.open_port, self.closed_port] * 4
+        for engine in NetworkScanner.ENGINES:
+            scanner = NetworkScanner(engine=engine, ports=ports, max_concurrency=2, resolver=offline_resolver())
+            servers = scanner.scan_subnet("127.0.0.0/29", timeout=0.5)
+            self.assertEqual(len(servers), 6, engine)
+            self.assertLessEqual(scanner.budget.peak_in_flight, 2, engine)
+            self.assertEqual(scanner.budget.in_flight, 0, engine)
+
+    def test_streaming_yields_servers_and_calls_hook(self):
+        for engine in NetworkScanner.ENGINES:
+            scanner = NetworkScanner(engine=engine, ports=[self.open_port], resolver=offline_resolver())
+            seen = []
+            stream = scanner.iter_scan_subnet("127.0.0.0/29", timeout=0.5, on_server=seen.append)
+            first = next(stream)
+            rest = list(stream)
+            self.assertEqual(seen, [first] + rest, engine)
+            self.assertEqual(len(seen), 6, engine)
+            self.assertTrue(all(s.open_ports == [self.open_port] for s in seen if s.ip_address == "127.0.0.1"))
+
+    def test_finished_hosts_are_classified_in_batches(self):
+        classifier = ServerClassifier({"probe": {"ports": [self.open_port], "services": []}})
+        for engine in NetworkScanner.ENGINES:
+            scanner = NetworkScanner(engine=engine, ports=[self.open_port], classifier=classifier,
+                                     resolver=offline_resolver())
+            with patch.object(classifier, 'rank_many', wraps=classifier.rank_many) as rank_many:
+                servers = scanner.scan_subnet("127.0.0.0/29", timeout=0.5)
+            self.assertEqual({s.ip_address: s.server_type for s in servers},
+                             {f"127.0.0.{n}": "probe" if n == 1 else None for n in range(1, 7)}, engine)
+            batches = [len(c.args[0]) for c in rank_many.call_args_list]
+            self.assertEqual(sum(batches), 6, engine)
+            self.assertEqual(scanner.stats.stages["classify"].count, len(batches), engine)
+
+    def test_async_iterator_yields_servers(self):
+        scanner = NetworkScanner(engine="asyncio", ports=[self.open_port], resolver=offline_resolver())
+
+        async def collect():
+            return [s.ip_address async for s in scanner.aiter_scan_subnet("127.0.0.1/32", timeout=0.5)]
+
+        self.assertEqual(asyncio.run(collect()), ["127.0.0.1"])
+
+    def test_engines_scan_ipv6_hosts(self):
+        listener = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
+        listener.bind(("::1", 0))
+        listener.listen(16)
+        port = listener.getsockname()[1]
+        try:
+            for engine in NetworkScanner.ENGINES:
+                scanner = NetworkScanner(engine=engine, ports=[port, self.closed_port], resolver=offline_resolver())
+                servers = scanner.scan_hosts(["::1"], timeout=0.5)
+                self.assertEqual([(s.ip_address, s.open_ports) for s in servers], [("::1", [port])], engine)
+        finally:
+            listener.close()
+
+    def test_ping_liveness_uses_subprocess(self):
+        scanner = NetworkScanner(engine="asyncio", ports=[self.open_port], liveness="ping",
+                                 resolver=offline_resolver())
+        with patch.object(scanner, '_async_ping_host', return_value=0.25):
+            servers = scanner.scan_subnet("127.0.0.1/32", timeout=0.5)
+        self.assertEqual([s.ping_time for s in servers], [0.25])
+
+
+class TestNeighborSeededSweep(unittest.TestCase):
+    ARP_TABLE = (
+        "IP address       HW type     Flags       HW address            Mask     Device\n"
+        "192.168.0.41     0x1         0x2         aa:bb:cc:dd:ee:01     *        eth0\n"
+        "192.168.0.58     0x1         0x2         aa:bb:cc:dd:ee:02     *        eth0\n"
+        "192.168.0.99     0x1         0x0         00:00:00:00:00:00     *        eth0\n"
+        "10.0.0.5         0x1         0x2         aa:bb:cc:dd:ee:03     *        docker0\n"
+    )
+
+    def setUp(self):
+        fd, self.arp_path = tempfile.mkstemp()
+        with os.fdopen(fd, 'w') as f:
+            f.write(self.ARP_TABLE)
+        self.scanner = NetworkScanner()
+        self.scanner.ARP_TABLE_PATH = self.arp_path
+        self.scanned = []
+        self.scanner.iter_scan_hosts = lambda hosts, *args, **kwargs: self.scanned.append(list(hosts)) or iter([])
+
+    def tearDown(self):
+        os.unlink(self.arp_path)
+
+    def test_read_neighbor_table_skips_incomplete(self):
+        self.assertEqual(self.scanner.read_neighbor_table(), {
+            "192.168.0.41": "aa:bb:cc:dd:ee:01",
+            "192.168.0.58": "aa:bb:cc:dd:ee:02",
+            "10.0.0.5": "aa:bb:cc:dd:ee:03",
+        })
+
+    def test_full_sweep_probes_neighbors_first(self):
+        self.scanner.scan_subnet("192.168.0.0/24")
+        self.assertEqual(len(self.scanned), 1)
+        self.assertEqual(self.scanned[0][:2], ["192.168.0.41", "192.168.0.58"])
+        self.assertEqual(len(self.scanned[0]), 254)
+
+    def test_neighbors_sweep_skips_remainder(self):
+        self.scanner.scan_subnet("192.168.0.0/24", sweep="neighbors")
+        self.assertEqual(self.scanned, [["192.168.0.41", "192.168.0.58"]])
+
+    def test_background_sweep_scans_remainder_later(self):
+        self.scanner.scan_subnet("192.168.0.0/24", sweep="background")
+        self.scanner.wait_background_sweep(timeout=5)
+        self.assertEqual(self.scanned[0], ["192.168.0.41", "192.168.0.58"])
+        self.assertEqual(len(self.scanned[1]), 252)
+        self.assertNotIn("192.168.0.41", self.scanned[1])
+
+
+class TestScanProfiles(unittest.TestCase):
+    def test_profiles_select_ports(self):
+        ecosystem = NetworkScanner()
+        self.assertEqual(ecosystem.profile, "ecosystem")
+        # Database and monitoring have no specific port among the common ones: one is added
+        self.assertEqual(ecosystem.ports, NetworkScanner.COMMON_PORTS + [5432, 9090])
+        self.assertEqual(ecosystem.role_ports["database"], [3306, 6379])
+        self.assertNotIn("llm_server", ecosystem.role_ports)  # Common ports cover it
+
+        full = NetworkScanner(profile="full")
+        self.assertTrue({5432, 6379, 9090, 9200}.issubset(full.ports))
+        self.assertEqual(full.role_ports, {})
+        self.assertEqual(full.all_ports, ecosystem.all_ports)
+
+        self.assertEqual(NetworkScanner(profile="quick").all_ports, sorted(NetworkScanner.COMMON_PORTS))
+        self.assertEqual(NetworkScanner(ports=[22, 5432]).profile, "custom")
+
+        custom = NetworkScanner(profile="custom", roles=["database"])
+        self.assertEqual(custom.ports, custom.ports_for_roles(["database"]))
+        self.assertEqual(custom.role_ports, {})
+        self.assertEqual(custom.ports_for_roles(["database", "monitoring"]),
+                         [22, 2222, 3000, 3306, 5432, 5601, 6379, 9090, 9200])
+
+    def test_ssh_alone_makes_no_role_candidate(self):
+        scanner = NetworkScanner()
+        self.assertEqual(scanner._second_phase_ports([22]), [])
+        self.assertEqual(scanner._second_phase_ports([22, 2222, 80, 443]), [])
+        self.assertEqual(scanner._second_phase_ports([22, 5432]), [3306, 6379])
+        # 3000 is shared by orchestration and monitoring, so it points to neither
+        self.assertEqual(scanner._second_phase_ports([3000]), [])
+
+    def test_invalid_profiles_rejected(self):
+        for kwargs in ({"profile": "everything"}, {"profile": "custom"}, {"roles": ["toaster"]},
+                       {"ports": [22], "roles": ["database"]}):
+            with self.assertRaises(ValueError, msg=kwargs):
+                NetworkScanner(**kwargs)
+
+    def test_role_ports_probed_only_on_candidates(self):
+        listeners = []
+        for _ in range(2):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(("127.0.0.1", 0))
+            sock.listen(16)
+            listeners.append(sock)
+        ssh_port, db_port = (sock.getsockname()[1] for sock in listeners)
+
+        class LoopbackScanner(NetworkScanner):
+            COMMON_PORTS = [ssh_port]
+
+        classifier = ServerClassifier({
+            "database": {"ports": [ssh_port, db_port, 1]},
+            "web": {"ports": [2, 3]},
+        })
+        try:
+            for engine in NetworkScanner.ENGINES:
+                scanner = LoopbackScanner(engine=engine, classifier=classifier, resolver=offline_resolver())
+                with patch.object(scanner, 'scan_port', wraps=scanner.scan_port) as scan_port, \
+                        patch.object(scanner, '_async_scan_port', wraps=scanner._async_scan_port) as async_scan_port:
+                    server, = scanner.scan_hosts(["127.0.0.1"], timeout=0.5)
+                probed = [c.args[1] for c in scan_port.call_args_list + async_scan_port.call_args_list]
+                self.assertEqual(server.open_ports, sorted([ssh_port, db_port]), engine)
+                self.assertEqual(server.server_type, "database", engine)
+                # Port 2 stands in for "web" in the first phase; 3 is not probed
+                self.assertEqual(sorted(probed), sorted([ssh_port, 2, db_port, 1]), engine)
+        finally:
+            for sock in listeners:
+                sock.close()
+
+
+class TestDualStack(unittest.TestCase):
+    IP_NEIGH = (
+        "fe80::1 dev eth0 lladdr AA:BB:CC:DD:EE:01 router STALE\n"
+        "2001:db8::41 dev eth0 lladdr aa:bb:cc:dd:ee:01 REACHABLE\n"
+        "2001:db8::77 dev eth0 lladdr aa:bb:cc:dd:ee:07 DELAY\n"
+        "2001:db8::99 dev eth0 FAILED\n"
+        "fe80::5 dev eth0 INCOMPLETE\n"
+    )
+
+    def setUp(self):
+        fd, self.arp_path = tempfile.mkstemp()
+        with os.fdopen(fd, 'w') as f:
+            f.write(TestNeighborSeededSweep.ARP_TABLE)
+        self.scanner = NetworkScanner(ipv6=True, resolver=offline_resolver())
+        self.scanner.ARP_TABLE_PATH = self.arp_path
+
+    def tearDown(self):
+        os.unlink(self.arp_path)
+
+    def test_parse_ipv6_neighbors(self):
+        self.assertEqual(NetworkScanner._parse_ipv6_neighbors(self.IP_NEIGH), {
+            "fe80::1%eth0": "aa:bb:cc:dd:ee:01",
+            "2001:db8::41": "aa:bb:cc:dd:ee:01",
+            "2001:db8::77": "aa:bb:cc:dd:ee:07",
+        })
+        # `ip -6 neigh show dev eth0` omits the device
+        self.assertEqual(NetworkScanner._parse_ipv6_neighbors("fe80::9 lladdr 52:54:00:00:00:09 STALE", "eth0"),
+                         {"fe80::9%eth0": "52:54:00:00:00:09"})
+
+    def test_faster_family_is_probed_once_per_machine(self):
+        ipv4 = {"192.168.0.41": "aa:bb:cc:dd:ee:01", "192.168.0.58": "aa:bb:cc:dd:ee:02"}
+        ipv6 = NetworkScanner._parse_ipv6_neighbors(self.IP_NEIGH)
+        ipv6["2001:db8::58"] = "aa:bb:cc:dd:ee:02"
+        rtts = {"192.168.0.41": 9.0, "fe80::1%eth0": 2.0, "2001:db8::41": 2.0,
+                "192.168.0.58": 1.0, "2001:db8::58": 0.9}
+        with patch.object(self.scanner, 'check_liveness', return_value=rtts):
+            hosts, identities = self.scanner._plan_dual_stack(["192.168.0.41", "192.168.0.58", "192.168.0.60"],
+                                                              ipv4, ipv6)
+        # .41 is much faster over IPv6 (global address preferred); .58 isn't faster enough
+        self.assertEqual(hosts, ["192.168.0.58", "192.168.0.60", "2001:db8::41", "2001:db8::77"])
+        self.assertEqual(identities["2001:db8::41"],
+                         ("aa:bb:cc:dd:ee:01", ["192.168.0.41", "fe80::1%eth0", "2001:db8::41"]))
+        self.assertNotIn("192.168.0.60", identities)
+
+    def test_dual_stack_scan_merges_identities(self):
+        ipv6 = {"2001:db8::41": "aa:bb:cc:dd:ee:01", "2001:db8::7": None}
+        found = []
+
+        def scan_hosts(hosts, *args, **kwargs):
+            found.extend(hosts)
+            return iter([self.scanner._build_server_info(ip, None, [22], 1.0) for ip in hosts])
+
+        with patch.object(self.scanner, 'discover_ipv6_neighbors', return_value=ipv6), \
+                patch.object(self.scanner, 'check_liveness', return_value={"2001:db8::41": 0.5}), \
+                patch.object(self.scanner, 'iter_scan_hosts', side_effect=scan_hosts):
+            servers = list(self.scanner.iter_scan_dual_stack("192.168.0.0/24", sweep="neighbors", interface="eth0"))
+
+        self.assertEqual(found, ["192.168.0.58", "2001:db8::41", "2001:db8::7"])
+        merged = servers[1]
+        self.assertEqual(merged.mac, "aa:bb:cc:dd:ee:01")
+        self.assertEqual(merged.addresses, ["192.168.0.41", "2001:db8::41"])
+        self.assertEqual(merged.interface, "eth0")
+        self.assertIsNone(servers[2].mac)
+
+
+class TestMultiInterfaceDiscovery(unittest.TestCase):
+    Addr = namedtuple('Addr', 'family address netmask broadcast ptp')
+
+    def test_list_interfaces_filters(self):
+        fake = {
+            "lo": [self.Addr(socket.AF_INET, "127.0.0.1", "255.0.0.0", None, None)],
+            "eth0": [self.Addr(socket.AF_INET, "192.168.0.10", "255.255.255.0", None, None)],
+            "docker0": [self.Addr(socket.AF_INET, "172.17.0.1", "255.255.0.0", None, None)],
+            "tailscale0": [self.Addr(socket.AF_INET, "100.64.0.7", "255.255.255.255", None, None)],
+        }
+        scanner = NetworkScanner()
+        with patch('psutil.net_if_addrs', return_value=fake):
+            self.assertEqual([i["interface"] for i in scanner.list_interfaces()],
+                             ["eth0", "docker0", "tailscale0"])
+            self.assertEqual(scanner.list_interfaces(exclude=["docker*"])[0],
+                             {"interface": "eth0", "local_ip": "192.168.0.10", "subnet": "192.168.0.0/24"})
+            self.assertEqual([i["subnet"] for i in scanner.list_interfaces(include=["tail*"])],
+                             ["100.64.0.7/32"])
+
+    def test_interfaces_scanned_and_attributed(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("0.0.0.0", 0))
+        listener.listen(16)
+        self.addCleanup(listener.close)
+
+        scanner = NetworkScanner(engine="asyncio", ports=[listener.getsockname()[1]], resolver=offline_resolver())
+        targets = [
+            {"interface": "lan0", "local_ip": "127.0.0.1", "subnet": "127.0.0.0/30"},
+            {"interface": "lan1", "local_ip": "127.0.1.1", "subnet": "127.0.1.0/30"},
+        ]
+        seen = []
+        with patch.object(scanner, 'get_local_network_info',
+                          return_value={"local_ip": "127.0.0.1", "subnet": None, "gateway": None, "interface": None}), \
+                patch.object(scanner, 'list_interfaces', return_value=targets):
+            topology = scanner.discover_network_topology(all_interfaces=True, on_server=seen.append)
+
+        self.assertEqual(topology.interfaces, {"lan0": "127.0.0.0/30", "lan1": "127.0.1.0/30"})
+        self.assertEqual(topology.total_hosts, 4)
+        self.assertEqual(len(seen), 4)
+        by_ip = {s.ip_address: s.interface for s in topology.servers}
+        self.assertEqual(by_ip["127.0.0.2"], "lan0")
+        self.assertEqual(by_ip["127.0.1.2"], "lan1")
+
+    def test_ecosystem_scan_streams_interface_hosts(self):
+        targets = [
+            {"interface": "lan0", "local_ip": "192.168.0.10", "subnet": "192.168.0.0/24"},
+            {"interface": "lan1", "local_ip": "10.0.0.10", "subnet": "10.0.0.0/24"},
+        ]
+        events = []
+
+        def fake_scan(interface, subnet):
+            for n in (2, 3):
+                ip = subnet.replace("0/24", str(n))
+                events.append(("found", ip))
+                yield ServerInfo(ip_address=ip, hostname=None, open_ports=[22, 5432], ssh_port=22,
+                                 services={}, ping_time=1.0, server_type="database", interface=interface)
+
+        scanner = NetworkScanner(interfaces=["lan*"])
+        with patch.object(scanner, 'list_interfaces', return_value=targets), \
+                patch.object(scanner, '_iter_scan_interface', side_effect=fake_scan):
+            servers = scanner.scan_ecosystem(on_server=lambda s: events.append(("reported", s.ip_address)))
+
+        self.assertEqual(len(servers), 4)
+        # Every host is reported before the next one is scanned
+        self.assertEqual(events[:4], [("found", "192.168.0.2"), ("reported", "192.168.0.2"),
+                                      ("found", "192.168.0.3"), ("reported", "192.168.0.3")])
+
+    def test_constructor_selection_is_the_default(self):
+        targets = [{"interface": "eth0", "local_ip": "192.168.0.10", "subnet": "192.168.0.0/24"}]
+        scanner = NetworkScanner(exclude_interfaces=["docker*"])
+        with patch.object(scanner, 'get_local_network_info', return_value={}), \
+                patch.object(scanner, 'list_interfaces', return_value=targets) as list_interfaces, \
+                patch.object(scanner, '_discover_interfaces', return_value=NetworkTopology(
+                    "192.168.0.10", "192.168.0.0/24", "unknown", [], 0, [])) as discover:
+            scanner.discover_network_topology()
+            self.assertEqual(scanner.history_scope(), "192.168.0.0/24")
+            # An explicit selection overrides it
+            scanner.discover_network_topology(interfaces=["eth1"])
+        self.assertEqual(list_interfaces.call_args_list[0], call(None, ["docker*"]))
+        self.assertEqual(list_interfaces.call_args_list[-1], call(["eth1"], None))
+        self.assertEqual(discover.call_count, 2)
+        self.assertIsNone(NetworkScanner()._interface_targets())
+
+
+class TestTopologyHostnames(unittest.TestCase):
+    def test_topology_waits_for_pending_reverse_lookups(self):
+        def slow_ptr(ip):
+            time.sleep(0.3)
+            return (f"host-{ip.rsplit('.', 1)[1]}", [], [ip])
+
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(16)
+        self.addCleanup(listener.close)
+
+        scanner = NetworkScanner(ports=[listener.getsockname()[1]], resolver=HostnameResolver(local_names=False))
+        targets = [{"interface": "lan0", "local_ip": "127.0.0.1", "subnet": "127.0.0.0/30"}]
+        with patch('tools.hostname_resolver.socket.gethostbyaddr', side_effect=slow_ptr), \
+                patch.object(scanner, 'get_local_network_info', return_value={}), \
+                patch.object(scanner, 'list_interfaces', return_value=targets):
+            topology = scanner.discover_network_topology(all_interfaces=True)
+
+        self.assertEqual(sorted(s.hostname for s in topology.servers), ["host-1", "host-2"])
+
+
+class TestProcNetworkInfo(unittest.TestCase):
+    ROUTE = (
+        "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+        "eth0\t00000000\t0100A8C0\t0003\t0\t0\t100\t00000000\t0\t0\t0\n"
+        "eth0\t0000A8C0\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0\n"
+        "docker0\t000011AC\t00000000\t0001\t0\t0\t0\t0000FFFF\t0\t0\t0\n"
+    )
+    FIB_TRIE = (
+        "Local:\n"
+        "  +-- 0.0.0.0/0 3 0 5\n"
+        "     +-- 127.0.0.0/8 2 0 2\n"
+        "           |-- 127.0.0.1\n"
+        "              /32 host LOCAL\n"
+        "     |-- 172.17.0.1\n"
+        "        /32 host LOCAL\n"
+        "     +-- 192.168.0.0/24 2 0 2\n"
+        "           |-- 192.168.0.0\n"
+        "              /24 link UNICAST\n"
+        "           |-- 192.168.0.10\n"
+        "              /32 host LOCAL\n"
+    )
+    IF_INET6 = (
+        "fe800000000000000000000000000001 02 40 20 80     eth0\n"
+        "20010db8000000000000000000000010 02 40 00 80     eth0\n"
+    )
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.scanner = NetworkScanner()
+        for attr, name, content in (("ROUTE_TABLE_PATH", "route", self.ROUTE),
+                                    ("FIB_TRIE_PATH", "fib_trie", self.FIB_TRIE),
+                                    ("IF_INET6_PATH", "if_inet6", self.IF_INET6)):
+            path = os.path.join(self.temp_dir, name)
+            with open(path, 'w') as f:
+                f.write(content)
+            setattr(self.scanner, attr, path)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_network_info_without_subprocess(self):
+        with patch('tools.network_scanner.subprocess.run') as run, \
+                patch('tools.network_scanner.socket.gethostbyname') as resolve:
+            info = self.scanner.get_local_network_info()
+        run.assert_not_called()
+        resolve.assert_not_called()
+        self.assertEqual(info, {
+            "local_ip": "192.168.0.10",
+            "subnet": "192.168.0.0/24",
+            "gateway": "192.168.0.1",
+            "interface": "eth0",
+            "local_ipv6": "2001:db8::10",
+        })
+
+    def test_falls_back_without_default_route(self):
+        with open(self.scanner.ROUTE_TABLE_PATH, 'w') as f:
+            f.write(self.ROUTE.splitlines()[0] + "\n")
+        self.assertIsNone(self.scanner._network_info_from_proc())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import time
+import socket
+import struct
+import unittest
+from unittest.mock import patch
+
+from tools.hostname_resolver import HostnameResolver
+from tools.network_scanner import NetworkScanner, NetworkTopology
+from tools.passive_discovery import (DNS_A, DNS_PTR, DNS_SRV, DiscoveredHost, PassiveListener,
+                                     parse_dns_records, parse_ssdp)
+
+
+def dns_name(name: str) -> bytes:
+    return b"".join(bytes([len(label)]) + label.encode() for label in name.split(".")) + b"\x00"
+
+
+def mdns_response(records) -> bytes:
+    """Encode (name, type, rdata) records as an uncompressed mDNS response."""
+    packet = struct.pack("!HHHHHH", 0, 0x8400, 0, len(records), 0, 0)
+    for name, rtype, rdata in records:
+        packet += dns_name(name) + struct.pack("!HHIH", rtype, 0x8001, 120, len(rdata)) + rdata
+    return packet
+
+
+def srv(target: str, port: int) -> bytes:
+    return struct.pack("!HHH", 0, 0, port) + dns_name(target)
+
+
+NAS_ANNOUNCEMENT = mdns_response([
+    ("_ssh._tcp.local", DNS_PTR, dns_name("nas._ssh._tcp.local")),
+    ("nas._ssh._tcp.local", DNS_SRV, srv("nas.local", 22)),
+    ("nas.local", DNS_A, socket.inet_aton("127.66.0.10")),
+    ("10.0.66.127.in-addr.arpa", DNS_PTR, dns_name("nas.local")),
+])
+
+TV_NOTIFY = (
+    "NOTIFY * HTTP/1.1\r\n"
+    "HOST: 239.255.255.250:1900\r\n"
+    "NT: urn:schemas-upnp-org:device:MediaRenderer:1\r\n"
+    "NTS: ssdp:alive\r\n"
+    "LOCATION: http://127.66.0.20:49152/description.xml\r\n"
+    "USN: uuid:tv::urn:schemas-upnp-org:device:MediaRenderer:1\r\n\r\n"
+).encode()
+
+
+class TestParsers(unittest.TestCase):
+    def test_parse_dns_records(self):
+        records = parse_dns_records(NAS_ANNOUNCEMENT)
+        self.assertIn(("nas._ssh._tcp.local", DNS_SRV, ("nas.local", 22)), records)
+        self.assertIn(("nas.local", DNS_A, "127.66.0.10"), records)
+
+    def test_compressed_names(self):
+        # Answer name is a pointer to the question name at offset 12
+        packet = struct.pack("!HHHHHH", 0, 0x8400, 1, 1, 0, 0) + dns_name("tv.local") + struct.pack("!HH", 1, 1)
+        packet += b"\xc0\x0c" + struct.pack("!HHIH", DNS_A, 1, 120, 4) + socket.inet_aton("10.0.0.9")
+        self.assertEqual(parse_dns_records(packet), [("tv.local", DNS_A, "10.0.0.9")])
+
+    def test_queries_and_truncated_packets(self):
+        query = struct.pack("!HHHHHH", 0, 0, 1, 0, 0, 0) + dns_name("nas.local") + struct.pack("!HH", 1, 1)
+        self.assertEqual(parse_dns_records(query), [])
+        with self.assertRaises(ValueError):
+            parse_dns_records(NAS_ANNOUNCEMENT[:40])
+
+    def test_parse_ssdp(self):
+        self.assertEqual(parse_ssdp(TV_NOTIFY)["nt"], "urn:schemas-upnp-org:device:MediaRenderer:1")
+        self.assertIsNone(parse_ssdp(b"M-SEARCH * HTTP/1.1\r\nST: ssdp:all\r\n\r\n"))
+
+
+class TestPassiveListener(unittest.TestCase):
+    """Announcements multicast over loopback, on private groups and ephemeral ports."""
+
+    def setUp(self):
+        self.resolver = HostnameResolver(local_names=False)
+        self.listener = PassiveListener(resolver=self.resolver, interface_ip="127.0.0.1",
+                                        mdns=("239.255.77.251", 0), ssdp=("239.255.77.250", 0))
+        self.listener.start()
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton("127.0.0.1"))
+        self.sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+
+    def tearDown(self):
+        self.sender.close()
+        self.listener.stop()
+
+    def announce(self, protocol: str, data: bytes):
+        self.sender.sendto(data, (self.listener.groups[protocol][0], self.listener.ports[protocol]))
+
+    def wait_for(self, predicate, timeout: float = 2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate(self.listener.hosts()):
+                return self.listener.hosts()
+            time.sleep(0.01)
+        self.fail(f"Not discovered: {self.listener.hosts()}")
+
+    def test_mdns_service_announcement(self):
+        self.announce("mdns", NAS_ANNOUNCEMENT)
+        hosts = self.wait_for(lambda hosts: hosts.get("127.66.0.10", DiscoveredHost("")).services)
+        nas = hosts["127.66.0.10"]
+        self.assertEqual(nas.hostnames, ["nas.local"])
+        self.assertEqual(nas.services, {"_ssh._tcp": 22})
+        self.assertEqual(nas.sources, ["mdns"])
+        self.assertEqual(self.resolver.lookup("127.66.0.10"), "nas.local")
+
+    def test_ssdp_alive_and_byebye(self):
+        self.announce("ssdp", TV_NOTIFY)
+        hosts = self.wait_for(lambda hosts: "127.66.0.20" in hosts)
+        self.assertEqual(hosts["127.66.0.20"].services, {"urn:schemas-upnp-org:device:MediaRenderer:1": 49152})
+
+        self.announce("ssdp", TV_NOTIFY.replace(b"ssdp:alive", b"ssdp:byebye"))
+        self.wait_for(lambda hosts: not hosts["127.66.0.20"].services)
+
+    def test_malformed_packets_are_ignored(self):
+        self.announce("mdns", b"\x00\x00\x84\x00garbage")
+        self.announce("mdns", NAS_ANNOUNCEMENT)
+        self.wait_for(lambda hosts: "127.66.0.10" in hosts)
+
+
+class TestMergeIntoTopology(unittest.TestCase):
+    def setUp(self):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.66.0.10", 0))
+        self.listener.listen(16)
+        self.port = self.listener.getsockname()[1]
+
+    def tearDown(self):
+        self.listener.close()
+
+    def test_known_servers_annotated_and_missed_hosts_probed(self):
+        scanner = NetworkScanner(ports=[self.port], resolver=HostnameResolver(local_names=False))
+        known = scanner._build_server_info("127.66.0.20", None, [], 1.0)
+        topology = NetworkTopology(local_ip="127.0.0.1", subnet="127.66.0.0/24", gateway="unknown",
+                                   servers=[known], total_hosts=1, ecosystem_servers=[])
+        heard = {
+            "127.66.0.10": DiscoveredHost("127.66.0.10", ["nas.local"], {"_ssh._tcp": 22}, ["mdns"]),
+            "127.66.0.20": DiscoveredHost("127.66.0.20", [], {"urn:dial-multiscreen-org:service:dial:1": None},
+                                          ["ssdp"]),
+        }
+        scanner.merge_passive(topology, heard, timeout=0.5)
+
+        servers = {s.ip_address: s for s in topology.servers}
+        self.assertEqual(topology.total_hosts, 2)
+        self.assertEqual(servers["127.66.0.10"].open_ports, [self.port])
+        self.assertEqual(servers["127.66.0.10"].hostname, "nas.local")
+        self.assertEqual(servers["127.66.0.10"].advertised, ["_ssh._tcp"])
+        self.assertEqual(servers["127.66.0.20"].advertised, ["urn:dial-multiscreen-org:service:dial:1"])
+
+    def test_only_hosts_in_scanned_networks_are_probed(self):
+        scanner = NetworkScanner(ports=[self.port], resolver=HostnameResolver(local_names=False))
+        topology = NetworkTopology(local_ip="127.0.0.1", subnet="127.66.0.0/24", gateway="unknown",
+                                   servers=[], total_hosts=0, ecosystem_servers=[])
+        heard = {ip: DiscoveredHost(ip, [], {}, ["mdns"]) for ip in ("127.66.0.10", "127.67.0.10", "fe80::10")}
+        with patch.object(scanner, "iter_scan_hosts", wraps=scanner.iter_scan_hosts) as scan_hosts:
+            scanner.merge_passive(topology, heard, timeout=0.5)
+
+        scan_hosts.assert_called_once_with(["127.66.0.10"], 0.5)
+        self.assertEqual([s.ip_address for s in topology.servers], ["127.66.0.10"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tools.path_index import PathIndex
+
+
+class TestPathIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.first = os.path.join(self.temp_dir, "first")
+        self.second = os.path.join(self.temp_dir, "second")
+        os.makedirs(self.first)
+        os.makedirs(self.second)
+        self.path = os.pathsep.join([self.first, self.second, os.path.join(self.temp_dir, "missing")])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make(self, directory: str, name: str, executable: bool = True) -> str:
+        path = os.path.join(directory, name)
+        with open(path, 'w') as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(path, 0o755 if executable else 0o644)
+        return path
+
+    def test_matches_shutil_which(self):
+        tool = self.make(self.second, "tool")
+        self.make(self.first, "notes", executable=False)
+        os.makedirs(os.path.join(self.first, "subdir"))
+        index = PathIndex(path=self.path)
+        for command in ("tool", "notes", "subdir", "absent", tool):
+            self.assertEqual(index.which(command), shutil.which(command, path=self.path), command)
+
+    def test_earlier_directories_win(self):
+        self.make(self.second, "tool")
+        preferred = self.make(self.first, "tool")
+        self.assertEqual(PathIndex(path=self.path).which("tool"), preferred)
+
+    def test_lookups_reuse_one_scan(self):
+        self.make(self.first, "tool")
+        index = PathIndex(path=self.path)
+        for _ in range(50):
+            self.assertTrue(index.exists("tool"))
+            self.assertFalse(index.exists("absent"))
+        self.assertEqual(index.scans, 1)
+
+    def test_new_command_seen_after_directory_changes(self):
+        index = PathIndex(path=self.path, recheck_interval=0.0)
+        self.assertFalse(index.exists("tool"))
+        self.make(self.second, "tool")
+        os.utime(self.second, ns=(0, os.stat(self.second).st_mtime_ns + 1))
+        self.assertTrue(index.exists("tool"))
+        self.assertEqual(index.scans, 2)
+
+    def test_invalidate_forces_rescan(self):
+        index = PathIndex(path=self.path, recheck_interval=3600)
+        self.assertFalse(index.exists("tool"))
+        self.make(self.first, "tool")
+        self.assertFalse(index.exists("tool"))
+        index.invalidate()
+        self.assertTrue(index.exists("tool"))
+
+    def test_follows_path_environment(self):
+        self.make(self.second, "tool")
+        index = PathIndex()
+        with patch.dict(os.environ, {"PATH": self.first}):
+            self.assertFalse(index.exists("tool"))
+        with patch.dict(os.environ, {"PATH": self.path}):
+            self.assertTrue(index.exists("tool"))
+        self.assertEqual(index.scans, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import time
+import threading
+import unittest
+
+from tools.probe_runner import ProbeRunner
+
+
+class TestProbeRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = ProbeRunner(max_workers=4)
+
+    def test_independent_probes_overlap(self):
+        for name in ("a", "b", "c"):
+            self.runner.register(name, lambda name=name: time.sleep(0.2) or name)
+        started = time.monotonic()
+        results = self.runner.run()
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual({name: r.value for name, r in results.items()}, {"a": "a", "b": "b", "c": "c"})
+
+    def test_inputs_are_passed_to_dependents(self):
+        order = []
+        self.runner.register("cores", lambda: order.append("cores") or 4)
+        self.runner.register("memory", lambda: order.append("memory") or 8)
+        self.runner.register("summary", lambda cores, memory: order.append("summary") or f"{cores}c/{memory}G",
+                             requires=["cores", "memory"])
+        self.runner.register("unrelated", lambda: order.append("unrelated"))
+
+        results = self.runner.run(["summary"])
+        self.assertEqual(results["summary"].value, "4c/8G")
+        self.assertNotIn("unrelated", results)
+        self.assertEqual(order[-1], "summary")
+
+    def test_timeout_yields_default_without_waiting(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.runner.register("hung", lambda: release.wait(5) and "late", timeout=0.1, default={"zones": []})
+        self.runner.register("uses_hung", lambda hung: hung["zones"], requires=["hung"])
+
+        started = time.monotonic()
+        results = self.runner.run()
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(results["hung"].status, "timeout")
+        self.assertEqual(results["hung"].value, {"zones": []})
+        self.assertTrue(results["uses_hung"].ok)
+
+    def test_timeout_clock_starts_when_probe_starts(self):
+        runner = ProbeRunner(max_workers=1)
+        runner.register("first", lambda: time.sleep(0.15) or 1, timeout=1.0)
+        runner.register("second", lambda: time.sleep(0.05) or 2, timeout=0.1)
+        results = runner.run()
+        self.assertEqual((results["first"].status, results["second"].status), ("ok", "ok"))
+
+    def test_failures_yield_default_copies(self):
+        default = {"sensors_available": False}
+        self.runner.register("broken", lambda: 1 / 0, default=default)
+        with self.assertLogs("tools.probe_runner", level="WARNING"):
+            result = self.runner.run()["broken"]
+        self.assertEqual(result.status, "error")
+        self.assertEqual(result.value, default)
+        self.assertIsNot(result.value, default)
+
+    def test_plan_rejects_cycles_and_unknown_probes(self):
+        self.runner.register("a", lambda b: b, requires=["b"])
+        self.runner.register("b", lambda a: a, requires=["a"])
+        with self.assertRaises(ValueError):
+            self.runner.plan(["a"])
+        with self.assertRaises(KeyError):
+            self.runner.plan(["missing"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import asyncio
+import time
+import unittest
+
+from tools.rate_limiter import ScanBudget
+
+
+class TestScanBudget(unittest.TestCase):
+    def test_socket_slots_are_capped(self):
+        budget = ScanBudget(max_sockets=2)
+        self.assertEqual(budget.try_acquire(), 0)
+        self.assertEqual(budget.try_acquire(), 0)
+        self.assertGreater(budget.try_acquire(), 0)
+        budget.release()
+        self.assertEqual(budget.try_acquire(), 0)
+        self.assertEqual(budget.peak_in_flight, 2)
+
+    def test_token_bucket_limits_rate(self):
+        budget = ScanBudget(packets_per_second=200, burst=1)
+        start = time.monotonic()
+        for _ in range(21):
+            budget.take_token()
+        # First token comes from the burst, the next 20 at 200/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_async_slot_waits_for_release(self):
+        budget = ScanBudget(max_sockets=1)
+        order = []
+
+        async def worker(name):
+            async with budget.aslot():
+                order.append(name)
+                await asyncio.sleep(0.01)
+                self.assertEqual(budget.in_flight, 1)
+
+        async def main():
+            await asyncio.gather(worker("a"), worker("b"), worker("c"))
+
+        asyncio.run(main())
+        self.assertEqual(sorted(order), ["a", "b", "c"])
+        self.assertEqual(budget.peak_in_flight, 1)
+        self.assertEqual(budget.in_flight, 0)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            ScanBudget(max_sockets=0)
+        with self.assertRaises(ValueError):
+            ScanBudget(packets_per_second=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
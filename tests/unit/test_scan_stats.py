@@ -0,0 +1,143 @@
+import os
+import json
+import errno
+import socket
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tools.hostname_resolver import HostnameResolver
+from tools.network_scanner import NetworkScanner
+from tools.scan_stats import ScanStats, connect_outcome
+
+
+def closed_port() -> int:
+    """A loopback port nothing listens on."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestScanStats(unittest.TestCase):
+    def test_connect_outcome(self):
+        self.assertEqual(connect_outcome(0), "open")
+        self.assertEqual(connect_outcome(errno.ECONNREFUSED), "refused")
+        self.assertEqual(connect_outcome(errno.EAGAIN), "timeout")
+        self.assertEqual(connect_outcome(errno.EHOSTUNREACH), "error")
+
+    def test_probe_tracks_concurrency_and_outcomes(self):
+        stats = ScanStats()
+        with stats.probe("10.0.0.1", 22) as first:
+            with stats.probe("10.0.0.1", 80) as second:
+                second.outcome = "refused"
+            first.outcome = "open"
+        with stats.probe("10.0.0.1", 443):
+            pass  # Outcome never set: the connect failed unexpectedly
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["probes"], 3)
+        self.assertEqual(snapshot["outcomes"], {"open": 1, "refused": 1, "timeout": 0, "error": 1})
+        self.assertEqual(snapshot["peak_in_flight"], 2)
+        self.assertEqual(stats.in_flight, 0)
+
+    def test_stage_timings(self):
+        stats = ScanStats()
+        stats.add_timing("dns", 0.25)
+        stats.add_timing("dns", 0.75)
+        with stats.stage("classify"):
+            pass
+        self.assertEqual(stats.stages["dns"].count, 2)
+        self.assertAlmostEqual(stats.stages["dns"].mean_ms, 500.0)
+        self.assertAlmostEqual(stats.stages["dns"].max_ms, 750.0)
+        self.assertEqual(stats.stages["classify"].count, 1)
+        self.assertIn("dns 1000 ms/2", stats.summary())
+
+    def test_trace_file(self):
+        path = os.path.join(tempfile.mkdtemp(), "trace.jsonl")
+        stats = ScanStats(trace_path=path)
+        with stats.probe("10.0.0.1", 22) as probe:
+            probe.outcome = "timeout"
+        stats.add_timing("liveness", 0.1, hosts=254)
+        stats.close()
+        with open(path) as f:
+            events = [json.loads(line) for line in f]
+        self.assertEqual([e["event"] for e in events], ["probe", "stage", "summary"])
+        self.assertEqual(events[0]["outcome"], "timeout")
+        self.assertEqual(events[1]["hosts"], 254)
+        self.assertEqual(events[2]["outcomes"]["timeout"], 1)
+
+    def test_unwritable_trace_is_disabled(self):
+        stats = ScanStats(trace_path=os.path.join(tempfile.mkdtemp(), "missing", "trace.jsonl"))
+        with self.assertLogs("tools.scan_stats", level="WARNING"):
+            stats.add_timing("dns", 0.1)
+        self.assertIsNone(stats.trace_path)
+        self.assertEqual(stats.stages["dns"].count, 1)
+
+    def test_each_discovery_has_its_own_stats_and_trace_summary(self):
+        path = os.path.join(tempfile.mkdtemp(), "trace.jsonl")
+        scanner = NetworkScanner(resolver=HostnameResolver(local_names=False), trace=path)
+
+        def scan(subnet, **kwargs):
+            with scanner.stats.probe("192.168.0.41", 22) as probe:
+                probe.outcome = "open"
+            return iter([])
+
+        with patch.object(scanner, 'get_local_network_info', return_value={
+                "local_ip": "192.168.0.10", "subnet": "192.168.0.0/24", "gateway": "192.168.0.1",
+                "interface": "eth0"}), \
+                patch.object(scanner, 'iter_scan_subnet', side_effect=scan):
+            scanner.discover_network_topology()
+            scanner.discover_network_topology()
+        self.assertEqual(scanner.stats.snapshot()["probes"], 1)
+        with open(path) as f:
+            summaries = [event for event in map(json.loads, f) if event["event"] == "summary"]
+        self.assertEqual([summary["probes"] for summary in summaries], [1, 1])
+
+
+class TestScannerInstrumentation(unittest.TestCase):
+    """Probes against a loopback listener and a closed port."""
+
+    def setUp(self):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        self.open_port = self.listener.getsockname()[1]
+        self.closed_port = closed_port()
+
+    def tearDown(self):
+        self.listener.close()
+
+    def scanner(self, **kwargs) -> NetworkScanner:
+        return NetworkScanner(ports=[self.open_port, self.closed_port], profile="quick",
+                              resolver=HostnameResolver(local_names=False), **kwargs)
+
+    def test_thread_engine_counts_stages_and_outcomes(self):
+        scanner = self.scanner(engine="thread")
+        server = scanner._scan_single_host("127.0.0.1", 1.0, 0.5)
+        self.assertEqual(server.open_ports, [self.open_port])
+        snapshot = scanner.stats.snapshot()
+        self.assertEqual(snapshot["outcomes"]["open"], 1)
+        self.assertEqual(snapshot["outcomes"]["refused"], 1)
+        self.assertEqual(snapshot["stages"]["port_probe"]["count"], 1)
+        # Classification happens per batch of finished hosts, not per host scan
+        self.assertEqual(snapshot["stages"]["classify"]["count"], 0)
+
+    def test_asyncio_engine_counts_outcomes(self):
+        scanner = self.scanner(engine="asyncio")
+
+        async def scan():
+            return await scanner._async_scan_single_host("127.0.0.1", 1.0, asyncio.Semaphore(8), 0.5)
+
+        server = asyncio.run(scan())
+        self.assertEqual(server.open_ports, [self.open_port])
+        outcomes = scanner.stats.snapshot()["outcomes"]
+        self.assertEqual((outcomes["open"], outcomes["refused"]), (1, 1))
+
+    def test_reverse_lookups_are_timed(self):
+        scanner = self.scanner()
+        scanner.resolver.resolve("127.0.0.1", timeout=5.0)
+        self.assertEqual(scanner.stats.stages["dns"].count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
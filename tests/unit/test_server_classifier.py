@@ -0,0 +1,103 @@
+import os
+import json
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tools import server_classifier
+from tools.network_scanner import NetworkScanner, ServerInfo
+from tools.server_classifier import ServerClassifier, TypeMatch
+
+
+class TestServerClassifier(unittest.TestCase):
+    def setUp(self):
+        self.classifier = ServerClassifier(NetworkScanner.ECOSYSTEM_SERVERS)
+
+    def test_best_match_wins_over_profile_order(self):
+        # Matches orchestration (5/6 ports) and monitoring (all 6 ports)
+        ports = [22, 2222, 3000, 8123, 9000, 9090, 5601, 9200]
+        self.assertEqual(self.classifier.rank(ports), [
+            TypeMatch("monitoring", 1.0),
+            TypeMatch("orchestration", 0.833),
+        ])
+
+    def test_below_threshold_is_unclassified(self):
+        self.assertEqual(self.classifier.rank([22, 80]), [])
+        self.assertEqual(self.classifier.rank([]), [])
+
+    def test_fingerprinted_service_identifies_type(self):
+        self.assertEqual(self.classifier.rank([22, 8081], ["ssh"]), [])
+        self.assertEqual(self.classifier.rank([22, 8081], ["ssh", "ollama"]), [TypeMatch("llm_server", 1.0)])
+
+    def test_user_profiles_loaded_from_config(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "server_profiles.json")
+            with open(path, 'w') as f:
+                json.dump({"profiles": {
+                    "nas": {"ports": [22, 139, 445, 5000], "services": ["smb"], "threshold": 0.75},
+                    "database": {"ports": [5432], "threshold": 1.0},
+                    "broken": {"services": ["nothing"]},
+                }}, f)
+            classifier = ServerClassifier.from_config(NetworkScanner.ECOSYSTEM_SERVERS, path)
+
+        self.assertNotIn("broken", classifier.profiles)
+        self.assertEqual(classifier.rank([22, 139, 445]), [TypeMatch("nas", 0.75)])
+        self.assertEqual(classifier.rank([22, 139]), [])
+        # User profile replaced the built-in one
+        self.assertEqual(classifier.rank([5432]), [TypeMatch("database", 1.0)])
+
+    def test_unchanged_config_is_read_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "server_profiles.json")
+            with open(path, 'w') as f:
+                json.dump({"profiles": {"nas": {"ports": [139, 445]}}}, f)
+            with patch.object(ServerClassifier, 'load_profiles', wraps=ServerClassifier.load_profiles) as load:
+                for _ in range(3):
+                    classifier = ServerClassifier.from_config(NetworkScanner.ECOSYSTEM_SERVERS, path)
+                self.assertEqual(load.call_count, 1)
+
+                os.utime(path, ns=(0, 0))
+                ServerClassifier.from_config(NetworkScanner.ECOSYSTEM_SERVERS, path)
+                self.assertEqual(load.call_count, 2)
+        self.assertIn("nas", classifier.profiles)
+
+    def test_missing_config_keeps_builtin_profiles(self):
+        classifier = ServerClassifier.from_config(NetworkScanner.ECOSYSTEM_SERVERS, "/nonexistent/profiles.json")
+        self.assertEqual(set(classifier.profiles), set(NetworkScanner.ECOSYSTEM_SERVERS))
+
+    def test_large_batch_matches_single_host_results(self):
+        rng = random.Random(7)
+        all_ports = sorted({p for c in NetworkScanner.ECOSYSTEM_SERVERS.values() for p in c["ports"]} | {80, 443})
+        hosts = [rng.sample(all_ports, rng.randint(0, 8)) for _ in range(5000)]
+
+        batched = self.classifier.rank_many(hosts)
+        with patch.object(ServerClassifier, 'NUMPY_MIN_BATCH', 10 ** 9):
+            single = [self.classifier.rank(ports) for ports in hosts[:200]]
+        self.assertEqual(batched[:200], single)
+        self.assertTrue(any(batched))
+
+    @unittest.skipUnless(server_classifier.np is not None, "NumPy not installed")
+    def test_numpy_and_bitset_paths_agree(self):
+        hosts = [[22, 2222, 11434, 8080], [22, 3000], [22, 2222, 5432, 6379, 3306]] * 30
+        with_numpy = self.classifier.rank_many(hosts)
+        with patch.object(server_classifier, 'np', None):
+            bitsets = ServerClassifier(NetworkScanner.ECOSYSTEM_SERVERS).rank_many(hosts)
+        self.assertEqual(with_numpy, bitsets)
+
+
+class TestScannerClassification(unittest.TestCase):
+    def test_classify_servers_sets_type_and_confidence(self):
+        scanner = NetworkScanner(classifier=ServerClassifier(NetworkScanner.ECOSYSTEM_SERVERS))
+        servers = [
+            ServerInfo("192.168.0.41", None, [22, 2222, 8080, 11434], 22, {}, 0.5, None),
+            ServerInfo("192.168.0.42", None, [22], 22, {}, 0.5, None),
+        ]
+        scanner.classify_servers(servers)
+        self.assertEqual([(s.server_type, s.type_confidence) for s in servers],
+                         [("llm_server", 1.0), (None, None)])
+        self.assertEqual(scanner.identify_server_type(servers[0]), "llm_server")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from tools.network_scanner import NetworkScanner, ServerInfo
+from tools.ssh_probe import SshProber
+
+
+class FakeSshServer:
+    """Loopback server sending lines (after a delay) to every client."""
+
+    def __init__(self, lines: bytes, delay: float = 0.0, host: str = "127.0.0.1"):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind((host, 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.lines = lines
+        self.delay = delay
+        self.received = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            try:
+                time.sleep(self.delay)
+                conn.sendall(self.lines)
+                conn.settimeout(1.0)
+                self.received.append(conn.recv(256))
+            except OSError:
+                pass
+
+    def close(self):
+        self.sock.close()
+
+
+class TestSshProber(unittest.TestCase):
+    def setUp(self):
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+
+    def serve(self, lines: bytes, delay: float = 0.0, host: str = "127.0.0.1") -> int:
+        server = FakeSshServer(lines, delay, host)
+        self.servers.append(server)
+        return server.port
+
+    def closed_port(self) -> int:
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        return port
+
+    def test_reads_identification_and_measures_handshake(self):
+        port = self.serve(b"Welcome to the lab\r\nSSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13\r\n")
+        result = SshProber(timeout=2).probe_many([("127.0.0.1", port)])["127.0.0.1"]
+        self.assertTrue(result.ssh_ok)
+        self.assertEqual(result.banner, "SSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13")
+        self.assertGreaterEqual(result.handshake_ms, result.connect_ms)
+        self.assertIsNone(result.auth)
+        # We identify ourselves before hanging up
+        for _ in range(100):
+            if self.servers[0].received:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.servers[0].received, [SshProber.CLIENT_IDENT])
+
+    def test_hosts_probed_concurrently(self):
+        targets = [(f"127.0.0.{i}", self.serve(b"SSH-2.0-OpenSSH_9.6\r\n", 0.4, f"127.0.0.{i}")) for i in range(1, 6)]
+        started = time.monotonic()
+        results = SshProber(timeout=2).probe_many(targets)
+        self.assertLess(time.monotonic() - started, 1.5)  # Serially this takes 5 x 0.4 s
+        self.assertTrue(all(r.ssh_ok for r in results.values()))
+
+    def test_failures_reported(self):
+        results = SshProber(timeout=0.3).probe_many([
+            ("127.0.0.1", self.closed_port()),
+            ("127.0.0.2", self.serve(b"HTTP/1.1 400 Bad Request\r\n\r\n", host="127.0.0.2")),
+        ])
+        self.assertFalse(results["127.0.0.1"].connected)
+        self.assertIn("connect failed", results["127.0.0.1"].error)
+        self.assertTrue(results["127.0.0.2"].connected)
+        self.assertFalse(results["127.0.0.2"].ssh_ok)
+
+    def test_key_auth_through_control_master(self):
+        port = self.serve(b"SSH-2.0-OpenSSH_9.6\r\n")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            args_file = os.path.join(temp_dir, "args")
+            fake_ssh = os.path.join(temp_dir, "ssh")
+            with open(fake_ssh, 'w') as f:
+                f.write(f'#!/bin/sh\necho "$@" >> {args_file}\n'
+                        f'case "$*" in *denied*) echo "Permission denied (publickey)." >&2; exit 255;; esac\n')
+            os.chmod(fake_ssh, stat.S_IRWXU)
+
+            prober = SshProber(timeout=2, control_dir=os.path.join(temp_dir, "cm"))
+            with patch('tools.ssh_probe.shutil.which', return_value=fake_ssh):
+                ok = prober.probe_many([("127.0.0.1", port)], authenticate=True)["127.0.0.1"]
+                prober.user = "denied"
+                denied = prober.probe_many([("127.0.0.1", port)], authenticate=True)["127.0.0.1"]
+            with open(args_file) as f:
+                args = f.readline().split()
+
+        self.assertTrue(ok.auth)
+        self.assertIsNotNone(ok.auth_ms)
+        self.assertFalse(denied.auth)
+        self.assertEqual(denied.error, "Permission denied (publickey).")
+        self.assertIn("BatchMode=yes", args)
+        self.assertIn("StrictHostKeyChecking=yes", args)
+        self.assertIn("ControlMaster=auto", args)
+        self.assertIn(f"ControlPath={os.path.join(temp_dir, 'cm', '%C')}", args)
+        self.assertEqual(args[-2:], ["127.0.0.1", "true"])
+
+    def test_unknown_host_key_is_reported_not_accepted(self):
+        port = self.serve(b"SSH-2.0-OpenSSH_9.6\r\n")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fake_ssh = os.path.join(temp_dir, "ssh")
+            with open(fake_ssh, 'w') as f:
+                f.write('#!/bin/sh\necho "No ED25519 host key is known for 127.0.0.1 and you have requested '
+                        'strict checking." >&2\necho "Host key verification failed." >&2\nexit 255\n')
+            os.chmod(fake_ssh, stat.S_IRWXU)
+            prober = SshProber(timeout=2, control_dir=os.path.join(temp_dir, "cm"))
+            with patch('tools.ssh_probe.shutil.which', return_value=fake_ssh):
+                result = prober.probe_many([("127.0.0.1", port)], authenticate=True)["127.0.0.1"]
+        self.assertEqual(result.host_key, "unknown")
+        self.assertIsNone(result.auth)
+        self.assertEqual(result.error, "Host key verification failed.")
+
+    def test_timeouts_are_named(self):
+        port = self.serve(b"SSH-2.0-OpenSSH_9.6\r\n", delay=1.0)
+        result = SshProber(timeout=0.2).probe_many([("127.0.0.1", port)])["127.0.0.1"]
+        self.assertEqual(result.error, "no identification: TimeoutError")
+
+
+class TestScannerSshConnectivity(unittest.TestCase):
+    def test_returns_reachability_per_server(self):
+        server = FakeSshServer(b"SSH-2.0-OpenSSH_9.6\r\n")
+        try:
+            servers = [
+                ServerInfo("127.0.0.1", None, [server.port], server.port, {}, 0.1, None),
+                ServerInfo("127.0.0.2", None, [80], None, {}, 0.1, None),
+            ]
+            results = NetworkScanner().test_ssh_connectivity(servers)
+        finally:
+            server.close()
+        self.assertEqual(results, {"127.0.0.1": True, "127.0.0.2": False})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
+import time
 import unittest
+from unittest.mock import patch
 from tools.system_detector import SystemDetector
 
 class TestSystemDetector(unittest.TestCase):
@@ -13,5 +15,25 @@ class TestSystemDetector(unittest.TestCase):
             self.assertIsInstance(info[key], str)
             self.assertTrue(len(info[key]) >= 0)
 
+    def test_detect_all_sections(self):
+        detected = self.sd.detect_all()
+        self.assertEqual(sorted(detected), ["security", "system", "thermal", "virtualization"])
+        self.assertGreater(detected["system"].memory_total, 0)
+
+    def test_slow_probe_falls_back_to_defaults(self):
+        self.sd.runner.probes["sensors_output"].timeout = 0.1
+        with patch.object(self.sd.runner.probes["sensors_output"], "func", lambda: time.sleep(1) or "Core 0 temp"):
+            started = time.monotonic()
+            detected = self.sd.detect_all()
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertFalse(detected["thermal"]["sensors_available"])
+        self.assertIsNotNone(detected["system"])
+
+    def test_failed_system_probe_falls_back_to_default_info(self):
+        with patch.object(self.sd.runner.probes["system_info"], "func", side_effect=RuntimeError("boom")):
+            detected = self.sd.detect_all()
+        self.assertEqual(detected["system"].os_name, self.sd.runner.probes["os_distribution"].default)
+        self.assertEqual(detected["system"].memory_total, 0)
+
 if __name__ == '__main__':
     unittest.main()
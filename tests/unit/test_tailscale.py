@@ -0,0 +1,126 @@
+import os
+import json
+import socket
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tools.hostname_resolver import HostnameResolver
+from tools.network_scanner import NetworkScanner
+from tools.tailscale import TailscaleSource
+
+
+def status(peers):
+    return {
+        "Version": "1.76.1",
+        "BackendState": "Running",
+        "Self": {"HostName": "minipc", "DNSName": "minipc.tail1234.ts.net.", "OS": "linux",
+                 "TailscaleIPs": ["100.96.53.47", "fd7a:115c:a1e0::1"], "Online": True},
+        "Peer": {f"nodekey:{i}": peer for i, peer in enumerate(peers)},
+        "MagicDNSSuffix": "tail1234.ts.net",
+    }
+
+
+PEERS = [
+    {"HostName": "LLMS", "DNSName": "llms.tail1234.ts.net.", "OS": "linux",
+     "TailscaleIPs": ["fd7a:115c:a1e0::2", "100.126.243.56"], "Online": True, "Tags": ["tag:server"]},
+    {"HostName": "HAS", "DNSName": "has.tail1234.ts.net.", "OS": "linux",
+     "TailscaleIPs": ["100.79.142.112"], "Online": True},
+    {"HostName": "Aspire-PC", "DNSName": "", "OS": "linux",
+     "TailscaleIPs": ["100.100.76.117"], "Online": False},
+]
+
+
+class TestTailscaleSource(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.status_file = os.path.join(self.temp_dir, "status.json")
+        self.write_status(PEERS)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_status(self, peers):
+        with open(self.status_file, 'w') as f:
+            json.dump(status(peers), f)
+
+    def test_online_peers_from_status_file(self):
+        peers = TailscaleSource(status_file=self.status_file).peers()
+        self.assertEqual([p.hostname for p in peers], ["LLMS", "HAS"])
+        llms = peers[0]
+        self.assertEqual(llms.address, "100.126.243.56")  # IPv4 first
+        self.assertEqual(llms.name, "llms.tail1234.ts.net")
+        self.assertEqual(llms.tags, ["tag:server"])
+
+    def test_offline_and_self_on_request(self):
+        peers = TailscaleSource(status_file=self.status_file).peers(include_offline=True, include_self=True)
+        self.assertEqual([p.hostname for p in peers], ["minipc", "LLMS", "HAS", "Aspire-PC"])
+        self.assertTrue(peers[0].is_self)
+        self.assertEqual(peers[3].name, "Aspire-PC")
+
+    def test_names_cover_every_address(self):
+        names = TailscaleSource(status_file=self.status_file).names()
+        self.assertEqual(names["fd7a:115c:a1e0::2"], "llms.tail1234.ts.net")
+        self.assertEqual(names["100.100.76.117"], "Aspire-PC")
+
+    def test_unreadable_status_gives_no_peers(self):
+        self.assertEqual(TailscaleSource(status_file=os.path.join(self.temp_dir, "missing")).peers(), [])
+        with open(self.status_file, 'w') as f:
+            f.write("{not json")
+        self.assertEqual(TailscaleSource(status_file=self.status_file).peers(), [])
+
+    def test_client_runs_with_gomaxprocs(self):
+        completed = type("Completed", (), {"returncode": 0, "stdout": json.dumps(status(PEERS)), "stderr": ""})
+        with patch('tools.tailscale.shutil.which', return_value="/usr/bin/tailscale"), \
+                patch.dict(os.environ, {}, clear=False), \
+                patch('tools.tailscale.subprocess.run', return_value=completed) as run:
+            os.environ.pop("GOMAXPROCS", None)
+            peers = TailscaleSource().peers()
+        self.assertEqual(len(peers), 2)
+        self.assertEqual(run.call_args[0][0], ["/usr/bin/tailscale", "status", "--json"])
+        self.assertEqual(run.call_args[1]["env"]["GOMAXPROCS"], "1")
+
+    def test_missing_client_gives_no_peers(self):
+        with patch('tools.tailscale.shutil.which', return_value=None):
+            self.assertEqual(TailscaleSource().peers(), [])
+
+
+class TestTailscaleDiscovery(unittest.TestCase):
+    """Peers on loopback addresses stand in for the tailnet."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.status_file = os.path.join(self.temp_dir, "status.json")
+        with open(self.status_file, 'w') as f:
+            json.dump(status([
+                {"HostName": "LLMS", "DNSName": "llms.tail1234.ts.net.", "TailscaleIPs": ["127.0.0.1"], "Online": True},
+                {"HostName": "HAS", "DNSName": "has.tail1234.ts.net.", "TailscaleIPs": ["127.0.0.2"], "Online": True},
+            ]), f)
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        self.port = self.listener.getsockname()[1]
+
+    def tearDown(self):
+        import shutil
+        self.listener.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_topology_probes_only_peers(self):
+        scanner = NetworkScanner(ports=[self.port], resolver=HostnameResolver(local_names=False),
+                                 tailscale=TailscaleSource(status_file=self.status_file))
+        with patch.object(scanner, 'iter_scan_subnet') as sweep:
+            topology = scanner.discover_network_topology()
+        sweep.assert_not_called()
+
+        servers = {s.ip_address: s for s in topology.servers}
+        self.assertEqual(sorted(servers), ["127.0.0.1", "127.0.0.2"])
+        self.assertEqual(servers["127.0.0.1"].open_ports, [self.port])
+        self.assertEqual(servers["127.0.0.1"].hostname, "llms.tail1234.ts.net")
+        self.assertEqual(servers["127.0.0.2"].interface, TailscaleSource.INTERFACE)
+        self.assertEqual(topology.subnet, NetworkScanner.TAILSCALE_SUBNET)
+
+
+if __name__ == '__main__':
+    unittest.main()
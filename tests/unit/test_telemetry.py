@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tools.system_detector import SystemDetector
+from tools.telemetry import RingBuffer, TelemetrySampler, summarize
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_keeps_newest_samples_in_order(self):
+        ring = RingBuffer(3)
+        for i in range(5):
+            ring.append(float(i), i * 10.0)
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.samples(), ([2.0, 3.0, 4.0], [20.0, 30.0, 40.0]))
+        self.assertEqual(ring.samples(since=3.5), ([4.0], [40.0]))
+
+    def test_summarize(self):
+        times = [float(t) for t in range(20)]
+        values = [50.0] * 19 + [99.0]  # One spike
+        summary = summarize(times, values)
+        self.assertAlmostEqual(summary.mean, 52.45)
+        self.assertEqual(summary.p95, 50.0)
+        self.assertEqual(summary.maximum, 99.0)
+        self.assertGreater(summary.trend, 0)
+        self.assertAlmostEqual(summarize([0.0, 1.0, 2.0], [3.0, 2.0, 1.0]).trend, -1.0)
+        self.assertIsNone(summarize([], []))
+
+
+class TestTelemetrySampler(unittest.TestCase):
+    """Readings from a fake /proc and /sys tree."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.proc = os.path.join(self.root, "proc")
+        self.sys = os.path.join(self.root, "sys")
+        zone = os.path.join(self.sys, "class", "thermal", "thermal_zone0")
+        os.makedirs(self.proc)
+        os.makedirs(zone)
+        self.write(os.path.join(zone, "temp"), "61500\n")
+        self.write_proc(cpu=(100, 0, 100, 700, 100), available=6000, load=1.0, io_ticks=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    @staticmethod
+    def write(path: str, content: str):
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def write_proc(self, cpu, available, load, io_ticks):
+        user, nice, system, idle, iowait = cpu
+        jiffies = f"{user} {nice} {system} {idle} {iowait} 0 0 0 0 0"
+        self.write(os.path.join(self.proc, "stat"), f"cpu  {jiffies}\ncpu0 {jiffies}\n")
+        self.write(os.path.join(self.proc, "meminfo"),
+                   f"MemTotal:       8000 kB\nMemFree:        1000 kB\nMemAvailable:   {available} kB\n"
+                   "SwapTotal:      1000 kB\nSwapFree:        750 kB\n")
+        self.write(os.path.join(self.proc, "loadavg"), f"{load:.2f} 0.50 0.25 1/100 4242\n")
+        self.write(os.path.join(self.proc, "diskstats"),
+                   f"   8       0 sda 1 0 0 0 1 0 0 0 0 {io_ticks} {io_ticks} 0 0 0 0\n"
+                   "   7       0 loop0 1 0 0 0 0 0 0 0 0 999999 999999 0 0 0 0\n")
+
+    def sampler(self) -> TelemetrySampler:
+        sampler = TelemetrySampler(proc_root=self.proc, sys_root=self.sys)
+        sampler.cpu_count = 2
+        self.addCleanup(sampler.stop)
+        return sampler
+
+    def test_first_sample_has_levels_only(self):
+        readings = self.sampler().sample()
+        self.assertAlmostEqual(readings["memory_used_percent"], 25.0)
+        self.assertAlmostEqual(readings["swap_used_percent"], 25.0)
+        self.assertAlmostEqual(readings["load_per_core"], 0.5)
+        self.assertAlmostEqual(readings["temperature_c"], 61.5)
+        self.assertNotIn("cpu_percent", readings)
+
+    def test_rates_from_consecutive_samples(self):
+        sampler = self.sampler()
+        with patch('tools.telemetry.time.monotonic', return_value=100.0):
+            sampler.sample()
+        # 1000 more jiffies: 600 busy, 300 idle, 100 iowait; 500 ms of I/O in one second
+        self.write_proc(cpu=(500, 0, 300, 1000, 200), available=2000, load=3.0, io_ticks=500)
+        with patch('tools.telemetry.time.monotonic', return_value=101.0):
+            readings = sampler.sample()
+        self.assertAlmostEqual(readings["cpu_percent"], 60.0)
+        self.assertAlmostEqual(readings["iowait_percent"], 10.0)
+        self.assertAlmostEqual(readings["disk_busy_percent"], 50.0)
+        self.assertEqual(sampler.summary("memory_used_percent").count, 2)
+        self.assertAlmostEqual(sampler.summary("memory_used_percent").mean, 50.0)
+
+    def test_missing_files_are_skipped(self):
+        os.remove(os.path.join(self.proc, "diskstats"))
+        readings = self.sampler().sample()
+        self.assertIn("load_per_core", readings)
+        self.assertNotIn("disk_busy_percent", readings)
+
+    def detector_after(self, memory_available) -> SystemDetector:
+        sampler = self.sampler()
+        for available in memory_available:
+            self.write_proc(cpu=(100, 0, 100, 700, 100), available=available, load=1.0, io_ticks=0)
+            sampler.sample()
+        return SystemDetector(telemetry=sampler)
+
+    def test_health_check_ignores_momentary_spikes(self):
+        detector = self.detector_after([6000, 6000, 6000, 400])
+        with patch('tools.system_detector.psutil.virtual_memory') as memory:
+            memory.return_value.percent = 95.0  # The instantaneous reading alone would fail
+            self.assertTrue(detector.health_check())
+
+    def test_health_check_fails_on_sustained_pressure(self):
+        detector = self.detector_after([400] * 5)
+        with self.assertLogs("tools.system_detector", level="WARNING") as logs:
+            self.assertFalse(detector.health_check())
+        self.assertIn("60s average", logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
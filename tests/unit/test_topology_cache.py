@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import time
+import threading
+import unittest
+from unittest.mock import patch
+
+from tools.network_scanner import NetworkScanner, ServerInfo
+from tools.topology_cache import TopologyCache
+
+
+def make_server(ip, ports=(22,)):
+    return ServerInfo(ip_address=ip, hostname=None, open_ports=list(ports), ssh_port=22,
+                      services={"22": "ssh"}, ping_time=0.5, server_type=None)
+
+
+class TestTopologyCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = TopologyCache(path=os.path.join(self.temp_dir, "topology.json"), max_age=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_key_depends_on_port_profile(self):
+        self.assertEqual(TopologyCache.make_key("10.0.0.0/24", [80, 22, 22]), "10.0.0.0/24|22,80")
+        self.assertNotEqual(TopologyCache.make_key("10.0.0.0/24", [22]),
+                            TopologyCache.make_key("10.0.0.0/24", [22, 80]))
+
+    def test_roundtrip_and_invalidate(self):
+        key = self.cache.make_key("10.0.0.0/24", [22])
+        self.cache.store_subnet(key, [make_server("10.0.0.5")], {"10.0.0.5": "aa:bb:cc:dd:ee:ff"})
+
+        cached = self.cache.load_subnet(key)
+        self.assertEqual(cached.hosts["10.0.0.5"].server, make_server("10.0.0.5"))
+        self.assertEqual(cached.hosts["10.0.0.5"].mac, "aa:bb:cc:dd:ee:ff")
+
+        self.cache.invalidate("10.0.0.0/24")
+        self.assertIsNone(self.cache.load_subnet(key))
+
+    def test_concurrent_writers_keep_each_others_subnets(self):
+        # Separate instances share only the file, like scanners in separate processes
+        caches = [TopologyCache(path=self.cache.path, max_age=60) for _ in range(8)]
+        keys = [TopologyCache.make_key(f"10.0.{n}.0/24", [22]) for n in range(8)]
+        original_write = TopologyCache._write
+
+        def slow_write(cache, data):
+            time.sleep(0.01)  # Widen the read-merge-write window
+            original_write(cache, data)
+
+        with patch.object(TopologyCache, '_write', slow_write):
+            threads = [threading.Thread(target=caches[n].store_subnet, args=(keys[n], [make_server(f"10.0.{n}.5")]))
+                       for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertTrue(all(self.cache.load_subnet(key) for key in keys))
+
+    def test_scanner_reprobes_only_stale_hosts(self):
+        scanner = NetworkScanner(ports=[22], cache=self.cache)
+        scanner.ARP_TABLE_PATH = os.path.join(self.temp_dir, "missing-arp")
+        key = self.cache.make_key("10.0.0.0/24", [22])
+        self.cache.store_subnet(key, [make_server("10.0.0.5"), make_server("10.0.0.6")])
+
+        # Age one host beyond max_age
+        with patch('tools.topology_cache.time.time', return_value=time.time() - 120):
+            self.cache.update_hosts(key, [make_server("10.0.0.6")])
+
+        with patch.object(scanner, 'iter_scan_hosts', return_value=iter([make_server("10.0.0.6", (22, 80))])) as scan:
+            servers = scanner.scan_subnet("10.0.0.0/24")
+
+        scan.assert_called_once_with(["10.0.0.6"], 1.0, None)
+        self.assertEqual(sorted(s.ip_address for s in servers), ["10.0.0.5", "10.0.0.6"])
+        self.assertEqual(self.cache.load_subnet(key).hosts["10.0.0.6"].server.open_ports, [22, 80])
+
+    def test_scanner_full_sweep_when_cache_empty(self):
+        scanner = NetworkScanner(ports=[22], cache=self.cache)
+        scanner.ARP_TABLE_PATH = os.path.join(self.temp_dir, "missing-arp")
+        with patch.object(scanner, 'iter_scan_hosts', return_value=iter([make_server("10.0.0.5")])) as scan:
+            scanner.scan_subnet("10.0.0.0/30")
+            scanner.scan_subnet("10.0.0.0/30")
+
+        # Second call is served from the cache
+        scan.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
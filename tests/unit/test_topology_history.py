@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tools.network_scanner import NetworkScanner, ServerInfo
+from tools.topology_history import HostChange, TopologyHistory
+
+
+def server(ip: str, ports, services=None, ping_time: float = 1.0) -> ServerInfo:
+    return ServerInfo(ip, None, list(ports), 22 if 22 in ports else None, services or {}, ping_time, None)
+
+
+class TestTopologyHistory(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "history.sqlite3")
+        self.history = TopologyHistory(self.path)
+
+    def tearDown(self):
+        import shutil
+        self.history.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def record_count(self, snapshot_id: int) -> int:
+        with sqlite3.connect(self.path) as db:
+            return db.execute("SELECT COUNT(*) FROM host_records WHERE snapshot_id = ?", (snapshot_id,)).fetchone()[0]
+
+    def test_snapshots_are_delta_encoded(self):
+        servers = [server(f"192.168.0.{i}", [22]) for i in range(1, 51)]
+        first = self.history.record(servers, taken_at=100)
+        # Only RTT differs: nothing to store
+        second = self.history.record([server(s.ip_address, [22], ping_time=9.0) for s in servers], taken_at=200)
+        servers[0] = server("192.168.0.1", [22, 80])
+        third = self.history.record(servers[:-1], taken_at=300)
+
+        self.assertEqual(self.record_count(first), 50)
+        self.assertEqual(self.record_count(second), 0)
+        self.assertEqual(self.record_count(third), 2)  # One changed, one removed
+        self.assertEqual(len(self.history.load(third)), 49)
+        self.assertEqual(self.history.load(third)["192.168.0.1"]["open_ports"], [22, 80])
+        self.assertEqual([s.host_count for s in self.history.snapshots()], [50, 50, 49])
+
+    def test_diff_reports_added_removed_and_changed_hosts(self):
+        old = self.history.record([
+            server("192.168.0.41", [22, 11434], {"22": "ssh", "11434": "ollama"}),
+            server("192.168.0.58", [22]),
+        ], taken_at=100)
+        new = self.history.record([
+            server("192.168.0.41", [22, 8080], {"22": "ssh (OpenSSH 9.6)", "8080": "http-alt/llm-api"}),
+            server("192.168.0.77", [22]),
+        ], taken_at=200)
+
+        diff = self.history.diff(old, new)
+        self.assertEqual(list(diff.added), ["192.168.0.77"])
+        self.assertEqual(list(diff.removed), ["192.168.0.58"])
+        self.assertEqual(diff.changed["192.168.0.41"], HostChange(
+            ports_opened=[8080],
+            ports_closed=[11434],
+            services_changed={"11434": ("ollama", None), "22": ("ssh", "ssh (OpenSSH 9.6)"),
+                              "8080": (None, "http-alt/llm-api")},
+        ))
+        self.assertTrue(self.history.diff(new, new).is_empty())
+
+    def test_changes_since_and_keyframes(self):
+        with patch.object(TopologyHistory, 'KEYFRAME_INTERVAL', 3):
+            for hour in range(7):
+                self.history.record([server("192.168.0.41", [22] + ([8000 + hour] if hour else []))],
+                                    taken_at=hour * 3600)
+            diff = self.history.changes_since(4.5 * 3600)
+            self.assertEqual(diff.changed["192.168.0.41"].ports_opened, [8006])
+            self.assertEqual(diff.changed["192.168.0.41"].ports_closed, [8004])
+            # Across keyframes the result is the same as a direct comparison
+            direct = self.history.diff_hosts(self.history.load(1), self.history.load(7))
+            self.assertEqual(self.history.diff(1, 7).changed, direct.changed)
+            self.assertEqual(self.history.changes_since(-1).added.keys(), {"192.168.0.41"})
+
+    def test_missing_hostname_is_not_a_change(self):
+        named = server("192.168.0.41", [22])
+        named.hostname = "gpu-box.lan"
+        first = self.history.record([named], taken_at=100)
+        second = self.history.record([server("192.168.0.41", [22])], taken_at=200)
+
+        self.assertEqual(self.record_count(second), 0)
+        self.assertTrue(self.history.diff(first, second).is_empty())
+        self.assertEqual(self.history.load(second)["192.168.0.41"]["hostname"], "gpu-box.lan")
+        renamed = server("192.168.0.41", [22])
+        renamed.hostname = "llm-box.lan"
+        third = self.history.record([renamed], taken_at=300)
+        self.assertEqual(self.history.diff(second, third).changed["192.168.0.41"].fields_changed,
+                         {"hostname": ("gpu-box.lan", "llm-box.lan")})
+
+    def test_history_persists_and_scopes_are_independent(self):
+        self.history.record([server("192.168.0.41", [22])], scope="192.168.0.0/24", taken_at=1)
+        self.history.record([server("10.0.0.5", [22])], scope="10.0.0.0/24", taken_at=2)
+        self.history.close()
+
+        self.history = TopologyHistory(self.path)
+        latest = self.history.latest("192.168.0.0/24")
+        self.assertEqual(list(self.history.load(latest)), ["192.168.0.41"])
+        self.assertIsNone(self.history.latest("172.16.0.0/12"))
+
+    def test_scanner_records_discovered_topology(self):
+        scanner = NetworkScanner(history=self.history)
+        with patch.object(scanner, 'get_local_network_info', return_value={
+                "local_ip": "192.168.0.10", "subnet": "192.168.0.0/24", "gateway": "192.168.0.1",
+                "interface": "eth0"}), \
+                patch.object(scanner, 'iter_scan_subnet', return_value=iter([server("192.168.0.41", [22])])):
+            scanner.discover_network_topology()
+        snapshot = self.history.latest("192.168.0.0/24")
+        self.assertEqual(self.history.load(snapshot)["192.168.0.41"]["open_ports"], [22])
+        self.assertIsNone(self.history.latest())
+
+    def test_scopes_follow_scanned_subnets(self):
+        scanner = NetworkScanner(history=self.history)
+        topology = scanner._discover_interfaces({}, [], None)
+        self.assertEqual(scanner.history_scope(topology), "unknown")
+        topology.interfaces = {"wlan0": "10.0.0.0/24", "eth0": "192.168.0.0/24"}
+        self.assertEqual(scanner.history_scope(topology), "10.0.0.0/24,192.168.0.0/24")
+        with patch.object(scanner, 'get_local_network_info', return_value={"subnet": "192.168.0.0/24"}):
+            self.assertEqual(scanner.history_scope(), "192.168.0.0/24")
+        scanner.tailscale = object()
+        self.assertEqual(scanner.history_scope(topology), "tailscale")
+
+
+if __name__ == '__main__':
+    unittest.main()
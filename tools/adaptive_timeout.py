@@ -0,0 +1,103 @@
+"""
+Adaptive Timeout Module
+RTT-driven probe timeouts per host and per subnet
+"""
+
+import ipaddress
+import threading
+from typing import Dict, Iterable, Optional
+from dataclasses import dataclass
+
+
+@dataclass
+class RttEstimate:
+    """Smoothed RTT estimate (RFC 6298 style), values in ms."""
+    srtt: float
+    rttvar: float
+    samples: int = 1
+
+    def update(self, rtt: float) -> None:
+        self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+        self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.samples += 1
+
+    def bound(self) -> float:
+        """Upper bound of a plausible RTT in ms."""
+        return self.srtt + 4 * self.rttvar
+
+
+class AdaptiveTimeouts:
+    """Derive connect and liveness timeouts from measured RTT.
+
+    Port connects wait `multiplier` times the host's RTT bound, clamped between
+    `floor` and the caller's ceiling, so closed or filtered ports on a LAN resolve in
+    milliseconds while WAN/Tailscale hosts keep enough time. Liveness sweeps of a subnet
+    wait for the slowest live host seen there before.
+    """
+
+    DEFAULT_MULTIPLIER = 4.0
+    DEFAULT_FLOOR = 0.05            # s, never wait less than this for a connect
+    DEFAULT_LIVENESS_FLOOR = 0.25   # s, never wait less than this for echo replies
+    SUBNET_PREFIX = 24              # IPv4 hosts are grouped into /24s for subnet estimates
+    SUBNET_PREFIX_V6 = 64           # IPv6 hosts into their /64
+
+    def __init__(self, multiplier: float = DEFAULT_MULTIPLIER, floor: float = DEFAULT_FLOOR,
+                 liveness_floor: float = DEFAULT_LIVENESS_FLOOR):
+        self.multiplier = multiplier
+        self.floor = floor
+        self.liveness_floor = liveness_floor
+        self._hosts: Dict[str, RttEstimate] = {}
+        self._subnets: Dict[str, RttEstimate] = {}
+        self._subnet_max: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def subnet_of(self, ip: str) -> str:
+        """Subnet key used for per-subnet estimates."""
+        if ":" in ip:
+            # Link-local addresses carry their interface as zone (fe80::1%eth0)
+            address, _, zone = ip.partition("%")
+            subnet = str(ipaddress.IPv6Network(f"{address}/{self.SUBNET_PREFIX_V6}", strict=False))
+            return f"{subnet}%{zone}" if zone else subnet
+        return str(ipaddress.ip_network(f"{ip}/{self.SUBNET_PREFIX}", strict=False))
+
+    def observe(self, ip: str, rtt: float) -> None:
+        """Record an RTT sample (ms) for host and its subnet."""
+        subnet = self.subnet_of(ip)
+        with self._lock:
+            for table, key in ((self._hosts, ip), (self._subnets, subnet)):
+                if key in table:
+                    table[key].update(rtt)
+                else:
+                    table[key] = RttEstimate(srtt=rtt, rttvar=rtt / 2)
+            self._subnet_max[subnet] = max(self._subnet_max.get(subnet, 0.0), rtt)
+
+    def host_estimate(self, ip: str) -> Optional[RttEstimate]:
+        """RTT estimate of host, falling back to its subnet."""
+        with self._lock:
+            return self._hosts.get(ip) or self._subnets.get(self.subnet_of(ip))
+
+    def port_timeout(self, ip: str, ceiling: float) -> float:
+        """Connect timeout (s) for a port on host; ceiling when nothing was measured."""
+        estimate = self.host_estimate(ip)
+        if estimate is None:
+            return ceiling
+        return min(ceiling, max(self.floor, self.multiplier * estimate.bound() / 1000.0))
+
+    def liveness_timeout(self, hosts: Iterable[str], ceiling: float) -> float:
+        """Liveness wait (s) for a sweep; ceiling unless every subnet has history."""
+        worst = 0.0
+        with self._lock:
+            for subnet in {self.subnet_of(ip) for ip in hosts}:
+                if subnet not in self._subnet_max:
+                    return ceiling
+                bound = max(self._subnet_max[subnet], self._subnets[subnet].bound())
+                worst = max(worst, bound)
+        return min(ceiling, max(self.liveness_floor, self.multiplier * worst / 1000.0))
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Current RTT estimates (ms) per host and subnet, for tuning."""
+        with self._lock:
+            return {
+                key: {"srtt": round(e.srtt, 3), "rttvar": round(e.rttvar, 3), "samples": e.samples}
+                for key, e in list(self._subnets.items()) + list(self._hosts.items())
+            }
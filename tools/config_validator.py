@@ -10,6 +10,8 @@ import logging
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from tools.path_index import command_exists
+
 
 @dataclass
 class ValidationResult:
@@ -524,14 +526,7 @@ class ConfigValidator:
 
     def _command_exists(self, command: str) -> bool:
         """Check if command exists in system PATH."""
-        try:
-            subprocess.run(['which', command],
-                         check=True,
-                         capture_output=True,
-                         text=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return command_exists(command)
 
     def export_validation_report(self, filepath: str):
         """Export validation report to JSON file."""
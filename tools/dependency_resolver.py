@@ -9,6 +9,9 @@ from typing import List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from tools.detection_cache import DetectionCache
+from tools.path_index import PATH_INDEX, command_exists
+
 
 class PackageManager(Enum):
     """Supported package managers."""
@@ -190,8 +193,13 @@ class DependencyResolver:
         "git-lfs": Package(name="git-lfs", apt_name="git-lfs", description="Git extension for versioning large files")
     }
 
-    def __init__(self):
+    # System detection probes whose results an installation can change
+    STALE_AFTER_INSTALL = ("sensors_output", "package_managers")
+
+    def __init__(self, detection_cache: Optional[DetectionCache] = None):
         self.logger = logging.getLogger(__name__)
+        # tools.detection_cache.DetectionCache shared with the SystemDetector, refreshed after installs
+        self.detection_cache = detection_cache
         self.detected_managers = self._detect_package_managers()
 
     def _detect_package_managers(self) -> List[PackageManager]:
@@ -221,14 +229,7 @@ class DependencyResolver:
 
     def _command_exists(self, command: str) -> bool:
         """Check if command exists in system PATH."""
-        try:
-            subprocess.run(['which', command],
-                           check=True,
-                           capture_output=True,
-                           text=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return command_exists(command)
 
     def get_package_name(self, package: Package, manager: PackageManager) -> Optional[str]:
         """Get OS-specific package name for given package manager."""
@@ -425,6 +426,10 @@ class DependencyResolver:
             self.logger.info(f"Running: {' '.join(command)}")
             subprocess.run(command, check=True, capture_output=True, text=True)
             self.logger.info("Package installation completed successfully")
+            # New binaries may have landed in a PATH directory within the recheck interval
+            PATH_INDEX.invalidate()
+            if self.detection_cache is not None:
+                self.detection_cache.invalidate(self.STALE_AFTER_INSTALL)
             return True
 
         except subprocess.CalledProcessError as e:
@@ -0,0 +1,140 @@
+"""
+Detection Cache Module
+Snapshot cache of system detection results with per-probe time-to-live
+"""
+
+import os
+import copy
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from dataclasses import dataclass
+
+import psutil
+
+
+@dataclass
+class CachedValue:
+    """A probe value and when it was detected."""
+    value: Any
+    detected_at: float
+    ttl: float
+
+
+class DetectionCache:
+    """In-memory snapshot of probe values, optionally persisted across runs.
+
+    Each lookup says how old a value may be, so static facts (architecture, OS,
+    total memory) can be kept for the whole boot while volatile ones (available
+    memory) expire after seconds. With a path, values that live at least
+    PERSIST_MIN_TTL seconds are saved to disk under the current boot_id, so the
+    next process starts warm; a reboot discards them.
+    """
+
+    CACHE_VERSION = 1
+    # Time-to-live of facts that only change with a reboot
+    BOOT = float("inf")
+    # Values expiring sooner aren't worth writing to disk
+    PERSIST_MIN_TTL = 60.0
+
+    def __init__(self, path: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._values: Dict[str, CachedValue] = {}
+        self._dirty = False
+        self.boot_id = self.read_boot_id()
+        self._load()
+
+    @staticmethod
+    def default_path() -> Path:
+        """Cache file location (honours XDG_CACHE_HOME)."""
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return Path(cache_home) / "unification" / "detection.json"
+
+    @staticmethod
+    def read_boot_id() -> str:
+        """Identifier of the current boot (kernel boot_id, else the boot time)."""
+        try:
+            with open("/proc/sys/kernel/random/boot_id", 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return f"boot-{int(psutil.boot_time())}"
+
+    def get(self, name: str, max_age: float) -> Optional[CachedValue]:
+        """Cached value of probe name if younger than max_age seconds (a copy), else None."""
+        if max_age <= 0:
+            return None
+        with self._lock:
+            cached = self._values.get(name)
+        if cached is None or time.time() - cached.detected_at >= max_age:
+            return None
+        return CachedValue(copy.deepcopy(cached.value), cached.detected_at, cached.ttl)
+
+    def put(self, name: str, value: Any, ttl: float) -> None:
+        """Remember a freshly detected value of probe name."""
+        with self._lock:
+            self._values[name] = CachedValue(copy.deepcopy(value), time.time(), ttl)
+            self._dirty = self._dirty or ttl >= self.PERSIST_MIN_TTL
+
+    def invalidate(self, names: Optional[Iterable[str]] = None) -> None:
+        """Forget the given probes, or everything (also on disk)."""
+        with self._lock:
+            if names is None:
+                self._values.clear()
+            else:
+                for name in names:
+                    self._values.pop(name, None)
+            self._dirty = True
+        self.save()
+
+    def save(self) -> None:
+        """Write long-lived values to disk if anything changed."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": self.CACHE_VERSION,
+                "boot_id": self.boot_id,
+                "probes": {name: {"value": cached.value, "detected_at": cached.detected_at,
+                                  "ttl": None if cached.ttl == self.BOOT else cached.ttl}
+                           for name, cached in self._values.items() if cached.ttl >= self.PERSIST_MIN_TTL},
+            }
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write detection cache {self.path}: {e}")
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read detection cache {self.path}: {e}")
+            return
+        if not isinstance(data, dict) or data.get("version") != self.CACHE_VERSION:
+            self.logger.info("Ignoring detection cache with unknown version")
+            return
+        if data.get("boot_id") != self.boot_id:
+            self.logger.info("Ignoring detection cache from a previous boot")
+            return
+        for name, record in (data.get("probes") or {}).items():
+            try:
+                ttl = self.BOOT if record.get("ttl") is None else float(record["ttl"])
+                self._values[name] = CachedValue(record["value"], float(record["detected_at"]), ttl)
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                self.logger.debug(f"Dropping unreadable detection cache record {name}: {e}")
@@ -0,0 +1,222 @@
+"""
+Service Fingerprint Module
+Banner grabbing and protocol probes identifying the products behind open ports
+"""
+
+import re
+import ssl
+import json
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from tools.rate_limiter import ScanBudget
+
+
+@dataclass
+class ServiceFingerprint:
+    """Product identified behind an open port."""
+    port: int
+    service: str                   # Canonical service name, e.g. "ssh", "ollama", "http"
+    product: Optional[str] = None
+    version: Optional[str] = None
+    banner: Optional[str] = None   # Raw identification (SSH banner, HTTP Server header)
+    models: List[str] = field(default_factory=list)  # Models served by an LLM API
+
+    def describe(self) -> str:
+        """Service label used in ServerInfo.services."""
+        product = " ".join(part for part in (self.product, self.version) if part)
+        return f"{self.service} ({product})" if product else self.service
+
+
+def parse_ssh_banner(port: int, data: bytes) -> Optional[ServiceFingerprint]:
+    """Parse an SSH identification string, e.g. SSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13."""
+    line = data.split(b"\n", 1)[0].decode("latin-1").strip()
+    match = re.match(r"SSH-[\d.]+-(\S+)", line)
+    if not match:
+        return None
+    product, _, version = match.group(1).partition("_")
+    return ServiceFingerprint(port=port, service="ssh", product=product,
+                              version=version or None, banner=line)
+
+
+class ServiceFingerprinter:
+    """Concurrent banner grabbing over a bounded number of connections.
+
+    SSH ports are identified from the server's identification string, other ports get a
+    minimal HTTP HEAD (over TLS on HTTPS ports); HTTP ports that don't name their product
+    and known LLM ports are asked for Ollama's /api/version and /api/tags. A server that
+    speaks first (an SSH daemon on an unusual port) is recognized from its banner.
+    """
+
+    SSH_PORTS = (22, 2222)
+    TLS_PORTS = (443, 8443)
+    OLLAMA_PORTS = (11434,)
+
+    # Maximum bytes read per response
+    MAX_READ = 65536
+
+    # Keywords in HTTP headers mapped to ecosystem service names (first match wins)
+    PRODUCT_SERVICES = [
+        ("ollama", "ollama"),
+        ("grafana", "grafana"),
+        ("adguard", "adguard"),
+        ("portainer", "portainer"),
+        ("home assistant", "home_assistant"),
+        ("homeassistant", "home_assistant"),
+        ("prometheus", "prometheus"),
+        ("kbn-name", "kibana"),
+        ("kibana", "kibana"),
+        ("elasticsearch", "elasticsearch"),
+    ]
+
+    def __init__(self, budget: Optional[ScanBudget] = None, max_connections: int = 64):
+        self.logger = logging.getLogger(__name__)
+        self.max_connections = max_connections
+        self.budget = budget or ScanBudget(max_sockets=max_connections)
+        self._tls = ssl.create_default_context()
+        # Only the banner matters, self-signed certificates are the norm on a LAN
+        self._tls.check_hostname = False
+        self._tls.verify_mode = ssl.CERT_NONE
+
+    def fingerprint(self, ip: str, ports: Iterable[int], timeout: float = 1.0) -> Dict[int, ServiceFingerprint]:
+        """Fingerprint open ports of host from a private event loop (thread engine)."""
+        return asyncio.run(self.afingerprint(ip, ports, timeout))
+
+    async def afingerprint(self, ip: str, ports: Iterable[int], timeout: float = 1.0,
+                           limit: Optional[asyncio.Semaphore] = None) -> Dict[int, ServiceFingerprint]:
+        """Fingerprint open ports of host concurrently; ports that stay silent are left out.
+
+        limit (default max_connections) bounds connections of this call; the shared
+        budget bounds open sockets across all scans.
+        """
+        limit = limit or asyncio.Semaphore(self.max_connections)
+
+        async def probe(port: int) -> Optional[ServiceFingerprint]:
+            try:
+                return await self._probe_port(ip, port, timeout, limit)
+            except Exception as e:
+                self.logger.debug(f"Fingerprinting {ip}:{port} failed: {e}")
+                return None
+
+        results = await asyncio.gather(*(probe(port) for port in ports))
+        return {fp.port: fp for fp in results if fp}
+
+    async def _probe_port(self, ip: str, port: int, timeout: float,
+                          limit: asyncio.Semaphore) -> Optional[ServiceFingerprint]:
+        if port in self.SSH_PORTS:
+            banner = await self._exchange(ip, port, None, timeout, limit, until=b"\n")
+            return parse_ssh_banner(port, banner)
+
+        tls = port in self.TLS_PORTS
+        request = f"HEAD / HTTP/1.0\r\nHost: {self._host_header(ip)}\r\nUser-Agent: unification\r\n\r\n".encode()
+        response = await self._exchange(ip, port, request, timeout, limit, tls=tls)
+        if response.startswith(b"SSH-"):
+            return parse_ssh_banner(port, response)
+
+        fingerprint = self._parse_http_head(port, response, tls)
+        if port in self.OLLAMA_PORTS or (fingerprint and not fingerprint.product):
+            return await self._probe_ollama(ip, port, timeout, limit, tls) or fingerprint
+        return fingerprint
+
+    async def _probe_ollama(self, ip: str, port: int, timeout: float, limit: asyncio.Semaphore,
+                            tls: bool) -> Optional[ServiceFingerprint]:
+        """Identify an Ollama API from /api/version and /api/tags."""
+        version, tags = await asyncio.gather(
+            self._get_json(ip, port, "/api/version", timeout, limit, tls),
+            self._get_json(ip, port, "/api/tags", timeout, limit, tls),
+        )
+        if not isinstance(tags, dict) or not isinstance(tags.get("models"), list):
+            return None
+        models = [m["name"] for m in tags["models"] if isinstance(m, dict) and m.get("name")]
+        return ServiceFingerprint(
+            port=port,
+            service="ollama",
+            product="Ollama",
+            version=version.get("version") if isinstance(version, dict) else None,
+            models=models,
+        )
+
+    async def _get_json(self, ip: str, port: int, path: str, timeout: float,
+                        limit: asyncio.Semaphore, tls: bool) -> Any:
+        """GET path and decode a JSON body; None on any failure."""
+        request = f"GET {path} HTTP/1.0\r\nHost: {self._host_header(ip)}\r\nAccept: application/json\r\n\r\n".encode()
+        try:
+            response = await self._exchange(ip, port, request, timeout, limit, tls=tls, until=None)
+        except Exception:
+            return None
+        parsed = self._split_http(response)
+        if not parsed or parsed[0] != 200:
+            return None
+        try:
+            return json.loads(parsed[2].decode("utf-8", errors="replace"))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _host_header(ip: str) -> str:
+        """Host header value; IPv6 literals are bracketed and lose their zone."""
+        return f"[{ip.split('%')[0]}]" if ":" in ip else ip
+
+    async def _exchange(self, ip: str, port: int, request: Optional[bytes], timeout: float,
+                        limit: asyncio.Semaphore, tls: bool = False,
+                        until: Optional[bytes] = b"\r\n\r\n") -> bytes:
+        """Connect, send request and read until separator (None = until EOF)."""
+        async with limit, self.budget.aslot():
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port, ssl=self._tls if tls else None), timeout)
+            try:
+                if request:
+                    writer.write(request)
+                    await writer.drain()
+                return await asyncio.wait_for(self._read(reader, until), timeout)
+            finally:
+                writer.close()
+
+    async def _read(self, reader: asyncio.StreamReader, until: Optional[bytes]) -> bytes:
+        data = b""
+        while len(data) < self.MAX_READ:
+            chunk = await reader.read(4096)
+            if not chunk:
+                break
+            data += chunk
+            if until and until in data:
+                break
+        return data
+
+    @staticmethod
+    def _split_http(data: bytes) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Split HTTP response into (status, lowercased headers, body)."""
+        head, _, body = data.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        match = re.match(r"HTTP/\d(?:\.\d)?\s+(\d{3})", lines[0])
+        if not match:
+            return None
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return int(match.group(1)), headers, body
+
+    def _parse_http_head(self, port: int, data: bytes, tls: bool) -> Optional[ServiceFingerprint]:
+        """Identify product and service from HTTP response headers."""
+        parsed = self._split_http(data)
+        if not parsed:
+            return None
+        _status, headers, _body = parsed
+
+        fingerprint = ServiceFingerprint(port=port, service="https" if tls else "http",
+                                         banner=headers.get("server"))
+        if fingerprint.banner:
+            match = re.match(r"([A-Za-z][\w.-]*)(?:/([\w.-]+))?", fingerprint.banner)
+            if match:
+                fingerprint.product, fingerprint.version = match.group(1), match.group(2)
+
+        haystack = " ".join(f"{name}: {value}" for name, value in headers.items()).lower()
+        for keyword, service in self.PRODUCT_SERVICES:
+            if keyword in haystack:
+                fingerprint.service = service
+                break
+        return fingerprint
@@ -0,0 +1,254 @@
+"""
+Hostname Resolver Module
+Non-blocking, cached reverse DNS with names harvested from local configuration
+"""
+
+import os
+import json
+import time
+import queue
+import socket
+import logging
+import ipaddress
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+# Called with the hostname (None = no PTR record) once a background lookup finishes
+HostnameCallback = Callable[[Optional[str]], None]
+
+# Called with (ip, seconds taken, hostname) after every PTR lookup, e.g. for scan statistics
+LookupObserver = Callable[[str, float, Optional[str]], None]
+
+
+class _Answer(NamedTuple):
+    """Cached reverse lookup answer."""
+    hostname: Optional[str]
+    expires: float
+
+
+class HostnameResolver:
+    """Reverse DNS off the probe path.
+
+    PTR lookups run on a small pool of daemon worker threads fed from one queue, so a
+    scan only ever reads answers that are already known and never waits on DNS.
+    Positive and negative answers are cached with separate TTLs, optionally on disk
+    across runs. Names from /etc/hosts, SSH config `HostName` entries and add_names()
+    (e.g. mDNS) win over PTR records and need no lookup at all. With reverse_lookups
+    off, only those names (and cached answers) are used and no PTR query is ever sent.
+    """
+
+    CACHE_VERSION = 1
+    DEFAULT_TTL = 3600.0
+    DEFAULT_NEGATIVE_TTL = 300.0
+    DEFAULT_WORKERS = 16
+
+    HOSTS_PATH = "/etc/hosts"
+    SSH_CONFIG_PATHS = ["~/.ssh/config", "/etc/ssh/ssh_config"]
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL, max_workers: int = DEFAULT_WORKERS,
+                 local_names: bool = True, on_lookup: Optional[LookupObserver] = None,
+                 reverse_lookups: bool = True):
+        self.logger = logging.getLogger(__name__)
+        # None keeps answers in memory only
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_workers = max_workers
+        self.on_lookup = on_lookup
+        # False answers unknown addresses with None right away (offline use, tests, benchmarks)
+        self.reverse_lookups = reverse_lookups
+        self._answers: Dict[str, _Answer] = {}
+        self._local: Dict[str, str] = {}
+        self._pending: Dict[str, List[HostnameCallback]] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._cond = threading.Condition()
+        if local_names:
+            self._local.update(self.read_hosts_file())
+            for name_map in (self.read_ssh_config(p) for p in self.SSH_CONFIG_PATHS):
+                for ip, name in name_map.items():
+                    self._local.setdefault(ip, name)
+        self._load()
+
+    @staticmethod
+    def default_path() -> Path:
+        """Cache file location (honours XDG_CACHE_HOME)."""
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return Path(cache_home) / "unification" / "hostnames.json"
+
+    def lookup(self, ip: str, callback: Optional[HostnameCallback] = None) -> Optional[str]:
+        """Return a known hostname immediately; otherwise queue a PTR lookup and return None.
+
+        callback is only called when a lookup had to be queued, with its answer.
+        """
+        return self._lookup(ip, callback)[1]
+
+    def _lookup(self, ip: str, callback: Optional[HostnameCallback]) -> Tuple[bool, Optional[str]]:
+        """Return (answer known, hostname), queuing a lookup when unknown."""
+        with self._cond:
+            if ip in self._local:
+                return True, self._local[ip]
+            answer = self._answers.get(ip)
+            if answer and answer.expires > time.time():
+                return True, answer.hostname
+            if not self.reverse_lookups:
+                return True, None
+            callbacks = self._pending.get(ip)
+            if callbacks is None:
+                callbacks = self._pending[ip] = []
+                self._queue.put(ip)
+                self._start_workers()
+            if callback:
+                callbacks.append(callback)
+        return False, None
+
+    def submit(self, ips: Iterable[str]) -> None:
+        """Queue PTR lookups for a batch of addresses without waiting."""
+        for ip in ips:
+            self.lookup(ip)
+
+    def resolve(self, ip: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Return hostname of ip, waiting at most timeout seconds for a PTR lookup."""
+        done = threading.Event()
+        result: List[Optional[str]] = []
+
+        def on_resolved(hostname: Optional[str]) -> None:
+            result.append(hostname)
+            done.set()
+
+        known, hostname = self._lookup(ip, on_resolved)
+        if known:
+            return hostname
+        done.wait(timeout)
+        return result[0] if result else None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued lookups and their callbacks finish; return False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout)
+
+    def add_names(self, names: Dict[str, str]) -> None:
+        """Register locally discovered names (e.g. from mDNS) for addresses."""
+        with self._cond:
+            self._local.update(names)
+
+    def read_hosts_file(self, path: Optional[str] = None) -> Dict[str, str]:
+        """Map addresses in a hosts file to their first name."""
+        names: Dict[str, str] = {}
+        try:
+            with open(path or self.HOSTS_PATH, 'r') as f:
+                for line in f:
+                    fields = line.split('#', 1)[0].split()
+                    if len(fields) >= 2 and self._is_address(fields[0]):
+                        names.setdefault(fields[0], fields[1])
+        except OSError as e:
+            self.logger.debug(f"Could not read hosts file: {e}")
+        return names
+
+    def read_ssh_config(self, path: str) -> Dict[str, str]:
+        """Map `HostName <address>` entries of an SSH config to their Host alias."""
+        names: Dict[str, str] = {}
+        aliases: List[str] = []
+        try:
+            with open(os.path.expanduser(path), 'r') as f:
+                for line in f:
+                    fields = line.split('#', 1)[0].replace('=', ' ').split()
+                    if len(fields) < 2:
+                        continue
+                    keyword = fields[0].lower()
+                    if keyword in ("host", "match"):
+                        aliases = [a for a in fields[1:] if keyword == "host" and not any(c in a for c in "*?!")]
+                    elif keyword == "hostname" and aliases and self._is_address(fields[1]):
+                        names.setdefault(fields[1], aliases[0])
+        except OSError as e:
+            self.logger.debug(f"Could not read SSH config {path}: {e}")
+        return names
+
+    @staticmethod
+    def _is_address(value: str) -> bool:
+        try:
+            ipaddress.ip_address(value)
+            return True
+        except ValueError:
+            return False
+
+    def _start_workers(self) -> None:
+        """Start another worker while lookups queue up (caller holds the lock)."""
+        if len(self._workers) < min(self.max_workers, len(self._pending)):
+            worker = threading.Thread(target=self._work, name="hostname-resolver", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self) -> None:
+        while True:
+            ip = self._queue.get()
+            started = time.monotonic()
+            try:
+                hostname = socket.gethostbyaddr(ip)[0]
+            except Exception as e:
+                self.logger.debug(f"No PTR record for {ip}: {e}")
+                hostname = None
+            if self.on_lookup:
+                try:
+                    self.on_lookup(ip, time.monotonic() - started, hostname)
+                except Exception as e:
+                    self.logger.debug(f"Lookup observer failed: {e}")
+
+            ttl = self.ttl if hostname else self.negative_ttl
+            with self._cond:
+                self._answers[ip] = _Answer(hostname, time.time() + ttl)
+                last = list(self._pending) == [ip]
+            # Persist once a batch drains, before anyone waiting on it is woken
+            if last:
+                self._save()
+
+            # No callback is added once the answer is cached, so the list is complete
+            with self._cond:
+                callbacks = list(self._pending.get(ip, []))
+            for callback in callbacks:
+                try:
+                    callback(hostname)
+                except Exception as e:
+                    self.logger.debug(f"Hostname callback for {ip} failed: {e}")
+            # Waiters wake only after the callbacks have applied the answer
+            with self._cond:
+                self._pending.pop(ip, None)
+                if not self._pending:
+                    self._cond.notify_all()
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != self.CACHE_VERSION:
+                self.logger.info("Ignoring hostname cache with unknown version")
+                return
+            now = time.time()
+            for ip, entry in data.get("answers", {}).items():
+                if entry["expires"] > now:
+                    self._answers[ip] = _Answer(entry["hostname"], float(entry["expires"]))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self.logger.warning(f"Could not read hostname cache {self.path}: {e}")
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        now = time.time()
+        with self._cond:
+            answers = {ip: {"hostname": a.hostname, "expires": a.expires}
+                       for ip, a in self._answers.items() if a.expires > now}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": self.CACHE_VERSION, "answers": answers}, f)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Could not write hostname cache {self.path}: {e}")
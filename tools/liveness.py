@@ -0,0 +1,439 @@
+"""
+Liveness Probing Module
+In-process host liveness checks (ICMP/ICMPv6 echo with TCP connect fallback)
+"""
+
+import os
+import time
+import errno
+import socket
+import ipaddress
+import struct
+import logging
+import selectors
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from tools.rate_limiter import ScanBudget
+
+
+# Called with (ip, rtt_ms) as soon as a host is confirmed alive
+AliveCallback = Callable[[str, float], None]
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+# Link-local all-nodes multicast group
+ALL_NODES_GROUP = "ff02::1"
+
+# connect() results that prove a host is up: accepted, or actively refused (RST)
+_ALIVE_ERRNOS = (0, errno.ECONNREFUSED)
+_IN_PROGRESS_ERRNOS = (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY)
+
+
+def _checksum(data: bytes) -> int:
+    """Internet checksum (RFC 1071)."""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def _echo_request(ident: int, seq: int, payload: bytes = b'unification',
+                  icmp_type: int = ICMP_ECHO_REQUEST) -> bytes:
+    """Build ICMP echo request packet (the kernel fills in the ICMPv6 checksum itself)."""
+    header = struct.pack('!BBHHH', icmp_type, 0, 0, ident, seq)
+    checksum = _checksum(header + payload) if icmp_type == ICMP_ECHO_REQUEST else 0
+    return struct.pack('!BBHHH', icmp_type, 0, checksum, ident, seq) + payload
+
+
+def address_family(ip: str) -> int:
+    """Socket family of an address literal."""
+    return socket.AF_INET6 if ":" in ip else socket.AF_INET
+
+
+def sockaddr(ip: str, port: int = 0) -> Tuple[int, tuple]:
+    """Return (family, socket address) of an address literal.
+
+    IPv6 link-local addresses carry their interface as a zone (fe80::1%eth0), which is
+    turned into the scope id of the socket address.
+    """
+    if ":" not in ip:
+        return socket.AF_INET, (ip, port)
+    info = socket.getaddrinfo(ip, port, socket.AF_INET6, socket.SOCK_STREAM, 0, socket.AI_NUMERICHOST)
+    return socket.AF_INET6, info[0][4]
+
+
+def same_address(a: str, b: str) -> bool:
+    """Compare address literals, ignoring IPv6 formatting differences and zones."""
+    if a == b:
+        return True
+    if ":" not in a or ":" not in b:
+        return False
+    try:
+        return ipaddress.IPv6Address(a.split("%")[0]) == ipaddress.IPv6Address(b.split("%")[0])
+    except ValueError:
+        return False
+
+
+class LivenessProber:
+    """Multiplexed host liveness prober measuring RTT without forking `ping`.
+
+    ICMP echo is sent over an unprivileged datagram socket when the kernel allows it
+    (net.ipv4.ping_group_range) or over a raw socket when running as root. Hosts that
+    don't answer (all of them when no ICMP socket can be opened) get TCP connects on
+    well-known ports, where a refusal counts as alive.
+    IPv4 and IPv6 hosts are probed one family after the other, IPv6 with ICMPv6 echo.
+    With a ScanBudget every echo request and connect draws from the shared budget.
+    """
+
+    # Ports tried by the TCP fallback
+    TCP_FALLBACK_PORTS = [22, 80, 443, 2222]
+    # When some hosts answered echo, the others get connects lasting FALLBACK_RTT_FACTOR
+    # times the slowest echo RTT (at least FALLBACK_MIN_TIMEOUT seconds): a live host
+    # accepts or refuses in about one RTT, so the full timeout would only wait on dead ones
+    FALLBACK_RTT_FACTOR = 4.0
+    FALLBACK_MIN_TIMEOUT = 0.25
+
+    def __init__(self, tcp_ports: Optional[Iterable[int]] = None, max_sockets: int = 512,
+                 budget: Optional[ScanBudget] = None):
+        self.logger = logging.getLogger(__name__)
+        self.tcp_ports = list(tcp_ports) if tcp_ports is not None else list(self.TCP_FALLBACK_PORTS)
+        self.max_sockets = max_sockets
+        self.budget = budget
+        self._ident = os.getpid() & 0xffff
+
+    def probe(self, ip: str, timeout: float = 2.0) -> Optional[float]:
+        """Probe single host; return RTT in ms or None when host looks dead."""
+        return self.probe_many([ip], timeout).get(ip)
+
+    def probe_many(self, hosts: Iterable[str], timeout: float = 2.0,
+                   callback: Optional[AliveCallback] = None) -> Dict[str, Optional[float]]:
+        """Probe hosts concurrently from one loop; return RTT in ms (None = no answer) per host."""
+        hosts = list(dict.fromkeys(hosts))
+        results: Dict[str, Optional[float]] = {ip: None for ip in hosts}
+        if not hosts:
+            return results
+
+        for family in (socket.AF_INET, socket.AF_INET6):
+            group = [ip for ip in hosts if address_family(ip) == family]
+            if group:
+                self._probe_family(group, family, timeout, results, callback)
+        return results
+
+    def _probe_family(self, hosts: List[str], family: int, timeout: float,
+                      results: Dict[str, Optional[float]], callback: Optional[AliveCallback]) -> None:
+        """ICMP echo to hosts of one family, then TCP connects to the ones that stayed silent."""
+        icmp_sock, kind = self._open_icmp_socket(family)
+        if icmp_sock is not None and kind is not None:
+            try:
+                with icmp_sock:
+                    self._probe_icmp(icmp_sock, kind, hosts, timeout, results, callback, family)
+            except Exception as e:
+                self.logger.debug(f"ICMP liveness probing aborted: {e}")
+            # Hosts dropping echo requests (e.g. Windows' default firewall) may still answer TCP
+            timeout = self._fallback_timeout([rtt for rtt in (results[ip] for ip in hosts) if rtt is not None], timeout)
+            hosts = [ip for ip in hosts if results[ip] is None]
+        if not hosts or not self.tcp_ports:
+            return
+        try:
+            self._probe_tcp(hosts, timeout, results, callback)
+        except Exception as e:
+            self.logger.debug(f"TCP liveness probing aborted: {e}")
+
+    def probe_multicast(self, interface: str, timeout: float = 1.0,
+                        group: str = ALL_NODES_GROUP) -> Dict[str, float]:
+        """Echo the IPv6 all-nodes group on interface; return RTT in ms per answering address.
+
+        Answering hosts also land in the kernel's IPv6 neighbor table. Link-local
+        addresses are returned with their zone (fe80::1%eth0).
+        """
+        results: Dict[str, float] = {}
+        icmp_sock, kind = self._open_icmp_socket(socket.AF_INET6)
+        if icmp_sock is None or kind is None:
+            return results
+
+        with icmp_sock:
+            try:
+                if self.budget:
+                    self.budget.take_token()
+                sent_at = time.monotonic()
+                icmp_sock.sendto(_echo_request(self._ident, 0, icmp_type=ICMPV6_ECHO_REQUEST),
+                                 sockaddr(f"{group}%{interface}")[1])
+            except OSError as e:
+                self.logger.debug(f"ICMPv6 echo to {group}%{interface} failed: {e}")
+                return results
+
+            deadline = sent_at + timeout
+            while True:
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    break
+                icmp_sock.settimeout(wait)
+                try:
+                    data, addr = icmp_sock.recvfrom(2048)
+                except socket.timeout:
+                    break
+                reply = self._parse_echo_reply(data, kind, socket.AF_INET6)
+                if reply is None or (kind == "raw" and reply[0] != self._ident):
+                    continue
+                ip = addr[0]
+                if "%" not in ip and ipaddress.IPv6Address(ip).is_link_local:
+                    ip = f"{ip}%{interface}"
+                results.setdefault(ip, (time.monotonic() - sent_at) * 1000.0)
+        return results
+
+    def _open_icmp_socket(self, family: int = socket.AF_INET) -> Tuple[Optional[socket.socket], Optional[str]]:
+        """Open best available ICMP socket of family; return (socket, kind) or (None, None)."""
+        proto = socket.IPPROTO_ICMPV6 if family == socket.AF_INET6 else socket.IPPROTO_ICMP
+        for kind, sock_type in (("dgram", socket.SOCK_DGRAM), ("raw", socket.SOCK_RAW)):
+            try:
+                sock = socket.socket(family, sock_type, proto)
+                return sock, kind
+            except OSError as e:
+                self.logger.debug(f"ICMP {kind} socket not available: {e}")
+        return None, None
+
+    def _fallback_timeout(self, echo_rtts: List[float], timeout: float) -> float:
+        """Connect timeout for hosts silent to ICMP, scaled to the RTTs of the hosts that answered."""
+        if not echo_rtts:
+            return timeout
+        return min(timeout, max(self.FALLBACK_MIN_TIMEOUT, self.FALLBACK_RTT_FACTOR * max(echo_rtts) / 1000.0))
+
+    def _probe_icmp(self, sock: socket.socket, kind: str, hosts: List[str], timeout: float,
+                    results: Dict[str, Optional[float]], callback: Optional[AliveCallback],
+                    family: int = socket.AF_INET) -> None:
+        """Send echo requests to all hosts (of one family) and collect replies on one socket."""
+        request_type = ICMPV6_ECHO_REQUEST if family == socket.AF_INET6 else ICMP_ECHO_REQUEST
+        sweep = _EchoSweep(hosts, timeout, request_type)
+
+        while sweep.next_host < len(hosts) or sweep.waiting:
+            pause = self._send_echoes(sock, sweep)
+            now = time.monotonic()
+            sweep.expire(now)
+            if not sweep.waiting:
+                if pause:
+                    time.sleep(pause)
+                continue
+
+            wait = sweep.deadlines[0][0] - now
+            if pause:
+                wait = min(wait, pause)
+            sock.settimeout(max(wait, 0.0001))
+            try:
+                data, addr = sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            answer = self._match_reply(sweep, data, addr[0], kind, family)
+            if answer is not None:
+                _report_alive(results, callback, *answer)
+
+    def _send_echoes(self, sock: socket.socket, sweep: "_EchoSweep") -> float:
+        """Send as many echo requests as the rate budget allows; return the pause it asks for."""
+        pause = 0.0
+        while sweep.next_host < len(sweep.hosts):
+            pause = self.budget.try_take_token() if self.budget else 0.0
+            if pause:
+                break
+            ip = sweep.hosts[sweep.next_host]
+            seq = sweep.next_host & 0xffff
+            sweep.next_host += 1
+            try:
+                sock.sendto(_echo_request(self._ident, seq, icmp_type=sweep.request_type), sockaddr(ip)[1])
+            except OSError as e:
+                self.logger.debug(f"ICMP echo to {ip} failed: {e}")
+                continue
+            sweep.sent(ip, seq)
+        return pause
+
+    def _match_reply(self, sweep: "_EchoSweep", data: bytes, source: str, kind: str,
+                     family: int) -> Optional[Tuple[str, float]]:
+        """(ip, rtt_ms) of the host a packet answers, None when it isn't one of our replies."""
+        received = time.monotonic()
+        reply = self._parse_echo_reply(data, kind, family)
+        if reply is None:
+            return None
+        ident, seq = reply
+        ip = sweep.seq_to_ip.get(seq)
+        if ip not in sweep.waiting or not same_address(ip, source):
+            return None
+        if kind == "raw" and ident != self._ident:
+            return None  # Reply to someone else's ping
+        sweep.waiting.discard(ip)
+        return ip, (received - sweep.sent_at[ip]) * 1000.0
+
+    @staticmethod
+    def _parse_echo_reply(data: bytes, kind: str, family: int = socket.AF_INET) -> Optional[Tuple[int, int]]:
+        """Return (ident, seq) of an echo reply packet, None for anything else."""
+        if kind == "raw" and family == socket.AF_INET:
+            # Raw IPv4 sockets deliver the IP header too
+            data = data[(data[0] & 0x0f) * 4:] if data else data
+        if len(data) < 8:
+            return None
+        icmp_type, _code, _checksum, ident, seq = struct.unpack('!BBHHH', data[:8])
+        if icmp_type != (ICMPV6_ECHO_REPLY if family == socket.AF_INET6 else ICMP_ECHO_REPLY):
+            return None
+        return ident, seq
+
+    def _probe_tcp(self, hosts: List[str], timeout: float,
+                   results: Dict[str, Optional[float]], callback: Optional[AliveCallback]) -> None:
+        """TCP connect fallback: any accept or refusal marks the host alive."""
+        sweep = _ConnectSweep(self.budget, results, callback)
+        pending = deque((ip, port) for ip in hosts for port in self.tcp_ports)
+        try:
+            while pending or sweep.in_flight:
+                pause = self._start_connects(pending, sweep, timeout)
+                if not sweep.in_flight:
+                    if pause:
+                        time.sleep(pause)
+                    continue
+
+                wait = max(0.0, sweep.next_deadline() - time.monotonic())
+                if pause:
+                    wait = min(wait, pause)
+                sweep.collect(wait)
+                sweep.expire(time.monotonic())
+        finally:
+            sweep.close()
+
+    def _start_connects(self, pending: deque, sweep: "_ConnectSweep", timeout: float) -> float:
+        """Start connects while the socket and rate budget allow; return the pause the budget asks for."""
+        pause = 0.0
+        while pending:
+            ip, port = pending[0]
+            if sweep.results[ip] is not None:
+                pending.popleft()
+                continue
+            if self.budget:
+                pause = self.budget.try_acquire()
+            elif len(sweep.in_flight) >= self.max_sockets:
+                break
+            if pause:
+                break
+            pending.popleft()
+            sweep.started.setdefault(ip, time.monotonic())
+            sock, alive = self._start_connect(ip, port)
+            if sock is not None:
+                sweep.add(sock, ip, sweep.started[ip] + timeout)
+            elif self.budget:
+                self.budget.release()
+            if alive:
+                sweep.mark_alive(ip)
+        return pause
+
+    def _start_connect(self, ip: str, port: int) -> Tuple[Optional[socket.socket], bool]:
+        """Start a non-blocking connect; return (socket still connecting or None, host proven alive)."""
+        try:
+            family, address = sockaddr(ip, port)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError as e:
+            self.logger.debug(f"Could not open socket for {ip}:{port}: {e}")
+            return None, False
+
+        try:
+            sock.setblocking(False)
+            err = sock.connect_ex(address)
+        except Exception as e:
+            self.logger.debug(f"TCP probe to {ip}:{port} failed: {e}")
+            sock.close()
+            return None, False
+
+        if err in _IN_PROGRESS_ERRNOS:
+            return sock, False
+        sock.close()
+        return None, err in _ALIVE_ERRNOS
+
+
+def _report_alive(results: Dict[str, Optional[float]], callback: Optional[AliveCallback], ip: str, rtt: float) -> None:
+    results[ip] = rtt
+    if callback:
+        callback(ip, rtt)
+
+
+class _EchoSweep:
+    """Echo requests of one ICMP sweep still awaiting replies."""
+
+    def __init__(self, hosts: List[str], timeout: float, request_type: int):
+        self.hosts = hosts
+        self.timeout = timeout
+        self.request_type = request_type
+        self.next_host = 0
+        self.sent_at: Dict[str, float] = {}
+        self.seq_to_ip: Dict[int, str] = {}
+        self.deadlines: deque = deque()  # (deadline, ip) in send order
+        self.waiting: Set[str] = set()
+
+    def sent(self, ip: str, seq: int) -> None:
+        self.sent_at[ip] = time.monotonic()
+        self.seq_to_ip[seq] = ip
+        self.deadlines.append((self.sent_at[ip] + self.timeout, ip))
+        self.waiting.add(ip)
+
+    def expire(self, now: float) -> None:
+        """Give up on hosts whose time ran out."""
+        while self.deadlines and self.deadlines[0][0] <= now:
+            self.waiting.discard(self.deadlines.popleft()[1])
+
+
+class _ConnectSweep:
+    """Non-blocking connects of one TCP fallback sweep, multiplexed on a selector."""
+
+    def __init__(self, budget: Optional[ScanBudget], results: Dict[str, Optional[float]],
+                 callback: Optional[AliveCallback]):
+        self.budget = budget
+        self.results = results
+        self.callback = callback
+        self.selector = selectors.DefaultSelector()
+        self.in_flight: Dict[socket.socket, tuple] = {}  # sock -> (ip, deadline)
+        self.started: Dict[str, float] = {}
+
+    def add(self, sock: socket.socket, ip: str, deadline: float) -> None:
+        self.selector.register(sock, selectors.EVENT_WRITE)
+        self.in_flight[sock] = (ip, deadline)
+
+    def finish(self, sock: socket.socket) -> None:
+        self.in_flight.pop(sock, None)
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
+        if self.budget:
+            self.budget.release()
+
+    def mark_alive(self, ip: str) -> None:
+        """Record ip as alive and drop its other connects."""
+        if self.results[ip] is not None:
+            return
+        for other in [s for s, entry in self.in_flight.items() if entry[0] == ip]:
+            self.finish(other)
+        _report_alive(self.results, self.callback, ip, (time.monotonic() - self.started[ip]) * 1000.0)
+
+    def next_deadline(self) -> float:
+        return min(entry[1] for entry in self.in_flight.values())
+
+    def collect(self, wait: float) -> None:
+        """Wait up to wait seconds for connects to complete and record the hosts they prove alive."""
+        for key, _events in self.selector.select(wait):
+            sock = key.fileobj
+            if sock not in self.in_flight:
+                continue
+            ip = self.in_flight[sock][0]
+            err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            self.finish(sock)
+            if err in _ALIVE_ERRNOS:
+                self.mark_alive(ip)
+
+    def expire(self, now: float) -> None:
+        """Abandon connects that ran out of time."""
+        for sock in [s for s, entry in self.in_flight.items() if entry[1] <= now]:
+            self.finish(sock)
+
+    def close(self) -> None:
+        for sock in list(self.in_flight):
+            self.finish(sock)
+        self.selector.close()
@@ -0,0 +1,271 @@
+"""
+Network Monitor Module
+Long-running ecosystem monitor emitting change events
+"""
+
+import os
+import json
+import time
+import heapq
+import socket
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple, Union
+from dataclasses import asdict, dataclass, field
+
+from tools.adaptive_timeout import RttEstimate
+from tools.network_scanner import NetworkScanner, ServerInfo
+
+
+@dataclass
+class ChangeEvent:
+    """Change observed on the network."""
+    kind: str                      # One of NetworkMonitor.EVENT_KINDS
+    ip_address: str
+    timestamp: float
+    details: Dict = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+
+# Receives every change event
+EventSink = Callable[[ChangeEvent], None]
+
+
+@dataclass
+class _HostState:
+    """What the monitor knows about one host."""
+    server: ServerInfo             # Last probe result that found the host up
+    interval: float
+    due: float = 0.0
+    rtt: Optional[RttEstimate] = None
+    misses: int = 0
+
+
+class JsonLinesSink:
+    """Write events as JSON lines to a file (appending) or stream."""
+
+    def __init__(self, target: Union[str, "os.PathLike[str]", TextIO]):
+        self._stream: TextIO
+        if isinstance(target, (str, os.PathLike)):
+            self._own, self._stream = True, open(target, 'a')
+        else:
+            self._own, self._stream = False, target
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ChangeEvent) -> None:
+        with self._lock:
+            self._stream.write(event.to_json() + "\n")
+            self._stream.flush()
+
+    def close(self) -> None:
+        if self._own:
+            self._stream.close()
+
+
+class UnixSocketSink:
+    """Broadcast events as JSON lines to every client of a local Unix socket."""
+
+    def __init__(self, path: str):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen(8)
+        self._clients: List[socket.socket] = []
+        self._lock = threading.Lock()
+        threading.Thread(target=self._accept, name="monitor-socket", daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._clients.append(client)
+
+    def __call__(self, event: ChangeEvent) -> None:
+        line = (event.to_json() + "\n").encode()
+        with self._lock:
+            for client in list(self._clients):
+                try:
+                    client.sendall(line)
+                except OSError:
+                    self._clients.remove(client)
+                    client.close()
+
+    def close(self) -> None:
+        self._server.close()
+        with self._lock:
+            for client in self._clients:
+                client.close()
+            self._clients.clear()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class NetworkMonitor:
+    """Keep a live view of the ecosystem and report what changes.
+
+    Known hosts are re-probed on their own schedule: a host that just changed is checked
+    again after `min_interval`, and every quiet check doubles its interval up to
+    `max_interval`, so stable servers cost almost nothing while flapping ones are
+    watched closely. Subnets are swept every `sweep_interval` to find new hosts. Between
+    probes the monitor sleeps, keeping steady-state CPU use negligible.
+    """
+
+    EVENT_KINDS = ("host_up", "host_down", "port_opened", "port_closed", "rtt_regression")
+
+    DEFAULT_MIN_INTERVAL = 30.0
+    DEFAULT_MAX_INTERVAL = 600.0
+    DEFAULT_SWEEP_INTERVAL = 900.0
+
+    # Consecutive missed probes before a host is reported down
+    DOWN_AFTER_MISSES = 2
+
+    # RTT regression: sample above factor x the usual bound and at least this many ms slower
+    RTT_REGRESSION_FACTOR = 2.0
+    RTT_REGRESSION_MIN_MS = 5.0
+
+    def __init__(self, scanner: Optional[NetworkScanner] = None, subnets: Optional[Iterable[str]] = None,
+                 sinks: Optional[Iterable[EventSink]] = None, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL, sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+                 timeout: float = 1.0):
+        self.logger = logging.getLogger(__name__)
+        self.scanner = scanner or NetworkScanner()
+        self.subnets = list(subnets) if subnets is not None else []
+        self.sinks = list(sinks) if sinks is not None else []
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.sweep_interval = sweep_interval
+        self.timeout = timeout
+        self.hosts: Dict[str, _HostState] = {}
+        self._schedule: List[Tuple[float, str]] = []  # heap of (due, ip)
+        self._next_sweep = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def servers(self) -> List[ServerInfo]:
+        """Current live view: servers that are up."""
+        with self._lock:
+            return [state.server for state in self.hosts.values() if not state.misses]
+
+    def run(self) -> None:
+        """Monitor until stop() is called."""
+        if not self.subnets:
+            subnet = self.scanner.get_local_network_info().get("subnet")
+            if subnet:
+                self.subnets = [subnet]
+        self.logger.info(f"Monitoring {', '.join(self.subnets) or 'no subnets'}")
+
+        while not self._stop.is_set():
+            self._stop.wait(self.poll())
+
+    def start(self) -> threading.Thread:
+        """Run the monitor in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="network-monitor", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the monitor and wait for its thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def poll(self, now: Optional[float] = None) -> float:
+        """Run due sweeps and re-probes; return seconds until the next one is due."""
+        started = time.monotonic() if now is None else now
+        if started >= self._next_sweep:
+            self._sweep(started)
+            self._next_sweep = started + self.sweep_interval
+
+        due: List[str] = []
+        while self._schedule and self._schedule[0][0] <= started:
+            when, ip = heapq.heappop(self._schedule)
+            # Entries superseded by a later reschedule are skipped
+            if ip in self.hosts and self.hosts[ip].due == when and ip not in due:
+                due.append(ip)
+        if due:
+            found = {s.ip_address: s for s in self.scanner.scan_hosts(due, self.timeout)}
+            for ip in due:
+                self._update(ip, found.get(ip), started)
+
+        next_due = min([self._next_sweep] + [entry[0] for entry in self._schedule[:1]])
+        return max(0.0, next_due - (time.monotonic() if now is None else now))
+
+    def _sweep(self, now: float) -> None:
+        """Sweep all subnets; new hosts come up, known ones are updated."""
+        seen = set()
+        for subnet in self.subnets:
+            for server in self.scanner.iter_scan_subnet(subnet, self.timeout, use_cache=False):
+                seen.add(server.ip_address)
+                self._update(server.ip_address, server, now)
+        # Known hosts missing from a sweep count as a missed probe
+        for ip in [ip for ip, state in self.hosts.items() if ip not in seen and not state.misses]:
+            self._update(ip, None, now)
+
+    def _update(self, ip: str, server: Optional[ServerInfo], now: float) -> None:
+        """Compare a probe result with the known state, emit events and reschedule."""
+        with self._lock:
+            state = self.hosts.get(ip)
+            events: List[Tuple[str, Dict[str, Any]]] = []
+            if state is None:
+                if server is None:
+                    return
+                state = self.hosts[ip] = _HostState(server=server, interval=self.min_interval)
+                events.append(("host_up", {"open_ports": server.open_ports, "server_type": server.server_type}))
+            elif server is None:
+                state.misses += 1
+                if state.misses == self.DOWN_AFTER_MISSES:
+                    events.append(("host_down", {"last_seen_ports": state.server.open_ports}))
+            else:
+                if state.misses >= self.DOWN_AFTER_MISSES:
+                    events.append(("host_up", {"open_ports": server.open_ports, "server_type": server.server_type}))
+                else:
+                    old_ports, new_ports = set(state.server.open_ports), set(server.open_ports)
+                    events.extend(("port_opened", {"port": p}) for p in sorted(new_ports - old_ports))
+                    events.extend(("port_closed", {"port": p}) for p in sorted(old_ports - new_ports))
+                regression = self._rtt_regression(state, server.ping_time)
+                if regression:
+                    events.append(("rtt_regression", regression))
+                state.server, state.misses = server, 0
+
+            # Volatile hosts are watched closely, quiet ones (and hosts known down) back off
+            changed = bool(events) or 0 < state.misses < self.DOWN_AFTER_MISSES
+            state.interval = self.min_interval if changed else min(self.max_interval, state.interval * 2)
+            state.due = now + state.interval
+            heapq.heappush(self._schedule, (state.due, ip))
+
+        for kind, details in events:
+            self._emit(ChangeEvent(kind=kind, ip_address=ip, timestamp=time.time(), details=details))
+
+    def _rtt_regression(self, state: _HostState, rtt: float) -> Optional[Dict]:
+        """Update RTT baseline; return event details when rtt regressed against it."""
+        if state.rtt is None:
+            state.rtt = RttEstimate(srtt=rtt, rttvar=rtt / 2)
+            return None
+        bound = state.rtt.bound()
+        regression = None
+        if state.rtt.samples >= 3 and rtt > bound * self.RTT_REGRESSION_FACTOR \
+                and rtt - state.rtt.srtt >= self.RTT_REGRESSION_MIN_MS:
+            regression = {"rtt_ms": round(rtt, 3), "baseline_ms": round(state.rtt.srtt, 3)}
+        state.rtt.update(rtt)
+        return regression
+
+    def _emit(self, event: ChangeEvent) -> None:
+        self.logger.info(f"{event.kind}: {event.ip_address} {event.details}")
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception as e:
+                self.logger.warning(f"Event sink failed: {e}")
+
@@ -3,15 +3,39 @@ Network Scanner Module
 Intelligent network discovery and ecosystem topology detection
 """
 
+import os
+import math
 import socket
+import struct
 import subprocess
 import ipaddress
+import asyncio
 import concurrent.futures
+import threading
+import queue
 import logging
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import (TYPE_CHECKING, AsyncIterator, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set,
+                    Tuple, Union)
+from dataclasses import asdict, dataclass, field, fields
+from fnmatch import fnmatch
 import json
 
+from tools.adaptive_timeout import AdaptiveTimeouts
+from tools.fingerprint import ServiceFingerprint, ServiceFingerprinter
+from tools.hostname_resolver import HostnameResolver
+from tools.server_classifier import ServerClassifier, TypeMatch
+from tools.ssh_probe import SshProber, SshProbeResult
+from tools.tailscale import TailscaleSource
+from tools.passive_discovery import DiscoveredHost, PassiveListener
+from tools.scan_stats import ScanStats, connect_outcome
+from tools.liveness import AliveCallback, LivenessProber, sockaddr
+from tools.rate_limiter import ScanBudget
+
+if TYPE_CHECKING:
+    # Both modules import this one
+    from tools.topology_cache import TopologyCache
+    from tools.topology_history import TopologyHistory
+
 
 @dataclass
 class ServerInfo:
@@ -23,6 +47,36 @@ class ServerInfo:
     services: Dict[str, str]
     ping_time: float
     server_type: Optional[str]
+    probe_timeout: Optional[float] = None  # Port connect timeout (s) chosen for this host
+    interface: Optional[str] = None  # Local interface the host was discovered through
+    fingerprints: Dict[str, Dict] = field(default_factory=dict)  # port -> identified product
+    type_confidence: Optional[float] = None  # Share of the server type's profile matched (0..1)
+    mac: Optional[str] = None  # Link-layer address from the neighbor tables (dual-stack scans)
+    addresses: List[str] = field(default_factory=list)  # Every known IPv4/IPv6 address of the machine
+    advertised: List[str] = field(default_factory=list)  # Services announced over mDNS/SSDP
+
+
+# Called with every server as soon as a scan has classified it; its hostname may still be
+# None while the reverse lookup runs (it is filled in once the answer arrives)
+ServerCallback = Callable[[ServerInfo], None]
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class _SweepDone(NamedTuple):
+    """End-of-stream marker passed through result queues."""
+    submitted: int
+
+
+def server_info_to_dict(server: ServerInfo) -> Dict:
+    """Convert ServerInfo into a JSON-serializable dict."""
+    return asdict(server)
+
+
+def server_info_from_dict(data: Dict) -> ServerInfo:
+    """Rebuild ServerInfo from a dict, ignoring unknown keys."""
+    known = {f.name for f in fields(ServerInfo)}
+    return ServerInfo(**{k: v for k, v in data.items() if k in known})
 
 
 @dataclass
@@ -34,6 +88,7 @@ class NetworkTopology:
     servers: List[ServerInfo]
     total_hosts: int
     ecosystem_servers: List[ServerInfo]
+    interfaces: Dict[str, str] = field(default_factory=dict)  # interface -> scanned subnet
 
 
 class NetworkScanner:
@@ -63,13 +118,132 @@ class NetworkScanner:
         }
     }
 
-    def __init__(self):
+    # Ports probed on every live host
+    COMMON_PORTS = [22, 80, 443, 8080, 8443, 3000, 8000, 8123, 9000, 11434, 2222]
+
+    # Port selection: common ports only; common ports, then role ports of candidate
+    # hosts; common and all role ports at once; explicit ports or roles
+    SCAN_PROFILES = ("quick", "ecosystem", "full", "custom")
+
+    # Ports checked (in order) when picking the SSH port of a host
+    SSH_PORTS = [22, 2222]
+
+    # SSH and web ports, open on hosts of any role; they never make a host a role candidate
+    GENERIC_PORTS = frozenset(SSH_PORTS + [80, 443])
+
+    # Available scan engines: per-host thread pools or a single asyncio event loop
+    ENGINES = ("thread", "asyncio")
+
+    # Liveness methods: in-process ICMP/TCP prober or forking the `ping` binary
+    LIVENESS_METHODS = ("native", "ping")
+
+    # Subnet sweep modes: every address, known neighbors now and the rest in a
+    # background pass, or known neighbors only
+    SWEEP_MODES = ("full", "background", "neighbors")
+
+    # Kernel IPv4 neighbor (ARP) table
+    ARP_TABLE_PATH = "/proc/net/arp"
+
+    # Kernel routing table, FIB dump (local addresses) and IPv6 addresses
+    ROUTE_TABLE_PATH = "/proc/net/route"
+    FIB_TRIE_PATH = "/proc/net/fib_trie"
+    IF_INET6_PATH = "/proc/net/if_inet6"
+
+    # Share of max_concurrency used by the low-priority background sweep
+    BACKGROUND_CONCURRENCY_RATIO = 0.125
+
+    # Seconds to wait for liveness replies when no RTT history is available
+    LIVENESS_TIMEOUT = 2.0
+
+    # Subnets with more hosts than this are only scanned via known neighbors
+    # during multi-interface discovery (e.g. a docker /16)
+    MAX_SWEEP_HOSTS = 4094
+
+    # Kernel IPv6 neighbor table (no /proc equivalent of the ARP table)
+    IPV6_NEIGHBOR_COMMAND = ["ip", "-6", "neigh", "show"]
+
+    # A dual-stack machine is probed over IPv6 only when it answers in less than this
+    # share of its IPv4 RTT, so jitter doesn't flip its address between scans
+    IPV6_RTT_ADVANTAGE = 0.8
+
+    # Address range of Tailscale peers (CGNAT space)
+    TAILSCALE_SUBNET = "100.64.0.0/10"
+
+    # Seconds resolve_hostname waits for a reverse lookup
+    RESOLVE_TIMEOUT = 2.0
+
+    # Seconds a finished topology waits for reverse lookups still in flight
+    HOSTNAME_WAIT = 2.0
+
+    def __init__(self, engine: str = "thread", max_concurrency: int = 256,
+                 ports: Optional[Iterable[int]] = None, liveness: str = "native",
+                 sweep: str = "full", cache: Optional["TopologyCache"] = None, adaptive_timeouts: bool = True,
+                 packets_per_second: Optional[float] = None, budget: Optional[ScanBudget] = None,
+                 fingerprint: bool = False, resolver: Optional[HostnameResolver] = None,
+                 classifier: Optional[ServerClassifier] = None, history: Optional["TopologyHistory"] = None,
+                 ipv6: bool = False,
+                 tailscale: Optional[TailscaleSource] = None, passive: Optional[PassiveListener] = None,
+                 profile: Optional[str] = None, roles: Optional[Iterable[str]] = None,
+                 stats: Optional[ScanStats] = None, trace: Optional[str] = None,
+                 all_interfaces: bool = False, interfaces: Optional[Iterable[str]] = None,
+                 exclude_interfaces: Optional[Iterable[str]] = None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown scan engine: {engine} (expected one of {', '.join(self.ENGINES)})")
+        if liveness not in self.LIVENESS_METHODS:
+            raise ValueError(f"Unknown liveness method: {liveness} "
+                             f"(expected one of {', '.join(self.LIVENESS_METHODS)})")
         self.logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.max_concurrency = max_concurrency
+        # Built-in ecosystem profiles plus the user's own (see ServerClassifier.default_config_path)
+        self.classifier = classifier or ServerClassifier.from_config(self.ECOSYSTEM_SERVERS)
+        # self.ports are probed on every host; role_ports only on hosts that look like that role
+        self.profile, self.ports, self.role_ports = self._plan_ports(profile, ports, roles)
+        self.liveness = liveness
+        # One budget (packet rate + open sockets) shared by every probe path
+        self.budget = budget or ScanBudget(packets_per_second, max_sockets=max_concurrency)
+        self.prober = LivenessProber(budget=self.budget)
+        if sweep not in self.SWEEP_MODES:
+            raise ValueError(f"Unknown sweep mode: {sweep} (expected one of {', '.join(self.SWEEP_MODES)})")
+        self.sweep = sweep
+        self._background_sweeps: List[threading.Thread] = []
+        self._background_results: List[ServerInfo] = []
+        self._background_lock = threading.Lock()
+        # Optional tools.topology_cache.TopologyCache
+        self.cache = cache
+        self.timeouts = AdaptiveTimeouts() if adaptive_timeouts else None
+        # Optional banner grabbing stage run on the open ports of every host
+        self.fingerprinter = ServiceFingerprinter(budget=self.budget) if fingerprint else None
+        # Per-stage timings and probe outcomes, optionally traced to a JSON-lines file
+        self.stats = stats or ScanStats(trace_path=trace)
+        # Reverse DNS runs off the probe path; scans only use answers already known
+        self.resolver = resolver or HostnameResolver(on_lookup=self.stats.observe_lookup)
+        if self.resolver.on_lookup is None:
+            self.resolver.on_lookup = self.stats.observe_lookup
+        # Optional tools.topology_history.TopologyHistory recording every discovered topology
+        self.history = history
+        self.ssh_prober = SshProber(budget=self.budget)
+        # Topology discovery also finds IPv6 neighbors and merges dual-stack machines
+        self.ipv6 = ipv6
+        # With a Tailscale source, discovery probes the known tailnet peers instead of sweeping
+        self.tailscale = tailscale
+        # Optional running PassiveListener whose hosts are merged into discovered topologies
+        self.passive = passive
+        # Default interface selection of discover_network_topology and scan_ecosystem
+        self.all_interfaces = all_interfaces
+        self.interfaces = list(interfaces) if interfaces else None
+        self.exclude_interfaces = list(exclude_interfaces) if exclude_interfaces else None
 
     def get_local_network_info(self) -> Dict[str, Optional[str]]:
         """Get local network configuration in a robust, multi-strategy way.
-        Returns keys: local_ip, subnet, gateway, interface. Values may be None when unknown.
+        Returns keys: local_ip, subnet, gateway, interface (plus local_ipv6 when read from
+        /proc). Values may be None when unknown.
         """
+        # Fast path: everything straight from /proc, no subprocess or DNS
+        return self._network_info_from_proc() or self._network_info_from_commands()
+
+    def _network_info_from_commands(self) -> Dict[str, Optional[str]]:
+        """Network configuration from `ip`, hostname resolution and netifaces, when /proc is not usable."""
         gateway: Optional[str] = None
         interface: Optional[str] = None
         local_ip: Optional[str] = None
@@ -168,25 +342,261 @@ class NetworkScanner:
             "interface": interface,
         }
 
+    def _network_info_from_proc(self) -> Optional[Dict[str, Optional[str]]]:
+        """Compute default gateway, interface, IP and CIDR from /proc (Linux).
+
+        Returns None when the kernel tables are unavailable or have no default route.
+        """
+        routes = self._read_proc_routes()
+        defaults = [r for r in routes if r["destination"] == "0.0.0.0" and r["netmask"] == "0.0.0.0"
+                    and r["flags"] & 0x3 == 0x3]  # RTF_UP | RTF_GATEWAY
+        if not defaults:
+            return None
+        default = min(defaults, key=lambda r: r["metric"])
+        interface = default["interface"]
+
+        local_addresses = self._read_fib_local_addresses()
+        for route in routes:
+            if route["interface"] != interface or route["flags"] & 0x2 or route["netmask"] == "0.0.0.0":
+                continue
+            network = ipaddress.IPv4Network(f"{route['destination']}/{route['netmask']}")
+            local_ip = next((ip for ip in local_addresses if ipaddress.IPv4Address(ip) in network), None)
+            if local_ip:
+                info = {
+                    "local_ip": local_ip,
+                    "subnet": str(network),
+                    "gateway": default["gateway"],
+                    "interface": interface,
+                }
+                ipv6 = self._read_proc_ipv6_addresses().get(interface)
+                if ipv6:
+                    info["local_ipv6"] = ipv6[0]
+                return info
+        return None
+
+    def _read_proc_routes(self) -> List[Dict]:
+        """Parse IPv4 routes from /proc/net/route."""
+        def decode(value: str) -> str:
+            return socket.inet_ntoa(struct.pack("<L", int(value, 16)))
+
+        routes = []
+        try:
+            with open(self.ROUTE_TABLE_PATH, 'r') as f:
+                next(f, None)  # Header line
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 8:
+                        continue
+                    routes.append({
+                        "interface": fields[0],
+                        "destination": decode(fields[1]),
+                        "gateway": decode(fields[2]),
+                        "flags": int(fields[3], 16),
+                        "metric": int(fields[6]),
+                        "netmask": decode(fields[7]),
+                    })
+        except (OSError, ValueError, struct.error) as e:
+            self.logger.debug(f"Could not read routing table: {e}")
+        return routes
+
+    def _read_fib_local_addresses(self) -> List[str]:
+        """Return non-loopback local IPv4 addresses from the FIB dump."""
+        addresses: List[str] = []
+        try:
+            with open(self.FIB_TRIE_PATH, 'r') as f:
+                leaf = None
+                for line in f:
+                    stripped = line.strip()
+                    if stripped.startswith("|--"):
+                        leaf = stripped[3:].strip()
+                    elif stripped.startswith("/32 host LOCAL") and leaf:
+                        if not leaf.startswith("127.") and leaf not in addresses:
+                            addresses.append(leaf)
+        except OSError as e:
+            self.logger.debug(f"Could not read FIB: {e}")
+        return addresses
+
+    def _read_proc_ipv6_addresses(self, global_only: bool = True) -> Dict[str, List[str]]:
+        """Return IPv6 addresses (global-scope by default) per interface from /proc/net/if_inet6."""
+        return {name: [str(address.ip) for address in addresses]
+                for name, addresses in self._read_proc_ipv6_interfaces(global_only).items()}
+
+    def _read_proc_ipv6_interfaces(self, global_only: bool = True) -> Dict[str, List[ipaddress.IPv6Interface]]:
+        """Return IPv6 addresses with their prefix length per interface from /proc/net/if_inet6."""
+        addresses: Dict[str, List[ipaddress.IPv6Interface]] = {}
+        try:
+            with open(self.IF_INET6_PATH, 'r') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 6 or (global_only and fields[3] != "00"):  # scope 00 = global
+                        continue
+                    ip = ipaddress.IPv6Address(bytes.fromhex(fields[0]))
+                    addresses.setdefault(fields[5], []).append(ipaddress.IPv6Interface((ip, int(fields[2], 16))))
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Could not read IPv6 addresses: {e}")
+        return addresses
+
+    def list_interfaces(self, include: Optional[Iterable[str]] = None,
+                        exclude: Optional[Iterable[str]] = None) -> List[Dict[str, str]]:
+        """Enumerate non-loopback IPv4 interfaces with their subnets.
+
+        include/exclude take interface names or glob patterns (e.g. "docker*", "veth*").
+        Returns dicts with keys: interface, local_ip, subnet.
+        """
+        include = list(include) if include else None
+        exclude = list(exclude) if exclude else []
+        interfaces = []
+        for name, ip, netmask in self._interface_addresses():
+            if ip.startswith('127.') or ip.startswith('169.254.'):
+                continue
+            if not self._interface_selected(name, include, exclude):
+                continue
+            try:
+                subnet = str(ipaddress.IPv4Network(f"{ip}/{netmask}", strict=False))
+            except ValueError as e:
+                self.logger.debug(f"Skipping {name} address {ip}/{netmask}: {e}")
+                continue
+            interfaces.append({"interface": name, "local_ip": ip, "subnet": subnet})
+
+        return interfaces
+
+    def _interface_addresses(self) -> List[Tuple[str, str, str]]:
+        """(interface, ip, netmask) of every IPv4 address, from psutil or else netifaces."""
+        try:
+            import psutil
+            return [(name, addr.address, addr.netmask) for name, addrs in psutil.net_if_addrs().items()
+                    for addr in addrs if addr.family == socket.AF_INET and addr.netmask]
+        except Exception as e:
+            self.logger.info("psutil not usable for interface discovery: %s", e)
+        try:
+            import netifaces
+            return [(name, addr['addr'], addr['netmask']) for name in netifaces.interfaces()
+                    for addr in netifaces.ifaddresses(name).get(netifaces.AF_INET, [])
+                    if addr.get('addr') and addr.get('netmask')]
+        except Exception as e:
+            self.logger.info("netifaces not usable for interface discovery: %s", e)
+        return []
+
+    @staticmethod
+    def _interface_selected(name: str, include: Optional[List[str]], exclude: List[str]) -> bool:
+        """Whether interface name passes the include and exclude patterns."""
+        if include is not None and not any(fnmatch(name, pattern) for pattern in include):
+            return False
+        return not any(fnmatch(name, pattern) for pattern in exclude)
+
+    def _interface_targets(self) -> Optional[List[Dict[str, str]]]:
+        """Interfaces picked by the scanner's default selection, None when only the primary one is scanned."""
+        if not (self.all_interfaces or self.interfaces or self.exclude_interfaces):
+            return None
+        return self.list_interfaces(self.interfaces, self.exclude_interfaces)
+
     def scan_port(self, ip: str, port: int, timeout: float = 1.0) -> bool:
         """Scan single port on target IP."""
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            family, address = sockaddr(ip, port)
+            with self.budget.slot(), self.stats.probe(ip, port) as probe, \
+                    socket.socket(family, socket.SOCK_STREAM) as sock:
                 sock.settimeout(timeout)
-                result = sock.connect_ex((ip, port))
+                result = sock.connect_ex(address)
+                probe.outcome = connect_outcome(result)
                 return result == 0
         except Exception:
             return False
 
+    def _plan_ports(self, profile: Optional[str], ports: Optional[Iterable[int]],
+                    roles: Optional[Iterable[str]]) -> Tuple[str, List[int], Dict[str, List[int]]]:
+        """Return (profile, first-phase ports, role -> second-phase ports) of a scan profile.
+
+        Explicit ports without a profile mean "custom"; they cannot be combined with roles.
+        Custom roles probe just the minimal union of the requested roles' ports in one
+        phase. Otherwise a role whose specific ports (see _candidate_ports) are all outside
+        the common ports gets the first of them added to the first phase, so its hosts can
+        become candidates.
+        """
+        if profile is None:
+            profile = "custom" if ports is not None else "ecosystem"
+        if profile not in self.SCAN_PROFILES:
+            raise ValueError(f"Unknown scan profile: {profile} (expected one of {', '.join(self.SCAN_PROFILES)})")
+
+        known_roles = self.classifier.profiles
+        roles = list(roles) if roles is not None else None
+        for role in roles or []:
+            if role not in known_roles:
+                raise ValueError(f"Unknown server role: {role} (expected one of {', '.join(known_roles)})")
+
+        if ports is not None and roles:
+            raise ValueError("Explicit ports and server roles cannot be combined; give one or the other")
+        if profile == "custom" and ports is None and not roles:
+            raise ValueError("The custom scan profile needs ports or roles")
+        if profile == "quick" or (profile == "custom" and ports is not None):
+            return profile, list(ports) if ports is not None else list(self.COMMON_PORTS), {}
+        if profile == "custom" and roles:
+            return profile, self.ports_for_roles(roles), {}
+
+        first_phase = list(self.COMMON_PORTS)
+        selected = roles if roles is not None else list(known_roles)
+        for role in selected:
+            specific = self._candidate_ports(role)
+            if specific and not set(specific) & set(first_phase):
+                first_phase.append(specific[0])
+        role_ports = {role: sorted(set(known_roles[role]["ports"]) - set(first_phase)) for role in selected}
+        if profile == "full":
+            return profile, sorted(set(first_phase).union(*role_ports.values())), {}
+        return profile, first_phase, {role: ports for role, ports in role_ports.items() if ports}
+
+    @property
+    def all_ports(self) -> List[int]:
+        """Every port a scan may probe (first and second phase)."""
+        return sorted(set(self.ports).union(*self.role_ports.values()))
+
+    def ports_for_roles(self, roles: Iterable[str]) -> List[int]:
+        """Minimal union of ports needed to recognize roles."""
+        return sorted({port for role in roles for port in self.classifier.profiles[role]["ports"]})
+
+    def _candidate_ports(self, role: str) -> List[int]:
+        """Ports specific to role, in profile order: not generic and in no other role's profile."""
+        shared = set(self.GENERIC_PORTS)
+        for other, profile in self.classifier.profiles.items():
+            if other != role:
+                shared.update(profile["ports"])
+        ports = []
+        for port in self.classifier.profiles[role]["ports"]:
+            if port not in shared and port not in ports:
+                ports.append(port)
+        return ports
+
+    def _second_phase_ports(self, open_ports: List[int]) -> List[int]:
+        """Role ports still to probe on a host, for every role its open ports point to.
+
+        A host is a candidate for a role when one of the ports specific to the role is
+        open; SSH or a web server alone says nothing about the role.
+        """
+        if not self.role_ports or not open_ports:
+            return []
+        found = set(open_ports)
+        extra = set()
+        for role, ports in self.role_ports.items():
+            if found.intersection(self._candidate_ports(role)):
+                extra.update(ports)
+        return sorted(extra)
+
     def scan_common_ports(self, ip: str, timeout: float = 1.0) -> List[int]:
-        """Scan common ports on target IP."""
-        common_ports = [22, 80, 443, 8080, 8443, 3000, 8000, 8123, 9000, 11434, 2222]
+        """Scan the profile's ports on target IP, role ports only when the first phase points to a role."""
+        open_ports = self._scan_ports(ip, self.ports, timeout)
+        extra = self._second_phase_ports(open_ports)
+        if extra:
+            self.logger.debug(f"Second phase for {ip}: {len(extra)} role ports")
+            open_ports = sorted(open_ports + self._scan_ports(ip, extra, timeout))
+        return open_ports
+
+    def _scan_ports(self, ip: str, ports: List[int], timeout: float) -> List[int]:
+        """Scan ports on target IP concurrently; return the open ones."""
         open_ports = []
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
             future_to_port = {
                 executor.submit(self.scan_port, ip, port, timeout): port
-                for port in common_ports
+                for port in ports
             }
 
             for future in concurrent.futures.as_completed(future_to_port):
@@ -199,21 +609,20 @@ class NetworkScanner:
 
         return sorted(open_ports)
 
-    def ping_host(self, ip: str, timeout: int = 2) -> Optional[float]:
+    def ping_host(self, ip: str, timeout: float = 2) -> Optional[float]:
         """Ping host and return response time."""
+        if self.liveness == "native":
+            return self.prober.probe(ip, timeout)
+
         try:
+            self.budget.take_token()
             result = subprocess.run(
-                ['ping', '-c', '1', '-W', str(timeout), ip],
+                ['ping', '-c', '1', '-W', str(max(1, math.ceil(timeout))), ip],
                 capture_output=True, text=True
             )
 
             if result.returncode == 0:
-                # Parse ping time from output
-                for line in result.stdout.split('\n'):
-                    if 'time=' in line:
-                        time_str = line.split('time=')[1].split()[0]
-                        return float(time_str)
-                return 0.0  # Ping successful but couldn't parse time
+                return self._parse_ping_time(result.stdout)
             else:
                 return None
 
@@ -221,81 +630,764 @@ class NetworkScanner:
             self.logger.debug(f"Ping failed for {ip}: {e}")
             return None
 
-    def resolve_hostname(self, ip: str) -> Optional[str]:
-        """Resolve IP address to hostname."""
+    def check_liveness(self, hosts: List[str], timeout: Optional[float] = None,
+                       callback: Optional[AliveCallback] = None) -> Dict[str, Optional[float]]:
+        """Check which hosts are alive; callback(ip, ping_time) fires as each one answers.
+
+        Without an explicit timeout the wait adapts to RTTs measured on earlier sweeps.
+        """
+        if timeout is None:
+            timeout = self._liveness_timeout(hosts)
+        callback = self._observing(callback)
+        with self.stats.stage("liveness", hosts=len(hosts)):
+            if self.liveness == "native":
+                results = self.prober.probe_many(hosts, timeout, callback)
+            else:
+                results = {}
+                with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
+                    future_to_ip = {executor.submit(self.ping_host, ip, timeout): ip for ip in hosts}
+                    for future in concurrent.futures.as_completed(future_to_ip):
+                        rtt = future.result()
+                        results[future_to_ip[future]] = rtt
+                        if rtt is not None:
+                            callback(future_to_ip[future], rtt)
+        self._count_liveness(results)
+        return results
+
+    def _count_liveness(self, results: Dict[str, Optional[float]]) -> None:
+        self.stats.count("hosts_probed", len(results))
+        self.stats.count("hosts_alive", sum(1 for rtt in results.values() if rtt is not None))
+
+    def _liveness_timeout(self, hosts: List[str]) -> float:
+        """Liveness wait for a sweep over hosts."""
+        if self.timeouts is None:
+            return self.LIVENESS_TIMEOUT
+        timeout = self.timeouts.liveness_timeout(hosts, self.LIVENESS_TIMEOUT)
+        self.logger.debug(f"Liveness timeout for {len(hosts)} hosts: {timeout:.3f}s")
+        return timeout
+
+    def _port_timeout(self, ip: str, ceiling: float) -> float:
+        """Port connect timeout for host, at most ceiling."""
+        if self.timeouts is None:
+            return ceiling
+        return self.timeouts.port_timeout(ip, ceiling)
+
+    def _observing(self, callback: Optional[AliveCallback]) -> AliveCallback:
+        """Wrap liveness callback so every measured RTT feeds the timeout model."""
+        def on_alive(ip: str, ping_time: float) -> None:
+            if self.timeouts is not None:
+                self.timeouts.observe(ip, ping_time)
+            if callback:
+                callback(ip, ping_time)
+        return on_alive
+
+    @staticmethod
+    def _parse_ping_time(output: str) -> float:
+        """Parse round-trip time in ms from `ping` output."""
+        for line in output.split('\n'):
+            if 'time=' in line:
+                time_str = line.split('time=')[1].split()[0]
+                return float(time_str)
+        return 0.0  # Ping successful but couldn't parse time
+
+    def resolve_hostname(self, ip: str, timeout: float = RESOLVE_TIMEOUT) -> Optional[str]:
+        """Resolve IP address to hostname, waiting at most timeout seconds."""
         try:
-            hostname = socket.gethostbyaddr(ip)[0]
-            return hostname
+            return self.resolver.resolve(ip, timeout)
         except Exception:
             return None
 
+    def _attach_hostname(self, server_info: ServerInfo) -> None:
+        """Fill in hostname now if known, else once the background lookup answers."""
+        if server_info.hostname is not None:
+            return
+
+        def on_resolved(hostname: Optional[str]) -> None:
+            if hostname:
+                server_info.hostname = hostname
+
+        hostname = self.resolver.lookup(server_info.ip_address, on_resolved)
+        if hostname:
+            server_info.hostname = hostname
+
     def identify_server_type(self, server_info: ServerInfo) -> Optional[str]:
         """Identify server type based on open ports and services."""
-        open_ports_set = set(server_info.open_ports)
+        matches = self.rank_server_types([server_info])[0]
+        return matches[0].server_type if matches else None
+
+    def rank_server_types(self, servers: List[ServerInfo]) -> List[List[TypeMatch]]:
+        """Score all servers against all profiles at once; matching types best first per server."""
+        return self.classifier.rank_many(
+            [server.open_ports for server in servers],
+            [[fp["service"] for fp in server.fingerprints.values() if fp.get("service")] for server in servers]
+        )
 
-        for server_type, config in self.ECOSYSTEM_SERVERS.items():
-            required_ports = set(config["ports"])
+    def classify_servers(self, servers: List[ServerInfo]) -> List[ServerInfo]:
+        """Set server_type and type_confidence of servers in one batch (e.g. an imported scan)."""
+        ranked = self.rank_server_types(servers)
+        for index, server in enumerate(servers):
+            matches = ranked[index]
+            server.server_type = matches[0].server_type if matches else None
+            server.type_confidence = matches[0].confidence if matches else None
+        return servers
+
+    def read_neighbor_table(self) -> Dict[str, str]:
+        """Return live IPv4 neighbors (ip -> MAC) from the kernel ARP table."""
+        neighbors = {}
+        try:
+            with open(self.ARP_TABLE_PATH, 'r') as f:
+                next(f, None)  # Header line
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 6:
+                        continue
+                    ip, flags, mac = fields[0], fields[2], fields[3]
+                    # ATF_COM (0x2): resolved entry; skip incomplete/failed ones
+                    if not int(flags, 16) & 0x2 or mac == "00:00:00:00:00:00":
+                        continue
+                    neighbors[ip] = mac
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Could not read neighbor table: {e}")
+        return neighbors
 
-            # Check if server has majority of required ports
-            matching_ports = open_ports_set.intersection(required_ports)
-            if len(matching_ports) >= len(required_ports) * 0.6:  # 60% match threshold
-                return server_type
+    def read_ipv6_neighbor_table(self, interface: Optional[str] = None) -> Dict[str, str]:
+        """Return IPv6 neighbors (ip -> MAC) from `ip -6 neigh`, optionally of one interface.
 
-        return None
+        Link-local addresses carry their interface as zone (fe80::1%eth0).
+        """
+        command = self.IPV6_NEIGHBOR_COMMAND + (["dev", interface] if interface else [])
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=5)
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.debug(f"Could not read IPv6 neighbor table: {e}")
+            return {}
+        if result.returncode != 0:
+            self.logger.debug(f"Could not read IPv6 neighbor table: {result.stderr.strip()}")
+            return {}
+        return self._parse_ipv6_neighbors(result.stdout, interface)
+
+    @staticmethod
+    def _parse_ipv6_neighbors(output: str, interface: Optional[str] = None) -> Dict[str, str]:
+        """Parse `ip -6 neigh` lines, e.g. fe80::1 dev eth0 lladdr 52:54:00:12:34:56 router STALE."""
+        neighbors = {}
+        for line in output.splitlines():
+            fields = line.split()
+            if len(fields) < 3 or "lladdr" not in fields or fields[-1] in ("FAILED", "INCOMPLETE"):
+                continue
+            try:
+                address = ipaddress.IPv6Address(fields[0])
+                mac = fields[fields.index("lladdr") + 1].lower()
+                dev = fields[fields.index("dev") + 1] if "dev" in fields else interface
+            except (ValueError, IndexError):
+                continue
+            if address.is_multicast:
+                continue
+            ip = str(address)
+            if address.is_link_local:
+                if not dev:
+                    continue
+                ip = f"{ip}%{dev}"
+            neighbors[ip] = mac
+        return neighbors
+
+    def list_ipv6_interfaces(self) -> List[str]:
+        """Non-loopback interfaces with an IPv6 address."""
+        return sorted(name for name in self._read_proc_ipv6_addresses(global_only=False) if name != "lo")
+
+    def discover_ipv6_neighbors(self, interfaces: Optional[Iterable[str]] = None,
+                                timeout: float = 1.0) -> Dict[str, Optional[str]]:
+        """Find IPv6 hosts on the links of interfaces (default: all); return ip -> MAC (None if unknown).
+
+        A /64 can't be swept, so the all-nodes multicast group is pinged and every host
+        that answers, plus everything already in the kernel neighbor table, is returned.
+        """
+        interfaces = list(interfaces) if interfaces else self.list_ipv6_interfaces()
+        local = {address for addresses in self._read_proc_ipv6_addresses(global_only=False).values()
+                 for address in addresses}
+
+        neighbors: Dict[str, Optional[str]] = {}
+        for interface in interfaces:
+            for ip, rtt in self.prober.probe_multicast(interface, timeout).items():
+                neighbors.setdefault(ip, None)
+                if self.timeouts is not None:
+                    self.timeouts.observe(ip, rtt)
+            neighbors.update(self.read_ipv6_neighbor_table(interface))
+
+        neighbors = {ip: mac for ip, mac in neighbors.items() if ip.split("%")[0] not in local}
+        self.logger.info(f"Found {len(neighbors)} IPv6 neighbors on {', '.join(interfaces) or 'no interfaces'}")
+        return neighbors
+
+    def _plan_dual_stack(self, hosts: List[str], ipv4_neighbors: Dict[str, str],
+                         ipv6_neighbors: Dict[str, Optional[str]]
+                         ) -> Tuple[List[str], Dict[str, Tuple[str, List[str]]]]:
+        """Pick one address per machine to probe; return (hosts, identities).
+
+        Addresses sharing a MAC belong to one machine. When a machine has several, all of
+        them are pinged and only the fastest is port-scanned (IPv4 unless IPv6 is clearly
+        faster, global before link-local). identities maps every address of a machine
+        to (mac, all its addresses).
+        """
+        machines: Dict[str, List[str]] = {}
+        for ip, mac in list(ipv4_neighbors.items()) + list(ipv6_neighbors.items()):
+            if mac:
+                machines.setdefault(mac, []).append(ip)
+
+        candidates = [ip for addresses in machines.values() if len(addresses) > 1 for ip in addresses]
+        rtts = self.check_liveness(candidates) if candidates else {}
+
+        def cost(ip: str) -> Tuple[int, float, int]:
+            rtt = rtts.get(ip)
+            if rtt is None:
+                return (1, 0.0, 0)
+            if ":" not in ip:
+                return (0, rtt, 0)
+            return (0, rtt / self.IPV6_RTT_ADVANTAGE, int("%" in ip))
+
+        identities: Dict[str, Tuple[str, List[str]]] = {}
+        skipped: Set[str] = set()
+        for mac, addresses in machines.items():
+            chosen = min(addresses, key=cost)
+            skipped.update(ip for ip in addresses if ip != chosen)
+            for ip in addresses:
+                identities[ip] = (mac, addresses)
+
+        planned = [ip for ip in hosts if ip not in skipped]
+        planned.extend(ip for ip in ipv6_neighbors if ip not in skipped)
+        self.logger.info(f"Dual-stack plan: {len(planned)} addresses, {len(skipped)} alternates of "
+                         f"{sum(1 for addresses in machines.values() if len(addresses) > 1)} multi-address machines skipped")
+        return planned, identities
+
+    def iter_scan_dual_stack(self, subnet: str, timeout: float = 1.0, engine: Optional[str] = None,
+                             sweep: Optional[str] = None, on_server: Optional[ServerCallback] = None,
+                             interface: Optional[str] = None) -> Iterator[ServerInfo]:
+        """Scan an IPv4 subnet together with the IPv6 neighbors of its link.
+
+        IPv6 hosts are found via the neighbor table and all-nodes multicast (interface,
+        default: every IPv6 interface). Machines known under several addresses are
+        port-scanned once, over the family with the lower RTT, and reported with their
+        MAC and all addresses. The topology cache is not consulted here.
+        """
+        self.logger.info(f"Scanning subnet (dual-stack): {subnet}")
 
-    def scan_subnet(self, subnet: str, timeout: float = 1.0) -> List[ServerInfo]:
-        """Scan entire subnet for active hosts."""
+        try:
+            network = ipaddress.IPv4Network(subnet, strict=False)
+        except ValueError as e:
+            self.logger.error(f"Invalid subnet: {e}")
+            return
+
+        hosts, remainder = self._plan_sweep(network, self._check_sweep(sweep))
+        ipv4_neighbors = {ip: mac.lower() for ip, mac in self.read_neighbor_table().items()
+                          if ipaddress.IPv4Address(ip) in network}
+        ipv6_neighbors = self.discover_ipv6_neighbors([interface] if interface else None)
+        hosts, identities = self._plan_dual_stack(hosts, ipv4_neighbors, ipv6_neighbors)
+
+        for server_info in self.iter_scan_hosts(hosts, timeout, engine):
+            if server_info.ip_address in identities:
+                mac, addresses = identities[server_info.ip_address]
+                server_info.mac, server_info.addresses = mac, list(addresses)
+            if interface:
+                server_info.interface = interface
+            if on_server:
+                on_server(server_info)
+            yield server_info
+
+        if remainder:
+            self._start_background_sweep(remainder, timeout, engine, interface=interface)
+
+    def iter_scan_tailscale(self, source: Optional[TailscaleSource] = None, timeout: float = 1.0,
+                            engine: Optional[str] = None,
+                            on_server: Optional[ServerCallback] = None) -> Iterator[ServerInfo]:
+        """Probe only the online peers of the tailnet, yielding servers as they are classified.
+
+        Peers come from source (default: the configured one, else the local tailscale
+        client); their MagicDNS names are used as hostnames without reverse lookups.
+        """
+        source = source or self.tailscale or TailscaleSource()
+        peers = source.peers()
+        self.resolver.add_names(source.names(peers))
+        by_address = {peer.address: peer for peer in peers if peer.address}
+        self.logger.info(f"Probing {len(by_address)} Tailscale peers")
+
+        for server_info in self.iter_scan_hosts(list(by_address), timeout, engine):
+            peer = by_address.get(server_info.ip_address)
+            if peer:
+                server_info.hostname = server_info.hostname or peer.name
+                server_info.addresses = list(peer.addresses)
+            server_info.interface = source.INTERFACE
+            if on_server:
+                on_server(server_info)
+            yield server_info
+
+    def _plan_sweep(self, network: ipaddress.IPv4Network, sweep: str) -> Tuple[List[str], List[str]]:
+        """Split subnet hosts into (probe now, probe in background) lists, known neighbors first."""
+        hosts = [str(ip) for ip in network.hosts()]
+        if not os.path.exists(self.ARP_TABLE_PATH):
+            if sweep != "full":
+                self.logger.info("No neighbor table available; sweeping the whole subnet")
+            return hosts, []
+
+        in_subnet = set(hosts)
+        seeds = [ip for ip in self.read_neighbor_table() if ip in in_subnet]
+        seeded = set(seeds)
+        rest = [ip for ip in hosts if ip not in seeded]
+        self.logger.info(f"Neighbor table seeds {len(seeds)} of {len(hosts)} hosts in {network}")
+        if sweep == "full":
+            return seeds + rest, []
+        if sweep == "neighbors":
+            return seeds, []
+        return seeds, rest
+
+    def scan_subnet(self, subnet: str, timeout: float = 1.0, engine: Optional[str] = None,
+                    sweep: Optional[str] = None, use_cache: bool = True,
+                    on_server: Optional[ServerCallback] = None) -> List[ServerInfo]:
+        """Scan entire subnet for active hosts.
+
+        Hosts already in the kernel neighbor table are probed first. With sweep="background"
+        only those are scanned before returning and the remaining addresses are swept by a
+        low-priority background pass (see wait_background_sweep); sweep="neighbors" skips
+        the remainder entirely. Engine and sweep default to the ones chosen at construction.
+
+        With a topology cache, fresh cached hosts are returned without probing and only
+        stale, changed (new MAC) or newly seen neighbor hosts are re-probed.
+        """
+        return list(self.iter_scan_subnet(subnet, timeout, engine, sweep, use_cache, on_server))
+
+    def iter_scan_subnet(self, subnet: str, timeout: float = 1.0, engine: Optional[str] = None,
+                         sweep: Optional[str] = None, use_cache: bool = True,
+                         on_server: Optional[ServerCallback] = None,
+                         interface: Optional[str] = None) -> Iterator[ServerInfo]:
+        """Scan subnet, yielding each server as soon as it is classified (see scan_subnet).
+
+        on_server, when given, is called with every server before it is yielded. Servers
+        are attributed to interface when one is given. A yielded server may still lack its
+        hostname: reverse lookups finish in the background and fill it in later.
+        """
         self.logger.info(f"Scanning subnet: {subnet}")
 
         try:
             network = ipaddress.IPv4Network(subnet, strict=False)
         except ValueError as e:
             self.logger.error(f"Invalid subnet: {e}")
-            return []
+            return
+
+        sweep = self._check_sweep(sweep)
+        remainder: List[str] = []
+        if self.cache is not None and use_cache:
+            servers = self._iter_subnet_cached(network, timeout, engine, sweep, interface)
+        else:
+            hosts, remainder = self._plan_sweep(network, sweep)
+            servers = self.iter_scan_hosts(hosts, timeout, engine)
+
+        for server_info in servers:
+            if interface:
+                server_info.interface = interface
+            if on_server:
+                on_server(server_info)
+            yield server_info
+
+        if remainder:
+            self._start_background_sweep(remainder, timeout, engine, interface=interface)
+
+    def _iter_subnet_cached(self, network: ipaddress.IPv4Network, timeout: float, engine: Optional[str],
+                            sweep: str, interface: Optional[str] = None) -> Iterator[ServerInfo]:
+        """Scan subnet incrementally on top of the topology cache."""
+        cache = self.cache
+        assert cache is not None
+        key = cache.make_key(str(network), self.all_ports)
+        cached = cache.load_subnet(key)
+        neighbors = self.read_neighbor_table()
+
+        if cached is None or not cache.is_fresh(cached.swept_at, cache.sweep_max_age):
+            hosts, remainder = self._plan_sweep(network, sweep)
+            active_servers = []
+            for server_info in self.iter_scan_hosts(hosts, timeout, engine):
+                active_servers.append(server_info)
+                yield server_info
+            cache.store_subnet(key, active_servers, neighbors)
+            if remainder:
+                self._start_background_sweep(remainder, timeout, engine, cache_key=key, interface=interface)
+            return
+
+        reprobe = []
+        fresh_servers = []
+        for ip, host in cached.hosts.items():
+            mac = neighbors.get(ip)
+            if not cache.is_fresh(host.seen_at) or (mac and host.mac and mac != host.mac):
+                reprobe.append(ip)
+            else:
+                fresh_servers.append(host.server)
+        reprobe.extend(ip for ip in neighbors
+                       if ip not in cached.hosts and ipaddress.IPv4Address(ip) in network)
+
+        self.logger.info(f"Topology cache hit for {network}: {len(fresh_servers)} fresh, "
+                         f"{len(reprobe)} to re-probe")
+        for server_info in fresh_servers:
+            self._attach_hostname(server_info)
+            yield server_info
+        if not reprobe:
+            return
+
+        rescanned = []
+        for server_info in self.iter_scan_hosts(reprobe, timeout, engine):
+            rescanned.append(server_info)
+            yield server_info
+        found = {s.ip_address for s in rescanned}
+        cache.update_hosts(key, rescanned, gone=[ip for ip in reprobe if ip not in found],
+                                neighbors=neighbors)
+
+    def invalidate_cache(self, subnet: Optional[str] = None) -> None:
+        """Forget cached scan results for one subnet, or all of them."""
+        if self.cache is not None:
+            self.cache.invalidate(subnet)
+
+    def scan_hosts(self, hosts: List[str], timeout: float = 1.0, engine: Optional[str] = None,
+                   concurrency: Optional[int] = None) -> List[ServerInfo]:
+        """Scan given hosts (in order) for server information."""
+        return list(self.iter_scan_hosts(hosts, timeout, engine, concurrency))
+
+    def iter_scan_hosts(self, hosts: List[str], timeout: float = 1.0, engine: Optional[str] = None,
+                        concurrency: Optional[int] = None) -> Iterator[ServerInfo]:
+        """Scan given hosts, yielding each server as soon as it is classified."""
+        engine = engine or self.engine
+        if engine == "asyncio":
+            servers = self._iter_async(lambda: self.aiter_scan_hosts(hosts, timeout, concurrency))
+        elif engine == "thread":
+            servers = self._iter_scan_hosts_threaded(hosts, timeout, concurrency)
+        else:
+            raise ValueError(f"Unknown scan engine: {engine}")
+
+        for server_info in servers:
+            self.logger.info(f"Found server: {server_info.ip_address} ({server_info.hostname})")
+            yield server_info
+
+    def _iter_scan_hosts_threaded(self, hosts: List[str], timeout: float,
+                                  concurrency: Optional[int]) -> Iterator[ServerInfo]:
+        """Thread engine: sweep liveness once, scan each live host in a pool as soon as it answers."""
+        results: queue.Queue = queue.Queue()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency or 50)
+
+        def scan(ip: str, ping_time: float) -> None:
+            try:
+                results.put(self._scan_single_host(ip, timeout, ping_time))
+            except Exception as e:
+                self.logger.debug(f"Scan error for {ip}: {e}")
+                results.put(None)
 
-        active_servers = []
+        def sweep() -> None:
+            submitted = 0
 
-        # Scan hosts in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-            future_to_ip = {
-                executor.submit(self._scan_single_host, str(ip), timeout): str(ip)
-                for ip in network.hosts()
-            }
+            def on_alive(ip: str, ping_time: float) -> None:
+                nonlocal submitted
+                executor.submit(scan, ip, ping_time)
+                submitted += 1
+
+            try:
+                self.check_liveness(hosts, callback=on_alive)
+            finally:
+                results.put(_SweepDone(submitted))
+
+        threading.Thread(target=sweep, name="liveness-sweep", daemon=True).start()
+        try:
+            expected, received = None, 0
+            while expected is None or received < expected:
+                items = [results.get()]
+                # Hosts finished in the meantime are classified together with this one
+                while True:
+                    try:
+                        items.append(results.get_nowait())
+                    except queue.Empty:
+                        break
+                ready = []
+                for item in items:
+                    if isinstance(item, _SweepDone):
+                        expected = item.submitted
+                        continue
+                    received += 1
+                    if item:
+                        ready.append(item)
+                yield from self._classify_batch(ready)
+        finally:
+            executor.shutdown(wait=False)
+
+    def _iter_async(self, make_async_iterator: Callable[[], AsyncIterator[ServerInfo]]) -> Iterator[ServerInfo]:
+        """Drive an async iterator on a private event loop thread and yield its items."""
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+
+        async def drain() -> None:
+            async for item in make_async_iterator():
+                results.put(item)
+                if stop.is_set():
+                    break
+
+        def run() -> None:
+            try:
+                asyncio.run(drain())
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(_SweepDone(0))
+
+        threading.Thread(target=run, name="asyncio-scan", daemon=True).start()
+        try:
+            while True:
+                item = results.get()
+                if isinstance(item, _SweepDone):
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    async def async_scan_subnet(self, subnet: str, timeout: float = 1.0,
+                                sweep: Optional[str] = None) -> List[ServerInfo]:
+        """Scan entire subnet from the running event loop (asyncio engine)."""
+        return [server_info async for server_info in self.aiter_scan_subnet(subnet, timeout, sweep)]
+
+    async def aiter_scan_subnet(self, subnet: str, timeout: float = 1.0,
+                                sweep: Optional[str] = None) -> AsyncIterator[ServerInfo]:
+        """Scan subnet from the running event loop, yielding servers as they are classified.
+
+        The topology cache is not consulted here.
+        """
+        self.logger.info(f"Scanning subnet: {subnet}")
+
+        try:
+            network = ipaddress.IPv4Network(subnet, strict=False)
+        except ValueError as e:
+            self.logger.error(f"Invalid subnet: {e}")
+            return
+
+        hosts, remainder = self._plan_sweep(network, self._check_sweep(sweep))
+        async for server_info in self.aiter_scan_hosts(hosts, timeout):
+            self.logger.info(f"Found server: {server_info.ip_address} ({server_info.hostname})")
+            yield server_info
+        if remainder:
+            self._start_background_sweep(remainder, timeout, "asyncio")
+
+    def _check_sweep(self, sweep: Optional[str]) -> str:
+        """Resolve and validate sweep mode."""
+        sweep = sweep or self.sweep
+        if sweep not in self.SWEEP_MODES:
+            raise ValueError(f"Unknown sweep mode: {sweep}")
+        return sweep
+
+    def _start_background_sweep(self, hosts: List[str], timeout: float, engine: Optional[str],
+                                cache_key: Optional[str] = None, interface: Optional[str] = None) -> None:
+        """Sweep remaining hosts in a daemon thread with a small share of the concurrency."""
+        concurrency = max(1, int(self.max_concurrency * self.BACKGROUND_CONCURRENCY_RATIO))
+
+        def sweep() -> None:
+            try:
+                found = self.scan_hosts(hosts, timeout, engine, concurrency)
+                for server_info in found:
+                    server_info.interface = interface or server_info.interface
+                with self._background_lock:
+                    self._background_results.extend(found)
+                if cache_key and self.cache is not None:
+                    self.cache.update_hosts(cache_key, found, neighbors=self.read_neighbor_table())
+            except Exception as e:
+                self.logger.warning(f"Background sweep failed: {e}")
+
+        self.logger.info(f"Sweeping {len(hosts)} remaining hosts in background")
+        thread = threading.Thread(target=sweep, name="subnet-background-sweep", daemon=True)
+        with self._background_lock:
+            if not any(t.is_alive() for t in self._background_sweeps):
+                self._background_sweeps, self._background_results = [], []
+            self._background_sweeps.append(thread)
+        thread.start()
+
+    def wait_background_sweep(self, timeout: Optional[float] = None) -> List[ServerInfo]:
+        """Wait for background sweeps (if any) and return the servers they found."""
+        with self._background_lock:
+            sweeps = list(self._background_sweeps)
+        for thread in sweeps:
+            thread.join(timeout)
+        with self._background_lock:
+            return list(self._background_results)
+
+    async def aiter_scan_hosts(self, hosts: List[str], timeout: float = 1.0,
+                               concurrency: Optional[int] = None) -> AsyncIterator[ServerInfo]:
+        """Scan hosts from one event loop, yielding servers as they are classified.
+
+        concurrency (default max_concurrency) bounds in-flight probes of this scan; the
+        shared budget bounds open sockets and packet rate across all scans.
+        """
+        limit = asyncio.Semaphore(concurrency or self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        finished: asyncio.Queue = asyncio.Queue()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        def spawn(ip: str, ping_time: float) -> None:
+            task = loop.create_task(self._async_scan_single_host(ip, timeout, limit, ping_time))
+            task.add_done_callback(lambda t: finished.put_nowait((ip, t)))
+            tasks[ip] = task
+
+        def on_alive(ip: str, ping_time: float) -> None:
+            # The native prober reports from its own thread
+            loop.call_soon_threadsafe(spawn, ip, ping_time)
 
-            for future in concurrent.futures.as_completed(future_to_ip):
-                ip = future_to_ip[future]
+        liveness = loop.create_task(
+            self._async_check_liveness(hosts, self._liveness_timeout(hosts), limit, on_alive))
+        liveness.add_done_callback(lambda t: finished.put_nowait((None, t)))
+
+        try:
+            liveness_done, received = False, 0
+            while not liveness_done or received < len(tasks):
+                items = [await finished.get()]
+                # Hosts finished in the meantime are classified together with this one
+                while True:
+                    try:
+                        items.append(finished.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                ready = []
+                for ip, task in items:
+                    if ip is None:
+                        liveness_done = True
+                        if task.exception():
+                            self.logger.debug(f"Liveness sweep failed: {task.exception()}")
+                        continue
+                    received += 1
+                    if task.exception():
+                        self.logger.debug(f"Scan error for {ip}: {task.exception()}")
+                    elif task.result():
+                        ready.append(task.result())
+                for server_info in self._classify_batch(ready):
+                    yield server_info
+        finally:
+            for task in [liveness, *tasks.values()]:
+                task.cancel()
+
+    async def _async_check_liveness(self, hosts: List[str], timeout: float, limit: asyncio.Semaphore,
+                                    callback: AliveCallback) -> Dict[str, Optional[float]]:
+        """Check liveness of hosts without blocking the event loop."""
+        callback = self._observing(callback)
+        with self.stats.stage("liveness", hosts=len(hosts)):
+            if self.liveness == "native":
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(None, self.prober.probe_many, hosts, timeout, callback)
+            else:
+                async def ping(ip: str) -> Tuple[str, Optional[float]]:
+                    async with limit:
+                        ping_time = await self._async_ping_host(ip, timeout)
+                    if ping_time is not None:
+                        callback(ip, ping_time)
+                    return ip, ping_time
+
+                results = dict(await asyncio.gather(*(ping(ip) for ip in hosts)))
+        self._count_liveness(results)
+        return results
+
+    async def _async_scan_single_host(self, ip: str, timeout: float, limit: asyncio.Semaphore,
+                                      ping_time: float) -> ServerInfo:
+        """Scan single live host for server information (asyncio engine)."""
+        # Start the reverse lookup while ports are probed
+        self.resolver.submit([ip])
+
+        port_timeout = self._port_timeout(ip, timeout)
+        with self.stats.stage("port_probe", ip=ip):
+            open_ports = await self._async_scan_ports(ip, self.ports, port_timeout, limit)
+            extra = self._second_phase_ports(open_ports)
+            if extra:
+                self.logger.debug(f"Second phase for {ip}: {len(extra)} role ports")
+                open_ports = sorted(open_ports + await self._async_scan_ports(ip, extra, port_timeout, limit))
+
+        fingerprints = None
+        if self.fingerprinter and open_ports:
+            with self.stats.stage("fingerprint", ip=ip):
+                fingerprints = await self.fingerprinter.afingerprint(ip, open_ports, timeout, limit)
+
+        return self._build_server_info(ip, None, open_ports, ping_time, port_timeout, fingerprints)
+
+    async def _async_scan_ports(self, ip: str, ports: List[int], timeout: float,
+                                limit: asyncio.Semaphore) -> List[int]:
+        """Scan ports on target IP from the event loop; return the open ones."""
+        results = await asyncio.gather(*(self._async_scan_port(ip, port, timeout, limit) for port in ports))
+        return sorted(ports[index] for index, is_open in enumerate(results) if is_open)
+
+    async def _async_scan_port(self, ip: str, port: int, timeout: float,
+                               limit: asyncio.Semaphore) -> bool:
+        """Scan single port on target IP without blocking the event loop."""
+        async with limit, self.budget.aslot():
+            with self.stats.probe(ip, port) as probe:
                 try:
-                    server_info = future.result()
-                    if server_info:
-                        active_servers.append(server_info)
-                        self.logger.info(f"Found server: {ip} ({server_info.hostname})")
-                except Exception as e:
-                    self.logger.debug(f"Scan error for {ip}: {e}")
+                    loop = asyncio.get_running_loop()
+                    family, address = sockaddr(ip, port)
+                    with socket.socket(family, socket.SOCK_STREAM) as sock:
+                        sock.setblocking(False)
+                        await asyncio.wait_for(loop.sock_connect(sock, address), timeout)
+                        probe.outcome = "open"
+                        return True
+                except ConnectionRefusedError:
+                    probe.outcome = "refused"
+                except asyncio.TimeoutError:
+                    probe.outcome = "timeout"
+                except Exception:
+                    pass
+                return False
 
-        return active_servers
+    async def _async_ping_host(self, ip: str, timeout: float = 2) -> Optional[float]:
+        """Ping host from the event loop and return response time."""
+        try:
+            await self.budget.take_token_async()
+            process = await asyncio.create_subprocess_exec(
+                'ping', '-c', '1', '-W', str(max(1, math.ceil(timeout))), ip,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await process.communicate()
+
+            if process.returncode == 0:
+                return self._parse_ping_time(stdout.decode(errors='replace'))
+            return None
 
-    def _scan_single_host(self, ip: str, timeout: float) -> Optional[ServerInfo]:
+        except Exception as e:
+            self.logger.debug(f"Ping failed for {ip}: {e}")
+            return None
+
+    def _scan_single_host(self, ip: str, timeout: float,
+                          ping_time: Optional[float] = None) -> Optional[ServerInfo]:
         """Scan single host for server information."""
-        # First ping to check if host is alive
-        ping_time = self.ping_host(ip, timeout=2)
+        # First ping to check if host is alive (unless a liveness sweep already did)
+        if ping_time is None:
+            ping_time = self.ping_host(ip, timeout=2)
         if ping_time is None:
             return None
 
-        # Resolve hostname
-        hostname = self.resolve_hostname(ip)
+        # Start the reverse lookup while ports are probed
+        self.resolver.submit([ip])
 
         # Scan ports
-        open_ports = self.scan_common_ports(ip, timeout)
-
+        port_timeout = self._port_timeout(ip, timeout)
+        with self.stats.stage("port_probe", ip=ip):
+            open_ports = self.scan_common_ports(ip, port_timeout)
+
+        # Identify products behind the open ports
+        fingerprints = None
+        if self.fingerprinter and open_ports:
+            with self.stats.stage("fingerprint", ip=ip):
+                fingerprints = self.fingerprinter.fingerprint(ip, open_ports, timeout)
+
+        return self._build_server_info(ip, None, open_ports, ping_time, port_timeout, fingerprints)
+
+    def _build_server_info(self, ip: str, hostname: Optional[str], open_ports: List[int],
+                           ping_time: float, probe_timeout: Optional[float] = None,
+                           fingerprints: Optional[Dict[int, ServiceFingerprint]] = None) -> ServerInfo:
+        """Assemble ServerInfo and classify it from probe results."""
+        if probe_timeout is not None:
+            self.logger.debug(f"Timeouts for {ip}: port connect {probe_timeout * 1000:.0f} ms "
+                              f"(rtt {ping_time:.2f} ms)")
         # Detect SSH port
         ssh_port = None
-        for port in [22, 2222]:
+        for port in self.SSH_PORTS:
             if port in open_ports:
                 ssh_port = port
                 break
 
         # Identify services
-        services = self._identify_services(open_ports)
+        fingerprints = fingerprints or {}
+        services = self._identify_services(open_ports, fingerprints)
 
         server_info = ServerInfo(
             ip_address=ip,
@@ -304,16 +1396,26 @@ class NetworkScanner:
             ssh_port=ssh_port,
             services=services,
             ping_time=ping_time,
-            server_type=None
+            server_type=None,
+            probe_timeout=probe_timeout,
+            fingerprints={str(port): asdict(fp) for port, fp in sorted(fingerprints.items())}
         )
 
-        # Identify server type
-        server_info.server_type = self.identify_server_type(server_info)
+        # The server type is set when its batch is classified (see _classify_batch)
+        self._attach_hostname(server_info)
 
         return server_info
 
-    def _identify_services(self, open_ports: List[int]) -> Dict[str, str]:
-        """Identify services based on open ports."""
+    def _classify_batch(self, servers: List[ServerInfo]) -> List[ServerInfo]:
+        """Classify servers whose scans finished together in one ranking pass."""
+        if servers:
+            with self.stats.stage("classify", hosts=len(servers)):
+                self.classify_servers(servers)
+        return servers
+
+    def _identify_services(self, open_ports: List[int],
+                           fingerprints: Optional[Dict[int, ServiceFingerprint]] = None) -> Dict[str, str]:
+        """Identify services based on open ports, preferring fingerprinted products."""
         service_mapping = {
             22: "ssh",
             2222: "ssh-alt",
@@ -334,39 +1436,88 @@ class NetworkScanner:
             9200: "elasticsearch"
         }
 
+        fingerprints = fingerprints or {}
         services = {}
         for port in open_ports:
-            if port in service_mapping:
+            if port in fingerprints:
+                services[str(port)] = fingerprints[port].describe()
+            elif port in service_mapping:
                 services[str(port)] = service_mapping[port]
 
         return services
 
-    def scan_ecosystem(self) -> List[ServerInfo]:
-        """Scan for ecosystem servers specifically."""
-        network_info = self.get_local_network_info()
-
-        if not network_info.get("subnet"):
-            self.logger.error("Could not determine local subnet")
-            return []
+    def scan_ecosystem(self, on_server: Optional[ServerCallback] = None) -> List[ServerInfo]:
+        """Scan for ecosystem servers specifically.
 
-        all_servers = self.scan_subnet(network_info["subnet"])
+        on_server is called with each ecosystem server as soon as it is found.
+        """
+        targets = self._interface_targets()
+        if self.tailscale is not None:
+            servers = self.iter_scan_tailscale()
+        elif targets is not None:
+            servers = self._iter_scan_interfaces(targets)
+        else:
+            network_info = self.get_local_network_info()
+            if not network_info.get("subnet"):
+                self.logger.error("Could not determine local subnet")
+                return []
+            servers = self.iter_scan_subnet(network_info["subnet"])
 
         # Filter for ecosystem servers (servers with SSH and other services)
         ecosystem_servers = []
-        for server in all_servers:
+        for server in servers:
             if (server.ssh_port and
                 len(server.open_ports) > 1 and
                 server.server_type):
                 ecosystem_servers.append(server)
+                if on_server:
+                    on_server(server)
 
         return ecosystem_servers
 
-    def discover_network_topology(self) -> NetworkTopology:
-        """Discover complete network topology."""
+    def discover_network_topology(self, on_server: Optional[ServerCallback] = None,
+                                  all_interfaces: Optional[bool] = None,
+                                  interfaces: Optional[Iterable[str]] = None,
+                                  exclude_interfaces: Optional[Iterable[str]] = None) -> NetworkTopology:
+        """Discover complete network topology.
+
+        By default only the subnet of the primary interface is scanned. With all_interfaces,
+        interfaces (names/globs to include) or exclude_interfaces, every matching interface
+        subnet is scanned concurrently under the shared budget and merged into one topology,
+        each server attributed to its interface. The selection defaults to the one given to
+        the constructor. With a Tailscale source only the tailnet peers are probed and no
+        subnet is swept.
+
+        on_server is called with each server as soon as it is found (from scan threads when
+        several interfaces are scanned). Scan stats cover this discovery only.
+        """
         self.logger.info("Discovering network topology")
+        self.stats.reset()
 
         network_info = self.get_local_network_info()
 
+        if self.tailscale is not None:
+            all_servers = list(self.iter_scan_tailscale(on_server=on_server))
+            topology = NetworkTopology(
+                local_ip=network_info.get("local_ip") or "unknown",
+                subnet=self.TAILSCALE_SUBNET,
+                gateway=network_info.get("gateway") or "unknown",
+                servers=all_servers,
+                total_hosts=len(all_servers),
+                ecosystem_servers=[s for s in all_servers if s.server_type],
+                interfaces={TailscaleSource.INTERFACE: self.TAILSCALE_SUBNET}
+            )
+            return self._finish_topology(topology)
+
+        if all_interfaces is None and interfaces is None and exclude_interfaces is None:
+            targets = self._interface_targets()
+        elif all_interfaces or interfaces or exclude_interfaces:
+            targets = self.list_interfaces(interfaces, exclude_interfaces)
+        else:
+            targets = None
+        if targets is not None:
+            return self._finish_topology(self._discover_interfaces(network_info, targets, on_server))
+
         if not network_info.get("subnet"):
             self.logger.error("Could not determine network topology")
             return NetworkTopology(
@@ -379,41 +1530,212 @@ class NetworkScanner:
             )
 
         # Scan all servers
-        all_servers = self.scan_subnet(network_info["subnet"])
+        interface = network_info.get("interface")
+        scan = self.iter_scan_dual_stack if self.ipv6 else self.iter_scan_subnet
+        all_servers = list(scan(network_info["subnet"], on_server=on_server, interface=interface))
 
         # Identify ecosystem servers
         ecosystem_servers = [s for s in all_servers if s.server_type]
 
-        return NetworkTopology(
+        topology = NetworkTopology(
             local_ip=network_info["local_ip"],
             subnet=network_info["subnet"],
             gateway=network_info["gateway"],
             servers=all_servers,
             total_hosts=len(all_servers),
-            ecosystem_servers=ecosystem_servers
+            ecosystem_servers=ecosystem_servers,
+            interfaces={interface: network_info["subnet"]} if interface and network_info["subnet"] else {}
         )
-
-    def test_ssh_connectivity(self, servers: List[ServerInfo]) -> Dict[str, bool]:
-        """Test SSH connectivity to discovered servers."""
-        connectivity_results = {}
-
-        for server in servers:
-            if not server.ssh_port:
-                connectivity_results[server.ip_address] = False
+        return self._finish_topology(topology)
+
+    def _finish_topology(self, topology: NetworkTopology) -> NetworkTopology:
+        """Merge passively discovered hosts, wait for hostnames, record the topology and end the trace."""
+        if self.passive is not None:
+            self.passive.wait()
+            self.merge_passive(topology, self.passive.hosts())
+        if not self.resolver.wait(self.HOSTNAME_WAIT):
+            self.logger.info(f"Reverse lookups still pending after {self.HOSTNAME_WAIT:.0f} s; "
+                             f"their hostnames are left empty")
+        self._record_history(topology)
+        self.logger.info(f"Scan stats: {self.stats.summary()}")
+        self.stats.close()
+        return topology
+
+    def merge_passive(self, topology: NetworkTopology, hosts: Dict[str, DiscoveredHost],
+                      timeout: float = 1.0) -> NetworkTopology:
+        """Merge hosts heard over mDNS/SSDP into topology.
+
+        Known servers gain the announced names and services; hosts the scan missed get
+        a targeted probe of just their addresses instead of another sweep, as long as
+        they lie in the scanned networks. Announced fe80:: addresses carry no zone and
+        cannot be probed, so they are never in scope.
+        """
+        servers = {s.ip_address: s for s in topology.servers}
+        scope = self._scope_networks(topology)
+        missing = [ip for ip in hosts if ip not in servers and self._in_networks(ip, scope)]
+        if missing:
+            self.logger.info(f"Probing {len(missing)} hosts found by passive discovery")
+            for server_info in self.iter_scan_hosts(missing, timeout):
+                servers[server_info.ip_address] = server_info
+                topology.servers.append(server_info)
+
+        for ip, host in hosts.items():
+            known = servers.get(ip)
+            if known is None:
                 continue
-
+            if not known.hostname and host.hostnames:
+                known.hostname = host.hostnames[0]
+            known.advertised = sorted(set(known.advertised) | set(host.services))
+
+        topology.total_hosts = len(topology.servers)
+        topology.ecosystem_servers = [s for s in topology.servers if s.server_type]
+        return topology
+
+    def _scope_networks(self, topology: NetworkTopology) -> List[IPNetwork]:
+        """Networks topology covers: its scanned subnets plus, with IPv6, their interfaces' prefixes."""
+        networks: List[IPNetwork] = []
+        for subnet in list(topology.interfaces.values()) or [topology.subnet]:
             try:
-                # Test SSH connection (just connection, not authentication)
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.settimeout(5)
-                    result = sock.connect_ex((server.ip_address, server.ssh_port))
-                    connectivity_results[server.ip_address] = (result == 0)
+                networks.append(ipaddress.ip_network(subnet, strict=False))
+            except ValueError:
+                continue
+        if self.ipv6 and self.tailscale is None:
+            for name, addresses in self._read_proc_ipv6_interfaces().items():
+                if not topology.interfaces or name in topology.interfaces:
+                    networks.extend(address.network for address in addresses)
+        return networks
+
+    @staticmethod
+    def _in_networks(ip: str, networks: List[IPNetwork]) -> bool:
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        return any(address in network for network in networks)
 
+    def _record_history(self, topology: NetworkTopology) -> None:
+        """Append topology to the history store, when one is configured."""
+        if self.history is None:
+            return
+        try:
+            self.history.record(topology.servers, scope=self.history_scope(topology))
+        except Exception as e:
+            self.logger.warning(f"Could not record topology history: {e}")
+
+    def history_scope(self, topology: Optional[NetworkTopology] = None) -> str:
+        """History scope of a topology: "tailscale" or its scanned subnets (default: what discovery would scan)."""
+        if self.tailscale is not None:
+            return "tailscale"
+        targets = self._interface_targets() if topology is None else None
+        subnets: List[Optional[str]]
+        if topology is not None:
+            subnets = list(topology.interfaces.values()) or [topology.subnet]
+        elif targets is not None:
+            subnets = [target["subnet"] for target in targets]
+        else:
+            subnets = [self.get_local_network_info().get("subnet")]
+        return ",".join(sorted({s for s in subnets if s and s != "unknown"})) or "unknown"
+
+    def _discover_interfaces(self, network_info: Dict[str, Optional[str]], targets: List[Dict[str, str]],
+                             on_server: Optional[ServerCallback]) -> NetworkTopology:
+        """Scan several interface subnets concurrently and merge them into one topology."""
+        servers: Dict[str, ServerInfo] = {}
+        lock = threading.Lock()
+        subnets = self._interface_subnets(targets)
+
+        def add(server_info: ServerInfo) -> None:
+            with lock:
+                if server_info.ip_address in servers:
+                    return
+                servers[server_info.ip_address] = server_info
+                if on_server:
+                    on_server(server_info)
+
+        if subnets:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(subnets)) as executor:
+                futures = {executor.submit(self._scan_interface, iface, subnet, add): iface
+                           for iface, subnet in subnets.items()}
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.logger.warning(f"Scan of interface {futures[future]} failed: {e}")
+        else:
+            self.logger.error("No matching network interfaces to scan")
+
+        all_servers = list(servers.values())
+        return NetworkTopology(
+            local_ip=network_info.get("local_ip") or "unknown",
+            subnet=", ".join(subnets.values()) or "unknown",
+            gateway=network_info.get("gateway") or "unknown",
+            servers=all_servers,
+            total_hosts=len(all_servers),
+            ecosystem_servers=[s for s in all_servers if s.server_type],
+            interfaces=subnets
+        )
+
+    @staticmethod
+    def _interface_subnets(targets: List[Dict[str, str]]) -> Dict[str, str]:
+        """Interface -> subnet to scan; one scan per subnet, an interface appearing twice keeps the first."""
+        subnets: Dict[str, str] = {}
+        for target in targets:
+            if target["subnet"] not in subnets.values():
+                subnets.setdefault(target["interface"], target["subnet"])
+        return subnets
+
+    def _iter_scan_interfaces(self, targets: List[Dict[str, str]]) -> Iterator[ServerInfo]:
+        """Scan interface subnets one after another, yielding each host as soon as it is found."""
+        seen = set()
+        for interface, subnet in self._interface_subnets(targets).items():
+            try:
+                for server_info in self._iter_scan_interface(interface, subnet):
+                    if server_info.ip_address not in seen:
+                        seen.add(server_info.ip_address)
+                        yield server_info
             except Exception as e:
-                self.logger.debug(f"SSH test failed for {server.ip_address}: {e}")
-                connectivity_results[server.ip_address] = False
+                self.logger.warning(f"Scan of interface {interface} failed: {e}")
+
+    def _scan_interface(self, interface: str, subnet: str, on_server: ServerCallback) -> None:
+        """Scan the subnet of one interface, calling on_server with every host."""
+        for server_info in self._iter_scan_interface(interface, subnet):
+            on_server(server_info)
+
+    def _iter_scan_interface(self, interface: str, subnet: str) -> Iterator[ServerInfo]:
+        """Scan the subnet of one interface, only known neighbors when it is too large to sweep."""
+        sweep = None
+        if ipaddress.IPv4Network(subnet).num_addresses - 2 > self.MAX_SWEEP_HOSTS:
+            self.logger.info(f"{interface} subnet {subnet} is too large to sweep; scanning known neighbors only")
+            sweep = "neighbors"
+        scan_subnet = self.iter_scan_dual_stack if self.ipv6 else self.iter_scan_subnet
+        return scan_subnet(subnet, sweep=sweep, interface=interface)
+
+    def test_ssh_connectivity(self, servers: List[ServerInfo]) -> Dict[str, bool]:
+        """Test SSH connectivity to discovered servers (connect + identification string)."""
+        results = self.probe_ssh(servers)
+        return {server.ip_address: server.ip_address in results and results[server.ip_address].ssh_ok
+                for server in servers}
 
-        return connectivity_results
+    def probe_ssh(self, servers: List[ServerInfo], authenticate: bool = False) -> Dict[str, SshProbeResult]:
+        """Probe SSH on all servers with an SSH port concurrently, optionally trying key auth.
+
+        Connect timeouts follow each host's measured RTT.
+        """
+        targets = [(s.ip_address, s.ssh_port) for s in servers if s.ssh_port]
+        if not targets:
+            return {}
+        timeouts = {ip: self._port_timeout(ip, self.ssh_prober.timeout) for ip, _ in targets}
+        try:
+            results = self.ssh_prober.probe_many(targets, authenticate, timeouts)
+        except Exception as e:
+            self.logger.debug(f"SSH probe failed: {e}")
+            return {}
+        for result in results.values():
+            self.logger.debug(f"SSH {result.ip_address}:{result.port}: {result.banner or result.error} "
+                              f"(handshake {result.handshake_ms} ms, auth {result.auth})")
+            if result.host_key:
+                self.logger.warning(f"SSH host key of {result.ip_address} is {result.host_key}; "
+                                    f"verify it and add it to known_hosts before authenticating")
+        return results
 
     def connectivity_check(self) -> bool:
         """Perform basic connectivity health check."""
@@ -437,7 +1759,7 @@ class NetworkScanner:
             self.logger.error(f"Connectivity check failed: {e}")
             return False
 
-    def export_topology(self, filepath: str):
+    def export_topology(self, filepath: str) -> None:
         """Export network topology to JSON file."""
         try:
             topology = self.discover_network_topology()
@@ -448,6 +1770,7 @@ class NetworkScanner:
                 "subnet": topology.subnet,
                 "gateway": topology.gateway,
                 "total_hosts": topology.total_hosts,
+                "interfaces": topology.interfaces,
                 "servers": [
                     {
                         "ip_address": server.ip_address,
@@ -456,10 +1779,18 @@ class NetworkScanner:
                         "ssh_port": server.ssh_port,
                         "services": server.services,
                         "ping_time": server.ping_time,
-                        "server_type": server.server_type
+                        "server_type": server.server_type,
+                        "type_confidence": server.type_confidence,
+                        "probe_timeout": server.probe_timeout,
+                        "interface": server.interface,
+                        "fingerprints": server.fingerprints,
+                        "mac": server.mac,
+                        "addresses": server.addresses,
+                        "advertised": server.advertised
                     }
                     for server in topology.servers
                 ],
+                "rtt_estimates": self.timeouts.report() if self.timeouts is not None else {},
                 "ecosystem_servers": [
                     {
                         "ip_address": server.ip_address,
@@ -0,0 +1,356 @@
+"""
+Passive Discovery Module
+Hosts and services learned from mDNS and SSDP announcements, without probing
+"""
+
+import re
+import time
+import struct
+import socket
+import logging
+import ipaddress
+import selectors
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+from urllib.parse import urlparse
+from dataclasses import dataclass, field
+
+from tools.hostname_resolver import HostnameResolver
+
+
+MDNS_GROUP = ("224.0.0.251", 5353)
+SSDP_GROUP = ("239.255.255.250", 1900)
+
+# DNS resource record types used by mDNS / DNS-SD
+DNS_A = 1
+DNS_PTR = 12
+DNS_TXT = 16
+DNS_AAAA = 28
+DNS_SRV = 33
+
+# Service instance names end in <service>._tcp.local / ._udp.local (RFC 6763)
+_SERVICE_RE = re.compile(r"(_[^.]+\._(?:tcp|udp))\.")
+
+
+@dataclass
+class DiscoveredHost:
+    """A host that announced itself."""
+    ip_address: str
+    hostnames: List[str] = field(default_factory=list)
+    services: Dict[str, Optional[int]] = field(default_factory=dict)  # advertised service -> port
+    sources: List[str] = field(default_factory=list)                 # "mdns", "ssdp"
+    last_seen: float = 0.0
+
+
+@dataclass
+class _MdnsAnswer:
+    """Records of one mDNS response, grouped for recording."""
+    addresses: Dict[str, List[str]] = field(default_factory=dict)            # host name -> addresses
+    services: List[Tuple[str, str, Optional[int]]] = field(default_factory=list)  # (target, service, port)
+    reverse: Dict[str, str] = field(default_factory=dict)                    # address -> host name
+
+
+# Called with a host whenever an announcement added something new about it
+HostCallback = Callable[[DiscoveredHost], None]
+
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Read a (possibly compressed) DNS name; return (name, offset after it)."""
+    labels: List[str] = []
+    end = None
+    for _ in range(128):  # Bounds pointer loops
+        length = data[offset]
+        if length & 0xc0 == 0xc0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3f) << 8) | data[offset + 1]
+            continue
+        offset += 1
+        if length == 0:
+            return ".".join(labels), end if end is not None else offset
+        labels.append(data[offset:offset + length].decode("utf-8", errors="replace"))
+        offset += length
+    raise ValueError("DNS name compression loop")
+
+
+def parse_dns_records(data: bytes) -> List[Tuple[str, int, object]]:
+    """Return (name, type, value) of the resource records of a DNS response.
+
+    Values: A/AAAA address string, PTR target name, SRV (target, port); other types
+    are returned as raw bytes. Queries yield no records.
+    """
+    if len(data) < 12:
+        raise ValueError("Truncated DNS header")
+    _ident, flags, qdcount, ancount, nscount, arcount = struct.unpack("!HHHHHH", data[:12])
+    if not flags & 0x8000:
+        return []
+
+    offset = 12
+    for _ in range(qdcount):
+        _name, offset = _read_name(data, offset)
+        offset += 4
+
+    records: List[Tuple[str, int, object]] = []
+    for _ in range(ancount + nscount + arcount):
+        name, offset = _read_name(data, offset)
+        rtype, _rclass, _ttl, length = struct.unpack("!HHIH", data[offset:offset + 10])
+        offset += 10
+        rdata = data[offset:offset + length]
+        if len(rdata) < length:
+            raise ValueError("Truncated DNS record")
+        value: object
+        if rtype == DNS_A and length == 4:
+            value = socket.inet_ntop(socket.AF_INET, rdata)
+        elif rtype == DNS_AAAA and length == 16:
+            value = socket.inet_ntop(socket.AF_INET6, rdata)
+        elif rtype == DNS_PTR:
+            value = _read_name(data, offset)[0]
+        elif rtype == DNS_SRV and length >= 7:
+            port = struct.unpack("!H", rdata[4:6])[0]
+            value = (_read_name(data, offset + 6)[0], port)
+        else:
+            value = rdata
+        records.append((name, rtype, value))
+        offset += length
+    return records
+
+
+def parse_ssdp(data: bytes) -> Optional[Dict[str, str]]:
+    """Return lowercased headers of an SSDP NOTIFY or M-SEARCH response, None otherwise."""
+    lines = data.decode("utf-8", errors="replace").split("\r\n")
+    start = lines[0].upper()
+    if not (start.startswith("NOTIFY ") or start.startswith("HTTP/1.1 200")):
+        return None  # M-SEARCH requests of other clients say nothing about them
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+class PassiveListener:
+    """Listen to mDNS and SSDP multicast traffic and collect the hosts announcing themselves.
+
+    Nothing is sent: hosts are learned from the announcements and query responses that
+    other devices multicast anyway (Avahi/Bonjour services, UPnP/DLNA devices). The
+    listener runs on a daemon thread, so it can be started early and left running while
+    other work proceeds; hostnames it learns are passed on to the resolver.
+    """
+
+    # mDNS record type -> method collecting such records into an _MdnsAnswer
+    MDNS_HANDLERS = {DNS_A: "_mdns_address", DNS_AAAA: "_mdns_address", DNS_SRV: "_mdns_service",
+                     DNS_PTR: "_mdns_pointer"}
+
+    def __init__(self, resolver: Optional[HostnameResolver] = None, interface_ip: str = "0.0.0.0",
+                 mdns: Optional[Tuple[str, int]] = MDNS_GROUP, ssdp: Optional[Tuple[str, int]] = SSDP_GROUP,
+                 window: float = 0.0, on_host: Optional[HostCallback] = None):
+        self.logger = logging.getLogger(__name__)
+        # Receives the hostnames learned from announcements
+        self.resolver = resolver
+        self.interface_ip = interface_ip
+        self.groups = {name: group for name, group in (("mdns", mdns), ("ssdp", ssdp)) if group}
+        # Seconds wait() lets the listener run after start before discovery uses it
+        self.window = window
+        self.on_host = on_host
+        self.ports: Dict[str, int] = {}  # Bound port per protocol (after start)
+        self._hosts: Dict[str, DiscoveredHost] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sockets: List[socket.socket] = []
+        self._started_at: Optional[float] = None
+
+    def __enter__(self) -> "PassiveListener":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Join the multicast groups and start listening in the background."""
+        if self._thread is not None:
+            return
+        selector = selectors.DefaultSelector()
+        for protocol, (group, port) in self.groups.items():
+            try:
+                sock = self._open_socket(group, port)
+            except OSError as e:
+                self.logger.warning(f"Cannot listen for {protocol} on {group}:{port}: {e}")
+                continue
+            self.ports[protocol] = sock.getsockname()[1]
+            selector.register(sock, selectors.EVENT_READ, protocol)
+            self._sockets.append(sock)
+
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, args=(selector,), name="passive-discovery", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        for sock in self._sockets:
+            sock.close()
+        self._sockets = []
+
+    def wait(self) -> None:
+        """Block until the listening window since start has passed."""
+        if self._started_at is None:
+            return
+        remaining = self._started_at + self.window - time.monotonic()
+        if remaining > 0:
+            self._stop.wait(remaining)
+
+    def listen(self, duration: float) -> Dict[str, DiscoveredHost]:
+        """Listen for duration seconds and return what was heard."""
+        self.start()
+        try:
+            self._stop.wait(duration)
+        finally:
+            self.stop()
+        return self.hosts()
+
+    def hosts(self) -> Dict[str, DiscoveredHost]:
+        """Snapshot of hosts heard so far, by address."""
+        with self._lock:
+            return {ip: DiscoveredHost(host.ip_address, list(host.hostnames), dict(host.services),
+                                       list(host.sources), host.last_seen)
+                    for ip, host in self._hosts.items()}
+
+    def _open_socket(self, group: str, port: int) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            # Avahi and friends already listen on these ports
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind(("", port))
+            membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton(self.interface_ip))
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _run(self, selector: selectors.BaseSelector) -> None:
+        try:
+            while not self._stop.is_set():
+                for key, _events in selector.select(0.2):
+                    try:
+                        data, addr = cast(socket.socket, key.fileobj).recvfrom(9000)
+                    except OSError:
+                        continue
+                    try:
+                        if key.data == "mdns":
+                            self.handle_mdns(data, addr[0])
+                        else:
+                            self.handle_ssdp(data, addr[0])
+                    except (ValueError, IndexError, struct.error) as e:
+                        self.logger.debug(f"Ignoring malformed {key.data} packet from {addr[0]}: {e}")
+        finally:
+            selector.close()
+
+    def handle_mdns(self, data: bytes, source: str) -> None:
+        """Learn hosts from an mDNS response sent by source."""
+        answer = _MdnsAnswer()
+        for name, rtype, value in parse_dns_records(data):
+            handler = self.MDNS_HANDLERS.get(rtype)
+            if handler:
+                getattr(self, handler)(answer, name.lower(), value)
+
+        for hostname, ips in answer.addresses.items():
+            for ip in ips:
+                self._record(ip, "mdns", hostname=hostname)
+        for ip, hostname in answer.reverse.items():
+            self._record(ip, "mdns", hostname=hostname)
+        for target, service, port in answer.services:
+            for ip in answer.addresses.get(target) or [source]:
+                self._record(ip, "mdns", hostname=target or None, service=(service, port))
+
+    @staticmethod
+    def _mdns_address(answer: _MdnsAnswer, name: str, address: str) -> None:
+        answer.addresses.setdefault(name, []).append(address)
+
+    @staticmethod
+    def _mdns_service(answer: _MdnsAnswer, name: str, target: Tuple[str, int]) -> None:
+        """SRV record: a service instance and the host name and port it runs on."""
+        match = _SERVICE_RE.search(name)
+        if match:
+            answer.services.append((target[0].lower(), match.group(1), target[1]))
+
+    def _mdns_pointer(self, answer: _MdnsAnswer, name: str, target: str) -> None:
+        """PTR record: a reverse mapping of an address or a service type on offer."""
+        if name.endswith((".in-addr.arpa", ".ip6.arpa")):
+            ip = self._reverse_pointer_address(name)
+            if ip:
+                answer.reverse[ip] = target.lower()
+        elif not name.startswith("_services._dns-sd"):
+            match = _SERVICE_RE.match(name + ".")
+            if match:
+                answer.services.append(("", match.group(1), None))
+
+    def handle_ssdp(self, data: bytes, source: str) -> None:
+        """Learn a host from an SSDP announcement or search response sent by source."""
+        headers = parse_ssdp(data)
+        if headers is None:
+            return
+        service = headers.get("nt") or headers.get("st")
+        location = urlparse(headers.get("location", ""))
+        ip, port = source, None
+        try:
+            if location.hostname:
+                ip = str(ipaddress.ip_address(location.hostname))
+            port = location.port
+        except ValueError:
+            pass
+
+        if headers.get("nts", "").lower() == "ssdp:byebye":
+            with self._lock:
+                host = self._hosts.get(ip)
+                if host and service:
+                    host.services.pop(service, None)
+            return
+        self._record(ip, "ssdp", service=(service, port) if service else None)
+
+    @staticmethod
+    def _reverse_pointer_address(name: str) -> Optional[str]:
+        labels = name.split(".")
+        try:
+            if name.endswith(".in-addr.arpa"):
+                return str(ipaddress.IPv4Address(".".join(reversed(labels[:-2]))))
+            nibbles = "".join(reversed(labels[:-2]))
+            return str(ipaddress.IPv6Address(int(nibbles, 16)))
+        except ValueError:
+            return None
+
+    def _record(self, ip: str, source: str, hostname: Optional[str] = None,
+                service: Optional[Tuple[str, Optional[int]]] = None) -> None:
+        """Add what an announcement said about ip; notify when it was news."""
+        with self._lock:
+            host = self._hosts.get(ip)
+            changed = host is None
+            if host is None:
+                host = self._hosts[ip] = DiscoveredHost(ip_address=ip)
+            host.last_seen = time.time()
+            if source not in host.sources:
+                host.sources.append(source)
+            new_name = hostname if hostname and hostname not in host.hostnames else None
+            if new_name:
+                host.hostnames.append(new_name)
+                changed = True
+            if service and (service[0] not in host.services or
+                            (service[1] is not None and host.services[service[0]] != service[1])):
+                host.services[service[0]] = service[1]
+                changed = True
+
+        if new_name and self.resolver is not None and len(host.hostnames) == 1:
+            self.resolver.add_names({ip: new_name})
+        if changed:
+            self.logger.debug(f"Passive discovery: {ip} {host.hostnames} {sorted(host.services)}")
+            if self.on_host:
+                self.on_host(host)
@@ -0,0 +1,118 @@
+"""
+PATH Index Module
+Process-wide cache of the executables on PATH for cheap command existence checks
+"""
+
+import os
+import time
+import shutil
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class PathIndex:
+    """Index of command names on PATH, built by listing the PATH directories once.
+
+    The index is rebuilt when PATH changes or when the modification time of one of
+    its directories does (a package was installed or removed). Directory times are
+    re-checked at most every recheck_interval seconds, so lookups normally cost a
+    dictionary access plus one access() call on the matching file. Call invalidate()
+    after installing something to see it immediately.
+    """
+
+    def __init__(self, path: Optional[str] = None, recheck_interval: float = 1.0):
+        self.logger = logging.getLogger(__name__)
+        # Fixed search path; None follows the PATH environment variable
+        self.path = path
+        self.recheck_interval = recheck_interval
+        self.scans = 0  # Number of times the PATH directories were listed
+        self._lock = threading.Lock()
+        self._indexed_path: Optional[str] = None
+        self._dir_mtimes: List[Tuple[str, Optional[int]]] = []
+        self._candidates: Dict[str, List[str]] = {}
+        self._checked_at = 0.0
+
+    def which(self, command: str) -> Optional[str]:
+        """Full path of command like shutil.which, None when it isn't on PATH."""
+        if not command:
+            return None
+        if os.path.dirname(command) or os.name == "nt":
+            # Explicit paths and Windows PATHEXT rules aren't indexed
+            return shutil.which(command, path=self.path)
+        with self._lock:
+            self._refresh()
+            candidates = self._candidates.get(command, [])
+        for candidate in candidates:
+            if os.access(candidate, os.X_OK) and not os.path.isdir(candidate):
+                return candidate
+        return None
+
+    def exists(self, command: str) -> bool:
+        """Whether command is on PATH."""
+        return self.which(command) is not None
+
+    def invalidate(self) -> None:
+        """Rebuild the index on the next lookup."""
+        with self._lock:
+            self._indexed_path = None
+
+    def _current_path(self) -> str:
+        return self.path if self.path is not None else os.environ.get("PATH", os.defpath)
+
+    def _refresh(self) -> None:
+        """Rebuild the index if PATH or one of its directories changed (caller holds the lock)."""
+        path = self._current_path()
+        now = time.monotonic()
+        if path == self._indexed_path:
+            if now - self._checked_at < self.recheck_interval:
+                return
+            self._checked_at = now
+            if all(self._mtime(directory) == mtime for directory, mtime in self._dir_mtimes):
+                return
+        self._scan(path)
+        self._checked_at = now
+
+    @staticmethod
+    def _mtime(directory: str) -> Optional[int]:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _scan(self, path: str) -> None:
+        candidates: Dict[str, List[str]] = {}
+        dir_mtimes = []
+        seen = set()
+        for directory in path.split(os.pathsep):
+            directory = directory or os.curdir
+            if directory in seen:
+                continue
+            seen.add(directory)
+            # mtime before listing, so a change during the listing triggers another scan
+            dir_mtimes.append((directory, self._mtime(directory)))
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                candidates.setdefault(name, []).append(os.path.join(directory, name))
+        self._candidates = candidates
+        self._dir_mtimes = dir_mtimes
+        self._indexed_path = path
+        self.scans += 1
+        self.logger.debug(f"Indexed {len(candidates)} commands in {len(dir_mtimes)} PATH directories")
+
+
+# Shared by every tool in the process
+PATH_INDEX = PathIndex()
+
+
+def which(command: str) -> Optional[str]:
+    """Full path of command on PATH, from the shared index."""
+    return PATH_INDEX.which(command)
+
+
+def command_exists(command: str) -> bool:
+    """Whether command is on PATH, from the shared index."""
+    return PATH_INDEX.exists(command)
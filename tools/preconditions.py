@@ -4,19 +4,20 @@ Lightweight checks for environment and system capabilities used across wizards.
 """
 
 import os
-import shutil
 import socket
 import logging
 from typing import Optional
 
+from tools.path_index import which
+
 logger = logging.getLogger(__name__)
 
 
 def has_command(cmd: str) -> bool:
     """Return True if command is available in PATH.
-    Uses shutil.which and logs at debug level.
+    Uses the shared PATH index and logs at debug level.
     """
-    path = shutil.which(cmd)
+    path = which(cmd)
     available = path is not None
     logger.debug("has_command('%s') -> %s (path=%s)", cmd, available, path)
     return available
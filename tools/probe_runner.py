@@ -0,0 +1,170 @@
+"""
+Probe Runner Module
+Concurrent execution of registered detection probes with declared inputs and timeouts
+"""
+
+import copy
+import time
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from dataclasses import dataclass, field
+
+from tools.detection_cache import DetectionCache
+
+
+@dataclass
+class Probe:
+    """A named detection step; func is called with the values of its required probes as keyword arguments."""
+    name: str
+    func: Callable[..., Any]
+    requires: List[str] = field(default_factory=list)
+    timeout: float = 10.0
+    default: Any = None  # Value used when the probe fails or times out
+    ttl: float = 0.0     # Seconds a detected value may be reused from the runner's cache
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one probe run."""
+    name: str
+    value: Any
+    status: str               # "ok", "cached", "error" or "timeout"
+    seconds: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("ok", "cached")
+
+
+class ProbeRunner:
+    """Run probes on a small thread pool, each as soon as its inputs are ready.
+
+    Independent probes overlap, so a run takes about as long as its slowest chain of
+    dependent probes rather than the sum of all of them. A probe that raises or
+    outlives its timeout yields its default value, and probes depending on it still run
+    with that default. Timed-out probes cannot be interrupted; their worker is left to
+    finish in the background, so probes should bound their own subprocess calls too.
+
+    With a cache (tools.detection_cache.DetectionCache), probes with a ttl are only run
+    when their last successful value is older than that.
+    """
+
+    # Re-check interval while submitted probes wait for a free worker (their clock hasn't started)
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, max_workers: int = 4, cache: Optional[DetectionCache] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.cache = cache
+        self.probes: Dict[str, Probe] = {}
+
+    def register(self, name: str, func: Callable[..., Any], requires: Sequence[str] = (),
+                 timeout: float = 10.0, default: Any = None, ttl: float = 0.0) -> Probe:
+        """Add (or replace) a probe."""
+        probe = Probe(name=name, func=func, requires=list(requires), timeout=timeout, default=default, ttl=ttl)
+        self.probes[name] = probe
+        return probe
+
+    def plan(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Probes needed for names (all when None), inputs before the probes using them."""
+        order: List[str] = []
+        visiting: List[str] = []
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Probe dependency cycle: {' -> '.join(visiting + [name])}")
+            if name not in self.probes:
+                raise KeyError(f"Unknown probe: {name}")
+            visiting.append(name)
+            for dependency in self.probes[name].requires:
+                visit(dependency)
+            visiting.pop()
+            order.append(name)
+
+        for name in (self.probes if names is None else names):
+            visit(name)
+        return order
+
+    def run(self, names: Optional[Iterable[str]] = None) -> Dict[str, ProbeResult]:
+        """Run the probes for names and their inputs; return results by probe name."""
+        pending = self.plan(names)
+        results: Dict[str, ProbeResult] = {}
+        started: Dict[str, float] = {}
+        lock = threading.Lock()
+        running: Dict[concurrent.futures.Future, str] = {}
+
+        def call(probe: Probe, inputs: Dict[str, Any]) -> Any:
+            with lock:
+                started[probe.name] = time.monotonic()
+            return probe.func(**inputs)
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="probe")
+        try:
+            while pending or running:
+                # Start every probe whose inputs are all known; cache hits may ready more
+                progress = True
+                while progress:
+                    ready_names = [n for n in pending if all(d in results for d in self.probes[n].requires)]
+                    progress = bool(ready_names)
+                    for name in ready_names:
+                        probe = self.probes[name]
+                        pending.remove(name)
+                        cached = self.cache.get(name, probe.ttl) if self.cache is not None else None
+                        if cached is not None:
+                            results[name] = ProbeResult(name, cached.value, "cached", 0.0)
+                            continue
+                        inputs = {dependency: results[dependency].value for dependency in probe.requires}
+                        running[executor.submit(call, probe, inputs)] = name
+                if not running:
+                    break
+
+                with lock:
+                    deadlines = [started[name] + self.probes[name].timeout
+                                 for name in running.values() if name in started]
+                wait = max(0.0, min(deadlines) - time.monotonic()) if deadlines else self.POLL_INTERVAL
+                if len(deadlines) < len(running):
+                    wait = min(wait, self.POLL_INTERVAL)
+                done, _ = concurrent.futures.wait(list(running), timeout=wait,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = self._result(self.probes[name], future, started[name])
+                self._expire(running, started, lock, results)
+        finally:
+            # Don't wait for timed-out probes still occupying workers
+            executor.shutdown(wait=False)
+            if self.cache is not None:
+                self.cache.save()
+        return results
+
+    def _result(self, probe: Probe, future: concurrent.futures.Future, started: float) -> ProbeResult:
+        seconds = time.monotonic() - started
+        try:
+            value = future.result()
+        except Exception as e:
+            self.logger.warning(f"Probe {probe.name} failed: {e}")
+            return ProbeResult(probe.name, copy.deepcopy(probe.default), "error", seconds, str(e))
+        self.logger.debug(f"Probe {probe.name} finished in {seconds:.3f}s")
+        if self.cache is not None and probe.ttl > 0:
+            self.cache.put(probe.name, value, probe.ttl)
+        return ProbeResult(probe.name, value, "ok", seconds)
+
+    def _expire(self, running: Dict[concurrent.futures.Future, str], started: Dict[str, float],
+                lock: threading.Lock, results: Dict[str, ProbeResult]) -> None:
+        """Give up on running probes past their timeout."""
+        now = time.monotonic()
+        with lock:
+            overdue = [(future, name) for future, name in running.items()
+                       if not future.done() and name in started and now - started[name] >= self.probes[name].timeout]
+        for future, name in overdue:
+            del running[future]
+            probe = self.probes[name]
+            self.logger.warning(f"Probe {name} timed out after {probe.timeout:.1f}s")
+            results[name] = ProbeResult(name, copy.deepcopy(probe.default), "timeout", now - started[name],
+                                        f"timed out after {probe.timeout:.1f}s")
@@ -0,0 +1,138 @@
+"""
+Rate Limiter Module
+Shared packet rate limit and open-socket budget for network probing
+"""
+
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+
+class ScanBudget:
+    """Token-bucket packet rate limit combined with a cap on in-flight sockets.
+
+    Every probe path draws from one budget so a scan's throughput stays predictable
+    no matter how many hosts, subnets or engines are involved. Sending a packet takes a
+    token; opening a probe socket takes a token and a socket slot until release().
+    """
+
+    # Poll interval (s) of non-blocking callers waiting for a socket slot
+    SLOT_POLL_INTERVAL = 0.005
+
+    def __init__(self, packets_per_second: Optional[float] = None, max_sockets: int = 256,
+                 burst: Optional[float] = None):
+        if max_sockets < 1:
+            raise ValueError("max_sockets must be at least 1")
+        if packets_per_second is not None and packets_per_second <= 0:
+            raise ValueError("packets_per_second must be positive")
+        self.packets_per_second = packets_per_second
+        self.max_sockets = max_sockets
+        if burst is None:
+            burst = max(1.0, packets_per_second / 10) if packets_per_second else 0.0
+        self.burst = burst
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _token_wait(self) -> float:
+        """Seconds until a token is available (0 = available now). Caller holds the lock."""
+        if not self.packets_per_second:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.packets_per_second)
+        self._last_refill = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.packets_per_second
+
+    def _take(self, socket_slot: bool) -> None:
+        if self.packets_per_second:
+            self._tokens -= 1
+        if socket_slot:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def try_take_token(self) -> float:
+        """Take a packet token without blocking; return 0 on success, else seconds to wait."""
+        with self._cond:
+            wait = self._token_wait()
+            if not wait:
+                self._take(socket_slot=False)
+            return wait
+
+    def try_acquire(self) -> float:
+        """Take a token and a socket slot without blocking; return 0 on success, else seconds to wait."""
+        with self._cond:
+            if self.in_flight >= self.max_sockets:
+                return self.SLOT_POLL_INTERVAL
+            wait = self._token_wait()
+            if not wait:
+                self._take(socket_slot=True)
+            return wait
+
+    def take_token(self) -> None:
+        """Block until a packet token is available and take it."""
+        with self._cond:
+            while True:
+                wait = self._token_wait()
+                if not wait:
+                    self._take(socket_slot=False)
+                    return
+                self._cond.wait(wait)
+
+    def acquire(self) -> None:
+        """Block until a token and a socket slot are available and take them."""
+        with self._cond:
+            while True:
+                if self.in_flight >= self.max_sockets:
+                    self._cond.wait()
+                    continue
+                wait = self._token_wait()
+                if not wait:
+                    self._take(socket_slot=True)
+                    return
+                self._cond.wait(wait)
+
+    async def acquire_async(self) -> None:
+        """Take a token and a socket slot without blocking the event loop."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    async def take_token_async(self) -> None:
+        """Take a packet token without blocking the event loop."""
+        while True:
+            wait = self.try_take_token()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self) -> None:
+        """Return a socket slot."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a socket slot for the duration of the block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        """Hold a socket slot for the duration of the async block."""
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
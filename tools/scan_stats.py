@@ -0,0 +1,174 @@
+"""
+Scan Statistics Module
+Per-stage timings, probe outcome counters and an optional JSON-lines trace of scans
+"""
+
+import json
+import time
+import errno
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, TextIO
+from dataclasses import asdict, dataclass
+
+
+# connect() errors that mean the probe ran out of time (filtered port or dead host)
+TIMEOUT_ERRNOS = (errno.EAGAIN, errno.EWOULDBLOCK, errno.ETIMEDOUT, errno.EINPROGRESS)
+
+
+def connect_outcome(err: int) -> str:
+    """Classify a connect_ex() result as open, refused, timeout or error."""
+    if err == 0:
+        return "open"
+    if err == errno.ECONNREFUSED:
+        return "refused"
+    if err in TIMEOUT_ERRNOS:
+        return "timeout"
+    return "error"
+
+
+@dataclass
+class StageTiming:
+    """Cumulative time spent in one scan stage (concurrent work adds up)."""
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+
+class PortProbe:
+    """One port connect in progress; the prober sets outcome before it finishes."""
+    __slots__ = ("ip", "port", "outcome")
+
+    def __init__(self, ip: str, port: int):
+        self.ip = ip
+        self.port = port
+        self.outcome = "error"
+
+
+class ScanStats:
+    """Thread-safe scan instrumentation.
+
+    Records how long each stage took per host (liveness sweeps, reverse DNS, port
+    probes, fingerprinting, classification), how port connects ended (open, refused,
+    timeout, error) and the peak number of connects in flight. With trace_path every
+    stage and probe is also appended to a JSON-lines file as it finishes.
+    """
+
+    STAGES = ("liveness", "dns", "port_probe", "fingerprint", "classify")
+    OUTCOMES = ("open", "refused", "timeout", "error")
+
+    def __init__(self, trace_path: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.trace_path = trace_path
+        self._lock = threading.Lock()
+        # Opened lazily on the first traced event, closed by close()
+        self._trace: Optional[TextIO] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.stages: Dict[str, StageTiming] = {stage: StageTiming() for stage in self.STAGES}
+            self.outcomes: Dict[str, int] = {outcome: 0 for outcome in self.OUTCOMES}
+            self.counters: Dict[str, int] = {}
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.started_at = time.time()
+
+    def close(self) -> None:
+        """Write a summary line to the trace and close it; later events reopen it for appending."""
+        with self._lock:
+            if self._trace is not None:
+                self._trace.write(json.dumps({"ts": time.time(), "event": "summary", **self._snapshot()}) + "\n")
+                self._trace.close()
+                self._trace = None
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[None]:
+        """Time a block as one occurrence of stage name."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.monotonic() - started, **fields)
+
+    def add_timing(self, name: str, seconds: float, **fields: Any) -> None:
+        """Record one occurrence of stage name that took seconds."""
+        ms = seconds * 1000.0
+        with self._lock:
+            self.stages.setdefault(name, StageTiming()).add(ms)
+            self._write({"event": "stage", "stage": name, "ms": round(ms, 3), **fields})
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to a named counter (e.g. hosts_alive)."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def probe(self, ip: str, port: int) -> Iterator[PortProbe]:
+        """Track a port connect: concurrency while it runs, its outcome and duration after."""
+        probe = PortProbe(ip, port)
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.monotonic()
+        try:
+            yield probe
+        finally:
+            ms = (time.monotonic() - started) * 1000.0
+            with self._lock:
+                self.in_flight -= 1
+                self.outcomes[probe.outcome] = self.outcomes.get(probe.outcome, 0) + 1
+                self._write({"event": "probe", "ip": ip, "port": port, "outcome": probe.outcome,
+                             "ms": round(ms, 3)})
+
+    def observe_lookup(self, ip: str, seconds: float, hostname: Optional[str]) -> None:
+        """HostnameResolver hook: time of one reverse lookup."""
+        self.add_timing("dns", seconds, ip=ip, found=hostname is not None)
+
+    def snapshot(self) -> Dict:
+        """Stats as a JSON-serializable dict."""
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict:
+        return {
+            "elapsed_s": round(time.time() - self.started_at, 3),
+            "stages": {name: {**asdict(timing), "mean_ms": timing.mean_ms} for name, timing in self.stages.items()},
+            "probes": sum(self.outcomes.values()),
+            "outcomes": dict(self.outcomes),
+            "counters": dict(self.counters),
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+    def summary(self) -> str:
+        """One-line human-readable summary."""
+        snapshot = self.snapshot()
+        stages = ", ".join(f"{name} {timing['total_ms']:.0f} ms/{timing['count']}"
+                           for name, timing in snapshot["stages"].items() if timing["count"])
+        outcomes = ", ".join(f"{count} {outcome}" for outcome, count in snapshot["outcomes"].items() if count)
+        return (f"{snapshot['probes']} port probes ({outcomes or 'none'}), peak {snapshot['peak_in_flight']} "
+                f"in flight; stage time: {stages or 'none'}")
+
+    def _write(self, event: Dict) -> None:
+        """Append an event to the trace (caller holds the lock)."""
+        if self.trace_path is None:
+            return
+        try:
+            trace = self._trace
+            if trace is None:
+                trace = self._trace = open(self.trace_path, 'a', buffering=1)
+            trace.write(json.dumps({"ts": time.time(), **event}) + "\n")
+        except OSError as e:
+            self.logger.warning(f"Disabling scan trace {self.trace_path}: {e}")
+            self.trace_path = None
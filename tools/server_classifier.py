@@ -0,0 +1,178 @@
+"""
+Server Classifier Module
+Batched server-type scoring against port profiles
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass
+
+try:
+    import numpy
+    np: Optional[ModuleType] = numpy
+except ImportError:  # NumPy is optional; bitsets are used without it
+    np = None
+
+
+@dataclass
+class TypeMatch:
+    """Server type a host matches, with confidence 0..1."""
+    server_type: str
+    confidence: float
+
+
+class ServerClassifier:
+    """Score hosts against server profiles in one batched operation.
+
+    Profiles map a server type to its characteristic ports and services (the
+    NetworkScanner.ECOSYSTEM_SERVERS format, optionally with a per-profile "threshold").
+    Each profile is a bitset over the indexed ports; a host's confidence for a profile is
+    the share of the profile's ports it has open, and profiles reaching their threshold
+    are returned best first. A fingerprinted, non-generic service named by a profile
+    identifies the type outright. Large batches use a NumPy matrix product when NumPy is
+    installed.
+    """
+
+    DEFAULT_THRESHOLD = 0.6
+
+    # Service names too generic to identify a server role on their own
+    GENERIC_SERVICES = {"ssh", "http", "https"}
+
+    # Batches at least this large use NumPy (when installed)
+    NUMPY_MIN_BATCH = 64
+
+    # Profile file path -> (modification time, profiles), so scanners don't re-read an unchanged file
+    _user_profiles: Dict[str, Tuple[int, Dict[str, Dict]]] = {}
+    _user_profiles_lock = threading.Lock()
+
+    def __init__(self, profiles: Dict[str, Dict]):
+        self.logger = logging.getLogger(__name__)
+        self.profiles = {name: dict(profile) for name, profile in profiles.items()}
+        self._names = list(self.profiles)
+
+        ports = sorted({port for profile in self.profiles.values() for port in profile["ports"]})
+        self._port_bits = {port: bit for bit, port in enumerate(ports)}
+        self._masks = [self.encode(profile["ports"]) for profile in self.profiles.values()]
+        self._sizes = [max(1, len(set(profile["ports"]))) for profile in self.profiles.values()]
+        self._thresholds = [float(profile.get("threshold", self.DEFAULT_THRESHOLD))
+                            for profile in self.profiles.values()]
+        self._services = [set(profile.get("services", [])) - self.GENERIC_SERVICES
+                          for profile in self.profiles.values()]
+
+        self._matrix = None
+        if np is not None:
+            self._matrix = np.zeros((len(ports), len(self._names)), dtype=np.int32)
+            for column, profile in enumerate(self.profiles.values()):
+                for port in set(profile["ports"]):
+                    self._matrix[self._port_bits[port], column] = 1
+
+    @classmethod
+    def from_config(cls, profiles: Dict[str, Dict], path: Optional[Union[str, Path]] = None) -> "ServerClassifier":
+        """Classifier for built-in profiles extended/overridden by the user's profile file."""
+        merged = dict(profiles)
+        merged.update(cls.user_profiles(path or cls.default_config_path()))
+        return cls(merged)
+
+    @classmethod
+    def user_profiles(cls, path: Union[str, Path]) -> Dict[str, Dict]:
+        """Profiles of the file at path, read again only when it has changed since the last call."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return cls.load_profiles(path)
+        with cls._user_profiles_lock:
+            cached = cls._user_profiles.get(str(path))
+            if cached is None or cached[0] != mtime:
+                cached = cls._user_profiles[str(path)] = (mtime, cls.load_profiles(path))
+        return dict(cached[1])
+
+    @staticmethod
+    def default_config_path() -> Path:
+        """User profile file location (honours XDG_CONFIG_HOME)."""
+        config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        return Path(config_home) / "unification" / "server_profiles.json"
+
+    @staticmethod
+    def load_profiles(path: Union[str, Path]) -> Dict[str, Dict]:
+        """Load profiles from JSON ({"profiles": {name: {"ports": [...], ...}}}); invalid ones are skipped."""
+        logger = logging.getLogger(__name__)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read server profiles {path}: {e}")
+            return {}
+
+        profiles = {}
+        raw_profiles = data.get("profiles", {}) if isinstance(data, dict) else {}
+        for name, raw in (raw_profiles.items() if isinstance(raw_profiles, dict) else []):
+            try:
+                ports = [int(port) for port in raw["ports"]]
+                threshold = float(raw.get("threshold", ServerClassifier.DEFAULT_THRESHOLD))
+                if not ports or not 0 < threshold <= 1:
+                    raise ValueError("needs ports and a threshold in (0, 1]")
+                profiles[name] = {
+                    "ports": ports,
+                    "services": [str(s) for s in raw.get("services", [])],
+                    "threshold": threshold,
+                }
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                logger.warning(f"Skipping invalid server profile {name!r}: {e}")
+        return profiles
+
+    def encode(self, ports: Iterable[int]) -> int:
+        """Bitset of the indexed ports among ports."""
+        bits = 0
+        for port in ports:
+            bit = self._port_bits.get(port)
+            if bit is not None:
+                bits |= 1 << bit
+        return bits
+
+    def rank(self, open_ports: Iterable[int], services: Iterable[str] = ()) -> List[TypeMatch]:
+        """Matching server types of one host, best first."""
+        return self.rank_many([open_ports], [services])[0]
+
+    def rank_many(self, port_lists: Sequence[Iterable[int]],
+                  service_lists: Optional[Sequence[Iterable[str]]] = None) -> List[List[TypeMatch]]:
+        """Matching server types of every host, best first.
+
+        service_lists holds the fingerprinted service names of each host (optional).
+        """
+        scores = self._port_scores(port_lists)
+        results = []
+        for row, host_scores in enumerate(scores):
+            confidence = list(host_scores)
+            identified = set(service_lists[row]) - self.GENERIC_SERVICES if service_lists else set()
+            if identified:
+                for column, services in enumerate(self._services):
+                    if identified & services:
+                        confidence[column] = 1.0
+
+            matches = [(confidence[c], c) for c in range(len(self._names)) if confidence[c] >= self._thresholds[c]]
+            # Best confidence first; ties go to the more specific (larger) profile, then profile order
+            matches.sort(key=lambda match: (-match[0], -self._sizes[match[1]], match[1]))
+            results.append([TypeMatch(self._names[c], round(score, 3)) for score, c in matches])
+        return results
+
+    def _port_scores(self, port_lists: Sequence[Iterable[int]]) -> List[List[float]]:
+        """Share of each profile's ports open on each host (hosts x profiles)."""
+        if np is not None and self._matrix is not None and len(port_lists) >= self.NUMPY_MIN_BATCH:
+            hosts = np.zeros((len(port_lists), self._matrix.shape[0]), dtype=np.int32)
+            for row, ports in enumerate(port_lists):
+                columns = [self._port_bits[p] for p in set(ports) if p in self._port_bits]
+                hosts[row, columns] = 1
+            return (hosts @ self._matrix / np.array(self._sizes)).tolist()
+
+        scores = []
+        for ports in port_lists:
+            mask = self.encode(ports)
+            scores.append([bin(mask & self._masks[index]).count("1") / size for index, size in enumerate(self._sizes)])
+        return scores
@@ -0,0 +1,201 @@
+"""
+SSH Probe Module
+Concurrent SSH reachability, identification and key-auth checks
+"""
+
+import time
+import shutil
+import subprocess
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from dataclasses import dataclass
+
+from tools.fingerprint import parse_ssh_banner
+from tools.rate_limiter import ScanBudget
+
+
+@dataclass
+class SshProbeResult:
+    """Outcome of probing one SSH server."""
+    ip_address: str
+    port: int
+    connected: bool = False
+    banner: Optional[str] = None           # Server identification string
+    connect_ms: Optional[float] = None     # TCP connect latency
+    handshake_ms: Optional[float] = None   # Connect until identification string received
+    auth: Optional[bool] = None            # Key auth result, None when not attempted
+    auth_ms: Optional[float] = None
+    host_key: Optional[str] = None         # "unknown" or "changed" when ssh refused the host key
+    error: Optional[str] = None
+
+    @property
+    def ssh_ok(self) -> bool:
+        """TCP connect succeeded and the peer identified itself as an SSH server."""
+        return self.connected and self.banner is not None
+
+
+class SshProber:
+    """Probe many SSH servers at once.
+
+    Every target gets a TCP connect and has its identification string read, all
+    concurrently, so a fleet finishes in about one RTT plus handshake. Optionally a
+    non-interactive key-auth attempt runs through `ssh -o BatchMode=yes` with an OpenSSH
+    ControlMaster socket per host, so the authenticated connection is reused by later
+    probes and ssh commands for `control_persist` seconds.
+
+    Host keys are checked strictly: a host missing from known_hosts is reported through
+    SshProbeResult.host_key instead of being trusted, unless accept_new_host_keys is set.
+    """
+
+    # Identification string sent back so servers don't log an aborted handshake
+    CLIENT_IDENT = b"SSH-2.0-unification_probe\r\n"
+
+    DEFAULT_TIMEOUT = 5.0
+    DEFAULT_CONTROL_PERSIST = 60
+
+    # ssh stderr lines telling why host key verification failed
+    HOST_KEY_CHANGED = "REMOTE HOST IDENTIFICATION HAS CHANGED"
+    HOST_KEY_FAILED = "Host key verification failed"
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_connections: int = 64,
+                 budget: Optional[ScanBudget] = None, user: Optional[str] = None,
+                 identity_file: Optional[str] = None, control_dir: Optional[str] = None,
+                 control_persist: int = DEFAULT_CONTROL_PERSIST, accept_new_host_keys: bool = False):
+        self.logger = logging.getLogger(__name__)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.budget = budget or ScanBudget(max_sockets=max_connections)
+        self.user = user
+        self.identity_file = identity_file
+        self.control_dir = Path(control_dir) if control_dir else Path.home() / ".ssh" / "unification-cm"
+        self.control_persist = control_persist
+        # Add unknown host keys to known_hosts on first contact (trust on first use)
+        self.accept_new_host_keys = accept_new_host_keys
+
+    def probe_many(self, targets: Iterable[Tuple[str, int]], authenticate: bool = False,
+                   timeouts: Optional[Dict[str, float]] = None) -> Dict[str, SshProbeResult]:
+        """Probe (ip, port) targets concurrently; see aprobe_many."""
+        return asyncio.run(self.aprobe_many(targets, authenticate, timeouts))
+
+    async def aprobe_many(self, targets: Iterable[Tuple[str, int]], authenticate: bool = False,
+                          timeouts: Optional[Dict[str, float]] = None) -> Dict[str, SshProbeResult]:
+        """Probe (ip, port) targets concurrently; return results by ip.
+
+        timeouts optionally sets the connect timeout per ip (default: self.timeout).
+        """
+        targets = list(targets)
+        limit = asyncio.Semaphore(self.max_connections)
+        timeouts = timeouts or {}
+        ssh_binary = shutil.which("ssh") if authenticate else None
+        if authenticate:
+            if ssh_binary:
+                self.control_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            else:
+                self.logger.warning("ssh client not found, skipping key authentication")
+
+        async def probe(ip: str, port: int) -> SshProbeResult:
+            result = await self._probe_handshake(ip, port, timeouts.get(ip, self.timeout), limit)
+            if ssh_binary and result.ssh_ok:
+                await self._probe_auth(ssh_binary, result, limit)
+            return result
+
+        results = await asyncio.gather(*(probe(ip, port) for ip, port in targets))
+        return {result.ip_address: result for result in results}
+
+    async def _probe_handshake(self, ip: str, port: int, connect_timeout: float,
+                               limit: asyncio.Semaphore) -> SshProbeResult:
+        result = SshProbeResult(ip_address=ip, port=port)
+        async with limit, self.budget.aslot():
+            started = time.monotonic()
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), connect_timeout)
+            except Exception as e:
+                result.error = f"connect failed: {str(e) or type(e).__name__}"
+                return result
+            result.connected = True
+            result.connect_ms = (time.monotonic() - started) * 1000.0
+
+            try:
+                # Servers may send other lines before the identification string (RFC 4253 4.2)
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), self.timeout)
+                    if not line:
+                        result.error = "connection closed before identification"
+                        break
+                    fingerprint = parse_ssh_banner(port, line)
+                    if fingerprint:
+                        result.banner = fingerprint.banner
+                        result.handshake_ms = (time.monotonic() - started) * 1000.0
+                        writer.write(self.CLIENT_IDENT)
+                        await writer.drain()
+                        break
+            except Exception as e:
+                result.error = f"no identification: {str(e) or type(e).__name__}"
+            finally:
+                writer.close()
+        return result
+
+    async def _probe_auth(self, ssh_binary: str, result: SshProbeResult, limit: asyncio.Semaphore) -> None:
+        """Try non-interactive key auth, leaving a ControlMaster connection for reuse."""
+        destination = f"{self.user}@{result.ip_address}" if self.user else result.ip_address
+        command = [
+            ssh_binary,
+            "-o", "BatchMode=yes",
+            "-o", f"ConnectTimeout={max(1, int(self.timeout))}",
+            "-o", f"StrictHostKeyChecking={'accept-new' if self.accept_new_host_keys else 'yes'}",
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self.control_dir / '%C'}",
+            "-o", f"ControlPersist={self.control_persist}",
+            "-p", str(result.port),
+        ]
+        if self.identity_file:
+            command += ["-i", self.identity_file, "-o", "IdentitiesOnly=yes"]
+        command += [destination, "true"]
+
+        async with limit:
+            started = time.monotonic()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command, stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE)
+                _, stderr = await asyncio.wait_for(process.communicate(), self.timeout * 2)
+                # communicate() has reaped the process; wait() hands back its exit status as an int
+                returncode = await process.wait()
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                result.auth, result.error = False, "key authentication timed out"
+                return
+            except OSError as e:
+                result.error = f"ssh failed: {e}"
+                return
+        self._record_auth(result, returncode, stderr.decode(errors="replace"))
+        result.auth_ms = (time.monotonic() - started) * 1000.0
+
+    def _record_auth(self, result: SshProbeResult, returncode: int, stderr: str) -> None:
+        """Set the auth outcome from the ssh exit status and error output."""
+        if returncode == 0:
+            result.auth = True
+            return
+        lines = stderr.strip().splitlines()
+        result.error = lines[-1] if lines else f"ssh exited with {returncode}"
+        if self.HOST_KEY_FAILED in stderr:
+            # Authentication never started; the host key needs a decision first
+            result.host_key = "changed" if self.HOST_KEY_CHANGED in stderr else "unknown"
+        else:
+            result.auth = False
+
+    def close_masters(self, targets: Iterable[Tuple[str, int]]) -> None:
+        """Ask ControlMaster connections of targets to exit."""
+        ssh_binary = shutil.which("ssh")
+        if not ssh_binary:
+            return
+        for ip, port in targets:
+            destination = f"{self.user}@{ip}" if self.user else ip
+            try:
+                subprocess.run([ssh_binary, "-o", f"ControlPath={self.control_dir / '%C'}", "-p", str(port),
+                                "-O", "exit", destination], capture_output=True, timeout=self.timeout)
+            except (OSError, subprocess.SubprocessError) as e:
+                self.logger.debug(f"Could not close control master for {ip}: {e}")
@@ -9,9 +9,14 @@ import subprocess
 import psutil
 import json
 import logging
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from tools.detection_cache import DetectionCache
+from tools.path_index import command_exists
+from tools.probe_runner import ProbeRunner
+from tools.telemetry import TelemetrySampler
+
 
 @dataclass
 class SystemInfo:
@@ -34,8 +39,102 @@ class SystemInfo:
 class SystemDetector:
     """Intelligent system detection and analysis."""
 
-    def __init__(self):
+    # Seconds a detection probe may run before its default is used instead
+    PROBE_TIMEOUT = 10.0
+    # Seconds any single external command (sensors, systemctl, ufw) may take
+    COMMAND_TIMEOUT = 5.0
+    # health_check judges the mean of this many seconds of telemetry when enough samples exist
+    HEALTH_WINDOW = 60.0
+    HEALTH_MIN_SAMPLES = 3
+
+    # Seconds each probe's value stays valid; static facts last the whole boot
+    PROBE_TTLS = {
+        "os_distribution": DetectionCache.BOOT,
+        "hardware": DetectionCache.BOOT,
+        "sensors_output": DetectionCache.BOOT,
+        "virtualization": DetectionCache.BOOT,
+        "package_managers": 600.0,
+        "network_interfaces": 60.0,
+        "ssh_server_running": 30.0,
+        "firewall_active": 30.0,
+        "resources": 5.0,
+    }
+
+    # Results of probes that failed or timed out (the runner hands out copies)
+    HARDWARE_DEFAULTS = {
+        "cpu_cores": 0,
+        "memory_total": 0,
+        "disk_total": 0,
+    }
+
+    RESOURCES_DEFAULTS = {
+        "cpu_frequency": 0.0,
+        "memory_available": 0,
+        "disk_available": 0,
+    }
+
+    THERMAL_DEFAULTS = {
+        "sensors_available": False,
+        "thermal_zones": [],
+        "cpu_temp_available": False,
+        "q9550_detected": False
+    }
+
+    VIRT_DEFAULTS = {
+        "is_virtual": False,
+        "hypervisor": None,
+        "container": None
+    }
+
+    SECURITY_DEFAULTS = {
+        "sudo_available": False,
+        "ssh_server_running": False,
+        "firewall_active": False,
+        "selinux_status": None,
+        "apparmor_status": None
+    }
+
+    def __init__(self, max_workers: int = 4, cache: Optional[DetectionCache] = None,
+                 telemetry: Optional[TelemetrySampler] = None):
         self.logger = logging.getLogger(__name__)
+        # Detected values are reused within their TTL; pass a cache with a path to keep them across runs
+        self.cache = cache or DetectionCache()
+        # Running sampler lets health_check look at sustained pressure rather than one reading
+        self.telemetry = telemetry
+        self.runner = ProbeRunner(max_workers=max_workers, cache=self.cache)
+        self._register_probes()
+
+    def _register_probes(self) -> None:
+        """Register every detection step with the inputs it needs."""
+        timeout = self.PROBE_TIMEOUT
+
+        def register(name: str, func: Callable[..., Any], **kwargs: Any) -> None:
+            self.runner.register(name, func, timeout=timeout, ttl=self.PROBE_TTLS.get(name, 0.0), **kwargs)
+
+        register("os_distribution", self._detect_os_distribution, default=platform.system())
+        register("hardware", self._detect_hardware, default=self.HARDWARE_DEFAULTS)
+        register("resources", self._detect_resources, default=self.RESOURCES_DEFAULTS)
+        register("network_interfaces", self._detect_network_interfaces, default=[])
+        register("package_managers", self._detect_package_managers, default=[])
+        register("system_info", self._build_system_info,
+                 requires=["os_distribution", "hardware", "resources", "network_interfaces", "package_managers"],
+                 default=self._default_system_info())
+        register("sensors_output", self._read_sensors)
+        register("thermal", self._detect_thermal, requires=["sensors_output"], default=self.THERMAL_DEFAULTS)
+        register("virtualization", self._detect_virtualization, default=self.VIRT_DEFAULTS)
+        register("ssh_server_running", self._detect_ssh_server, default=False)
+        register("firewall_active", self._detect_firewall, default=False)
+        register("security", self._detect_security, requires=["ssh_server_running", "firewall_active"],
+                 default=self.SECURITY_DEFAULTS)
+
+    def invalidate_cache(self) -> None:
+        """Forget cached detection results so the next detection starts from scratch."""
+        self.cache.invalidate()
+
+    def run_probes(self, *names: str) -> Dict[str, Any]:
+        """Run the named probes (and their inputs) concurrently; return their values."""
+        results = self.runner.run(names)
+        return {name: results[name].value for name in names}
 
     def detect_basic_info(self) -> Dict[str, str]:
         """Quick system detection for basic information."""
@@ -50,52 +149,56 @@ class SystemDetector:
     def detect_comprehensive_info(self) -> SystemInfo:
         """Comprehensive system detection and analysis."""
         self.logger.info("Starting comprehensive system detection")
+        result = self.runner.run(["system_info"])["system_info"]
+        if not result.ok:
+            raise RuntimeError(f"System detection failed: {result.error}")
+        return result.value
+
+    def detect_all(self) -> Dict[str, Any]:
+        """System, thermal, virtualization and security detection in one concurrent run."""
+        values = self.run_probes("system_info", "thermal", "virtualization", "security")
+        return {
+            "system": values["system_info"],
+            "thermal": values["thermal"],
+            "virtualization": values["virtualization"],
+            "security": values["security"],
+        }
 
-        # Basic platform info
-        hostname = platform.node()
-        os_name = self._detect_os_distribution()
-        os_version = platform.release()
-        architecture = platform.machine()
-
-        # CPU information
-        cpu_cores = psutil.cpu_count(logical=False)
-        cpu_frequency = psutil.cpu_freq().current if psutil.cpu_freq() else 0.0
-
-        # Memory information
-        memory = psutil.virtual_memory()
-        memory_total = memory.total
-        memory_available = memory.available
-
-        # Disk information
-        disk = psutil.disk_usage('/')
-        disk_total = disk.total
-        disk_available = disk.free
-
-        # Network interfaces
-        network_interfaces = self._detect_network_interfaces()
-
-        # Python version
-        python_version = platform.python_version()
+    def _detect_hardware(self) -> Dict[str, Any]:
+        """CPU core count, total memory and root filesystem size."""
+        return {
+            "cpu_cores": psutil.cpu_count(logical=False),
+            "memory_total": psutil.virtual_memory().total,
+            "disk_total": psutil.disk_usage('/').total,
+        }
 
-        # Package managers
-        package_managers = self._detect_package_managers()
+    def _detect_resources(self) -> Dict[str, Any]:
+        """Current CPU frequency, available memory and free disk space."""
+        cpu_freq = psutil.cpu_freq()
+        return {
+            "cpu_frequency": cpu_freq.current if cpu_freq else 0.0,
+            "memory_available": psutil.virtual_memory().available,
+            "disk_available": psutil.disk_usage('/').free,
+        }
 
+    def _build_system_info(self, os_distribution: str, hardware: Dict[str, Any], resources: Dict[str, Any],
+                           network_interfaces: List[str], package_managers: List[str]) -> SystemInfo:
         return SystemInfo(
-            hostname=hostname,
-            os_name=os_name,
-            os_version=os_version,
-            architecture=architecture,
-            cpu_cores=cpu_cores,
-            cpu_frequency=cpu_frequency,
-            memory_total=memory_total,
-            memory_available=memory_available,
-            disk_total=disk_total,
-            disk_available=disk_available,
+            hostname=platform.node(),
+            os_name=os_distribution,
+            os_version=platform.release(),
+            architecture=platform.machine(),
             network_interfaces=network_interfaces,
-            python_version=python_version,
-            package_managers=package_managers
+            python_version=platform.python_version(),
+            package_managers=package_managers,
+            **hardware,
+            **resources
         )
 
+    def _default_system_info(self) -> SystemInfo:
+        """Platform-only system information used when full detection fails or times out."""
+        return self._build_system_info(platform.system(), dict(self.HARDWARE_DEFAULTS), dict(self.RESOURCES_DEFAULTS), [], [])
+
     def _detect_os_distribution(self) -> str:
         """Detect specific OS distribution."""
         try:
@@ -165,41 +268,37 @@ class SystemDetector:
 
     def _command_exists(self, command: str) -> bool:
         """Check if command exists in system PATH."""
-        try:
-            subprocess.run(['which', command],
-                         check=True,
-                         capture_output=True,
-                         text=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return command_exists(command)
 
     def detect_thermal_capabilities(self) -> Dict[str, any]:
         """Detect thermal monitoring capabilities (Q9550 specific)."""
-        thermal_info = {
-            "sensors_available": False,
-            "thermal_zones": [],
-            "cpu_temp_available": False,
-            "q9550_detected": False
-        }
+        return self.run_probes("thermal")["thermal"]
+
+    def _read_sensors(self) -> Optional[str]:
+        """Output of lm-sensors, None when unavailable; raises when the command fails."""
+        if not self._command_exists('sensors'):
+            return None
+        result = subprocess.run(['sensors'],
+                              capture_output=True,
+                              text=True,
+                              timeout=self.COMMAND_TIMEOUT)
+        if result.returncode != 0:
+            raise RuntimeError(f"sensors exited with status {result.returncode}")
+        return result.stdout
+
+    def _detect_thermal(self, sensors_output: Optional[str]) -> Dict[str, any]:
+        thermal_info = dict(self.THERMAL_DEFAULTS)
 
         try:
-            # Check for sensors command
-            if self._command_exists('sensors'):
+            if sensors_output is not None:
                 thermal_info["sensors_available"] = True
 
-                # Run sensors and parse output
-                result = subprocess.run(['sensors'],
-                                      capture_output=True,
-                                      text=True)
-                if result.returncode == 0:
-                    output = result.stdout
-                    if 'Core' in output and 'temp' in output.lower():
-                        thermal_info["cpu_temp_available"] = True
+                if 'Core' in sensors_output and 'temp' in sensors_output.lower():
+                    thermal_info["cpu_temp_available"] = True
 
-                    # Check for Q9550 specific signatures
-                    if 'Q9550' in output or 'Core 2 Quad' in output:
-                        thermal_info["q9550_detected"] = True
+                # Check for Q9550 specific signatures
+                if 'Q9550' in sensors_output or 'Core 2 Quad' in sensors_output:
+                    thermal_info["q9550_detected"] = True
 
             # Check thermal zones
             thermal_zones = []
@@ -218,11 +317,10 @@ class SystemDetector:
 
     def detect_virtualization(self) -> Dict[str, any]:
         """Detect if system is running in virtualization."""
-        virt_info = {
-            "is_virtual": False,
-            "hypervisor": None,
-            "container": None
-        }
+        return self.run_probes("virtualization")["virtualization"]
+
+    def _detect_virtualization(self) -> Dict[str, any]:
+        virt_info = dict(self.VIRT_DEFAULTS)
 
         try:
             # Check for common virtualization indicators
@@ -253,50 +351,50 @@ class SystemDetector:
 
     def detect_security_features(self) -> Dict[str, any]:
         """Detect available security features."""
-        security_info = {
-            "sudo_available": False,
-            "ssh_server_running": False,
-            "firewall_active": False,
-            "selinux_status": None,
-            "apparmor_status": None
-        }
+        return self.run_probes("security")["security"]
+
+    def _detect_security(self, ssh_server_running: bool, firewall_active: bool) -> Dict[str, any]:
+        security_info = dict(self.SECURITY_DEFAULTS)
+        security_info["ssh_server_running"] = ssh_server_running
+        security_info["firewall_active"] = firewall_active
 
         try:
             # Check sudo
             security_info["sudo_available"] = self._command_exists('sudo')
-
-            # Check SSH server
-            try:
-                result = subprocess.run(['systemctl', 'is-active', 'ssh'],
-                                      capture_output=True, text=True)
-                security_info["ssh_server_running"] = (result.returncode == 0 and
-                                                     'active' in result.stdout)
-            except:
-                # Try alternative SSH service names
-                for service in ['sshd', 'openssh']:
-                    try:
-                        result = subprocess.run(['systemctl', 'is-active', service],
-                                              capture_output=True, text=True)
-                        if result.returncode == 0 and 'active' in result.stdout:
-                            security_info["ssh_server_running"] = True
-                            break
-                    except:
-                        continue
-
-            # Check firewall
-            if self._command_exists('ufw'):
-                try:
-                    result = subprocess.run(['ufw', 'status'],
-                                          capture_output=True, text=True)
-                    security_info["firewall_active"] = 'Status: active' in result.stdout
-                except:
-                    pass
-
         except Exception as e:
             self.logger.warning(f"Could not detect security features: {e}")
 
         return security_info
 
+    def _detect_ssh_server(self) -> bool:
+        """Whether systemd reports an active SSH server."""
+        try:
+            result = subprocess.run(['systemctl', 'is-active', 'ssh'],
+                                  capture_output=True, text=True, timeout=self.COMMAND_TIMEOUT)
+            return result.returncode == 0 and 'active' in result.stdout
+        except Exception:
+            # Try alternative SSH service names
+            for service in ['sshd', 'openssh']:
+                try:
+                    result = subprocess.run(['systemctl', 'is-active', service],
+                                          capture_output=True, text=True, timeout=self.COMMAND_TIMEOUT)
+                    if result.returncode == 0 and 'active' in result.stdout:
+                        return True
+                except Exception:
+                    continue
+        return False
+
+    def _detect_firewall(self) -> bool:
+        """Whether ufw reports an active firewall."""
+        if not self._command_exists('ufw'):
+            return False
+        try:
+            result = subprocess.run(['ufw', 'status'],
+                                  capture_output=True, text=True, timeout=self.COMMAND_TIMEOUT)
+            return 'Status: active' in result.stdout
+        except Exception:
+            return False
+
     def health_check(self) -> bool:
         """Perform basic system health check."""
         try:
@@ -307,17 +405,24 @@ class SystemDetector:
                 self.logger.warning(f"Low disk space: {disk_free_percent:.1f}% free")
                 return False
 
+            sustained = self._sustained_pressure()
+            if sustained is not None:
+                memory_percent, load_avg, cpu_cores = sustained
+                basis = f" ({self.HEALTH_WINDOW:.0f}s average)"
+            else:
+                memory_percent = psutil.virtual_memory().percent
+                load_avg = os.getloadavg()[0] if hasattr(os, 'getloadavg') else 0
+                cpu_cores = psutil.cpu_count()
+                basis = ""
+
             # Check memory usage (warn if less than 10% free)
-            memory = psutil.virtual_memory()
-            if memory.percent > 90:
-                self.logger.warning(f"High memory usage: {memory.percent:.1f}%")
+            if memory_percent > 90:
+                self.logger.warning(f"High memory usage: {memory_percent:.1f}%{basis}")
                 return False
 
             # Check CPU load
-            load_avg = os.getloadavg()[0] if hasattr(os, 'getloadavg') else 0
-            cpu_cores = psutil.cpu_count()
             if load_avg > cpu_cores * 2:
-                self.logger.warning(f"High CPU load: {load_avg:.2f} (cores: {cpu_cores})")
+                self.logger.warning(f"High CPU load: {load_avg:.2f} (cores: {cpu_cores}){basis}")
                 return False
 
             return True
@@ -326,20 +431,30 @@ class SystemDetector:
             self.logger.error(f"Health check failed: {e}")
             return False
 
-    def export_system_info(self, filepath: str):
+    def _sustained_pressure(self) -> Optional[Tuple[float, float, int]]:
+        """(memory used %, load average, cores) averaged over the telemetry window, None without enough samples."""
+        if self.telemetry is None:
+            return None
+        memory = self.telemetry.summary("memory_used_percent", self.HEALTH_WINDOW)
+        load = self.telemetry.summary("load_per_core", self.HEALTH_WINDOW)
+        if memory is None or load is None or min(memory.count, load.count) < self.HEALTH_MIN_SAMPLES:
+            return None
+        if memory.p95 > 90 >= memory.mean:
+            self.logger.info(f"Memory usage peaks at {memory.p95:.1f}% but averages {memory.mean:.1f}%")
+        cores = self.telemetry.cpu_count
+        return memory.mean, load.mean * cores, cores
+
+    def export_system_info(self, filepath: str) -> None:
         """Export comprehensive system information to JSON."""
         try:
-            system_info = self.detect_comprehensive_info()
-            thermal_info = self.detect_thermal_capabilities()
-            virt_info = self.detect_virtualization()
-            security_info = self.detect_security_features()
+            detected = self.detect_all()
 
             export_data = {
                 "timestamp": psutil.boot_time(),
-                "system": system_info.__dict__,
-                "thermal": thermal_info,
-                "virtualization": virt_info,
-                "security": security_info
+                "system": detected["system"].__dict__,
+                "thermal": detected["thermal"],
+                "virtualization": detected["virtualization"],
+                "security": detected["security"]
             }
 
             with open(filepath, 'w') as f:
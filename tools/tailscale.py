@@ -0,0 +1,130 @@
+"""
+Tailscale Discovery Module
+Known tailnet peers from `tailscale status --json` as scan candidates
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import logging
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TailscalePeer:
+    """One machine of the tailnet."""
+    hostname: str
+    dns_name: Optional[str]
+    addresses: List[str]            # Tailscale IPs, IPv4 first
+    os: Optional[str] = None
+    online: bool = False
+    tags: List[str] = field(default_factory=list)
+    is_self: bool = False
+
+    @property
+    def name(self) -> str:
+        """MagicDNS name when available, else the machine's hostname."""
+        return self.dns_name or self.hostname
+
+    @property
+    def address(self) -> Optional[str]:
+        """Address to probe the peer at."""
+        return self.addresses[0] if self.addresses else None
+
+
+class TailscaleSource:
+    """Read tailnet peers from the local tailscale client or a saved status file.
+
+    The file has the format of `tailscale status --json`, so a status captured on
+    one machine (or in a test) can stand in for the live client.
+    """
+
+    # Interface name of the tailnet on Linux
+    INTERFACE = "tailscale0"
+
+    # Go runtime of some tailscale builds crashes on old CPUs without GOMAXPROCS
+    # (docs/en/tailscale-ssh-2025.md); one thread is plenty for a status call
+    DEFAULT_GOMAXPROCS = "1"
+
+    def __init__(self, status_file: Optional[str] = None, command: str = "tailscale", timeout: float = 10.0):
+        self.logger = logging.getLogger(__name__)
+        self.status_file = status_file
+        self.command = command
+        self.timeout = timeout
+
+    def read_status(self) -> Optional[Dict]:
+        """Return the decoded status JSON, None when it can't be read."""
+        if self.status_file:
+            try:
+                with open(self.status_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Could not read Tailscale status file {self.status_file}: {e}")
+                return None
+
+        binary = shutil.which(self.command)
+        if not binary:
+            self.logger.info("tailscale client not found")
+            return None
+        env = dict(os.environ)
+        env.setdefault("GOMAXPROCS", self.DEFAULT_GOMAXPROCS)
+        try:
+            result = subprocess.run([binary, "status", "--json"], capture_output=True, text=True,
+                                    timeout=self.timeout, env=env)
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.warning(f"tailscale status failed: {e}")
+            return None
+        if result.returncode != 0:
+            self.logger.warning(f"tailscale status failed: {result.stderr.strip()}")
+            return None
+        try:
+            return json.loads(result.stdout)
+        except ValueError as e:
+            self.logger.warning(f"Could not parse tailscale status: {e}")
+            return None
+
+    def peers(self, include_offline: bool = False, include_self: bool = False) -> List[TailscalePeer]:
+        """Peers of the tailnet, online ones only unless include_offline."""
+        status = self.read_status()
+        if not status:
+            return []
+        if status.get("BackendState") not in (None, "Running"):
+            self.logger.warning(f"Tailscale is not running (state: {status.get('BackendState')})")
+
+        nodes = [(node, False) for node in (status.get("Peer") or {}).values()]
+        if include_self and status.get("Self"):
+            nodes.insert(0, (status["Self"], True))
+
+        peers = []
+        for node, is_self in nodes:
+            peer = self._parse_node(node, is_self)
+            if peer is None or not peer.addresses:
+                continue
+            if not (peer.online or include_offline or is_self):
+                continue
+            peers.append(peer)
+        return peers
+
+    @staticmethod
+    def _parse_node(node: Dict, is_self: bool = False) -> Optional[TailscalePeer]:
+        if not isinstance(node, dict):
+            return None
+        addresses = [ip for ip in node.get("TailscaleIPs") or [] if isinstance(ip, str)]
+        # IPv4 first: the 100.64.0.0/10 address is what users and configs refer to
+        addresses.sort(key=lambda ip: ":" in ip)
+        return TailscalePeer(
+            hostname=node.get("HostName") or "",
+            dns_name=(node.get("DNSName") or "").rstrip(".") or None,
+            addresses=addresses,
+            os=node.get("OS") or None,
+            online=bool(node.get("Online")),
+            tags=list(node.get("Tags") or []),
+            is_self=is_self,
+        )
+
+    def names(self, peers: Optional[List[TailscalePeer]] = None) -> Dict[str, str]:
+        """Address -> name of every peer (for HostnameResolver.add_names)."""
+        peers = self.peers(include_offline=True) if peers is None else peers
+        return {ip: peer.name for peer in peers for ip in peer.addresses if peer.name}
@@ -0,0 +1,249 @@
+"""
+Telemetry Module
+Periodic /proc and /sys sampling into fixed-size ring buffers with on-demand statistics
+"""
+
+import os
+import glob
+import math
+import time
+import logging
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+
+class RingBuffer:
+    """Fixed-capacity series of (timestamp, value) samples in preallocated arrays."""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def clear(self) -> None:
+        self._next = 0
+        self._count = 0
+
+    def samples(self, since: Optional[float] = None) -> Tuple[List[float], List[float]]:
+        """(timestamps, values) oldest first, optionally only samples taken at or after since."""
+        start = (self._next - self._count) % self.capacity
+        order = [(start + i) % self.capacity for i in range(self._count)]
+        times = [self._times[i] for i in order]
+        values = [self._values[i] for i in order]
+        if since is not None:
+            first = next((i for i, t in enumerate(times) if t >= since), len(times))
+            times, values = times[first:], values[first:]
+        return times, values
+
+
+@dataclass
+class SeriesSummary:
+    """Statistics of one metric over a window of samples."""
+    count: int
+    mean: float
+    p95: float
+    minimum: float
+    maximum: float
+    last: float
+    trend: float  # Least-squares slope in units per second (positive = rising)
+
+
+def summarize(times: List[float], values: List[float]) -> Optional[SeriesSummary]:
+    """Summary of a series, None when it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    # Nearest-rank percentile
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    mean = sum(values) / len(values)
+    trend = 0.0
+    if len(values) > 1:
+        mean_time = sum(times) / len(times)
+        spread = sum((t - mean_time) ** 2 for t in times)
+        if spread > 0:
+            trend = sum((times[i] - mean_time) * (values[i] - mean) for i in range(len(values))) / spread
+    return SeriesSummary(count=len(values), mean=mean, p95=p95, minimum=ordered[0], maximum=ordered[-1],
+                         last=values[-1], trend=trend)
+
+
+class TelemetrySampler:
+    """Sample CPU, memory, load, disk and temperature from /proc and /sys.
+
+    Readings go straight from the kernel files (kept open and re-read with pread)
+    into one RingBuffer per metric, so a sample costs a handful of syscalls and
+    the buffers never grow. Statistics are computed only when asked for. CPU and
+    disk utilisation are rates, so they appear from the second sample on.
+
+    Metrics: cpu_percent, iowait_percent, memory_used_percent, swap_used_percent,
+    load_per_core, disk_busy_percent (busiest device) and temperature_c (hottest
+    thermal zone, when the machine exposes any).
+    """
+
+    METRICS = ("cpu_percent", "iowait_percent", "memory_used_percent", "swap_used_percent",
+               "load_per_core", "disk_busy_percent", "temperature_c")
+    # Devices whose activity says nothing about disk pressure
+    IGNORED_DEVICE_PREFIXES = ("loop", "ram", "zram", "fd", "sr")
+    # Bytes read per file; enough for the first /proc/stat line and diskstats of ~500 devices
+    READ_SIZE = 1 << 16
+
+    def __init__(self, interval: float = 1.0, capacity: int = 300, proc_root: str = "/proc",
+                 sys_root: str = "/sys"):
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval
+        self.capacity = capacity
+        self.proc_root = proc_root
+        self.series: Dict[str, RingBuffer] = {name: RingBuffer(capacity) for name in self.METRICS}
+        self.cpu_count = os.cpu_count() or 1
+        self._thermal_paths = sorted(glob.glob(os.path.join(sys_root, "class", "thermal", "thermal_zone*", "temp")))
+        self._fds: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_cpu: Optional[Tuple[int, int, int]] = None         # (total, idle, iowait) jiffies
+        self._last_disk: Optional[Tuple[float, Dict[str, int]]] = None  # (monotonic time, io_ticks ms by device)
+
+    def __enter__(self) -> "TelemetrySampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Sample every interval seconds on a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2)
+            self._thread = None
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def sample(self) -> Dict[str, float]:
+        """Take one reading of every metric, store it and return it."""
+        now = time.time()
+        readings: Dict[str, float] = {}
+        with self._lock:
+            for reader in (self._sample_cpu, self._sample_memory, self._sample_load, self._sample_disks,
+                           self._sample_temperature):
+                try:
+                    readings.update(reader())
+                except (OSError, ValueError, IndexError, ZeroDivisionError) as e:
+                    self.logger.debug(f"Telemetry reading {reader.__name__} failed: {e}")
+            for name, value in readings.items():
+                self.series[name].append(now, value)
+        return readings
+
+    def summary(self, metric: str, window: Optional[float] = None) -> Optional[SeriesSummary]:
+        """Statistics of metric over the last window seconds (everything buffered when None)."""
+        with self._lock:
+            times, values = self.series[metric].samples(None if window is None else time.time() - window)
+        return summarize(times, values)
+
+    def summaries(self, window: Optional[float] = None) -> Dict[str, SeriesSummary]:
+        """Statistics of every metric that has samples."""
+        result = {}
+        for metric in self.METRICS:
+            summary = self.summary(metric, window)
+            if summary is not None:
+                result[metric] = summary
+        return result
+
+    def _read(self, path: str) -> str:
+        """Current contents of a kernel file, reusing an open descriptor (caller holds the lock)."""
+        fd = self._fds.get(path)
+        if fd is None:
+            fd = self._fds[path] = os.open(path, os.O_RDONLY)
+        try:
+            return os.pread(fd, self.READ_SIZE, 0).decode("ascii", errors="replace")
+        except OSError:
+            os.close(fd)
+            del self._fds[path]
+            raise
+
+    def _sample_cpu(self) -> Dict[str, float]:
+        fields = self._read(os.path.join(self.proc_root, "stat")).split("\n", 1)[0].split()
+        # user nice system idle iowait irq softirq steal (guest time is already in user)
+        jiffies = [int(value) for value in fields[1:9]]
+        total, idle, iowait = sum(jiffies), jiffies[3], jiffies[4]
+        previous, self._last_cpu = self._last_cpu, (total, idle, iowait)
+        if previous is None or total <= previous[0]:
+            return {}
+        elapsed = total - previous[0]
+        return {
+            "cpu_percent": 100.0 * (elapsed - (idle - previous[1]) - (iowait - previous[2])) / elapsed,
+            "iowait_percent": 100.0 * (iowait - previous[2]) / elapsed,
+        }
+
+    def _sample_memory(self) -> Dict[str, float]:
+        meminfo = {}
+        for line in self._read(os.path.join(self.proc_root, "meminfo")).splitlines():
+            name, _, value = line.partition(":")
+            if name in ("MemTotal", "MemAvailable", "SwapTotal", "SwapFree"):
+                meminfo[name] = int(value.split()[0])
+        readings = {"memory_used_percent": 100.0 * (1 - meminfo["MemAvailable"] / meminfo["MemTotal"])}
+        if meminfo.get("SwapTotal"):
+            readings["swap_used_percent"] = 100.0 * (1 - meminfo["SwapFree"] / meminfo["SwapTotal"])
+        return readings
+
+    def _sample_load(self) -> Dict[str, float]:
+        load1 = float(self._read(os.path.join(self.proc_root, "loadavg")).split()[0])
+        return {"load_per_core": load1 / self.cpu_count}
+
+    def _sample_disks(self) -> Dict[str, float]:
+        now = time.monotonic()
+        ticks = {}
+        for line in self._read(os.path.join(self.proc_root, "diskstats")).splitlines():
+            fields = line.split()
+            if len(fields) >= 13 and not fields[2].startswith(self.IGNORED_DEVICE_PREFIXES):
+                ticks[fields[2]] = int(fields[12])  # Milliseconds spent doing I/O
+        previous, self._last_disk = self._last_disk, (now, ticks)
+        if previous is None or now <= previous[0]:
+            return {}
+        elapsed_ms = (now - previous[0]) * 1000.0
+        busy = [min(100.0, 100.0 * (value - previous[1].get(device, value)) / elapsed_ms)
+                for device, value in ticks.items()]
+        # A partition is never busier than its disk, so the maximum is the busiest disk
+        return {"disk_busy_percent": max(busy)} if busy else {}
+
+    def _sample_temperature(self) -> Dict[str, float]:
+        temperatures = []
+        for path in self._thermal_paths:
+            try:
+                temperatures.append(int(self._read(path).strip()) / 1000.0)
+            except (OSError, ValueError):
+                continue  # Some zones refuse reads (e.g. powered-down sensors)
+        return {"temperature_c": max(temperatures)} if temperatures else {}
@@ -0,0 +1,178 @@
+"""
+Topology Cache Module
+Persistent cache of scan results with per-host freshness
+"""
+
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from dataclasses import dataclass, field
+
+from tools.network_scanner import ServerInfo, server_info_from_dict, server_info_to_dict
+
+
+@dataclass
+class CachedHost:
+    """Cached scan record of one host."""
+    server: ServerInfo
+    seen_at: float
+    mac: Optional[str] = None
+
+
+@dataclass
+class CachedSubnet:
+    """Cached scan state of one subnet + port profile."""
+    swept_at: float
+    hosts: Dict[str, CachedHost] = field(default_factory=dict)
+
+
+class TopologyCache:
+    """On-disk cache of ServerInfo records keyed by subnet and port profile.
+
+    Host records are trusted for `max_age` seconds; after `sweep_max_age` seconds the
+    whole subnet is swept again to find new hosts. Updates hold an exclusive lock on a
+    sibling lock file, so concurrent scanners merge into the file instead of overwriting
+    each other's subnets.
+    """
+
+    CACHE_VERSION = 1
+    DEFAULT_MAX_AGE = 300.0
+    DEFAULT_SWEEP_MAX_AGE = 3600.0
+
+    def __init__(self, path: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE,
+                 sweep_max_age: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else self.default_path()
+        self.max_age = max_age
+        self.sweep_max_age = sweep_max_age if sweep_max_age is not None else max(max_age, self.DEFAULT_SWEEP_MAX_AGE)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path() -> Path:
+        """Cache file location (honours XDG_CACHE_HOME)."""
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return Path(cache_home) / "unification" / "topology.json"
+
+    @staticmethod
+    def make_key(subnet: str, ports: Iterable[int]) -> str:
+        """Cache key for a subnet scanned with a given port profile."""
+        return f"{subnet}|{','.join(str(p) for p in sorted(set(ports)))}"
+
+    def load_subnet(self, key: str) -> Optional[CachedSubnet]:
+        """Return cached subnet state, or None when nothing is cached."""
+        with self._lock:
+            entry = self._read().get("subnets", {}).get(key)
+        if not entry:
+            return None
+
+        hosts = {}
+        for ip, record in entry.get("hosts", {}).items():
+            try:
+                hosts[ip] = CachedHost(
+                    server=server_info_from_dict(record["server"]),
+                    seen_at=float(record["seen_at"]),
+                    mac=record.get("mac")
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.debug(f"Dropping unreadable cache record for {ip}: {e}")
+        return CachedSubnet(swept_at=float(entry.get("swept_at", 0.0)), hosts=hosts)
+
+    def is_fresh(self, timestamp: float, max_age: Optional[float] = None) -> bool:
+        """Return True if timestamp is younger than max_age (defaults to host max age)."""
+        return time.time() - timestamp < (self.max_age if max_age is None else max_age)
+
+    def store_subnet(self, key: str, servers: List[ServerInfo],
+                     neighbors: Optional[Dict[str, str]] = None) -> None:
+        """Replace cached subnet state with the results of a full sweep."""
+        now = time.time()
+        neighbors = neighbors or {}
+        with self._locked():
+            data = self._read()
+            data.setdefault("subnets", {})[key] = {
+                "swept_at": now,
+                "hosts": {s.ip_address: self._record(s, now, neighbors) for s in servers}
+            }
+            self._write(data)
+
+    def update_hosts(self, key: str, servers: List[ServerInfo], gone: Iterable[str] = (),
+                     neighbors: Optional[Dict[str, str]] = None) -> None:
+        """Refresh records of re-probed hosts and forget hosts that stopped answering."""
+        now = time.time()
+        neighbors = neighbors or {}
+        with self._locked():
+            data = self._read()
+            entry = data.setdefault("subnets", {}).setdefault(key, {"swept_at": 0.0, "hosts": {}})
+            for ip in gone:
+                entry["hosts"].pop(ip, None)
+            for server in servers:
+                entry["hosts"][server.ip_address] = self._record(server, now, neighbors)
+            self._write(data)
+
+    def invalidate(self, subnet: Optional[str] = None) -> None:
+        """Drop cached results for one subnet (all port profiles), or everything."""
+        with self._locked():
+            if subnet is None:
+                try:
+                    self.path.unlink()
+                except FileNotFoundError:
+                    pass
+                return
+
+            data = self._read()
+            subnets = data.get("subnets", {})
+            for key in [k for k in subnets if k.split("|", 1)[0] == subnet]:
+                del subnets[key]
+            self._write(data)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the cache for a read-merge-write, against other threads and other processes."""
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                lock_file = open(self.path.with_suffix(".lock"), 'a')
+            except OSError as e:
+                self.logger.warning(f"Could not lock topology cache {self.path}: {e}")
+                yield
+                return
+            with lock_file:
+                # Released when the lock file is closed
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                yield
+
+    @staticmethod
+    def _record(server: ServerInfo, seen_at: float, neighbors: Dict[str, str]) -> Dict:
+        return {
+            "seen_at": seen_at,
+            "mac": neighbors.get(server.ip_address),
+            "server": server_info_to_dict(server)
+        }
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == self.CACHE_VERSION:
+                return data
+            self.logger.info("Ignoring topology cache with unknown version")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            self.logger.warning(f"Could not read topology cache {self.path}: {e}")
+        return {"version": self.CACHE_VERSION, "subnets": {}}
+
+    def _write(self, data: Dict) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write topology cache {self.path}: {e}")
@@ -0,0 +1,274 @@
+"""
+Topology History Module
+Append-only, delta-encoded store of topology snapshots with a diff API
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import asdict, dataclass, field
+
+from tools.network_scanner import ServerInfo, server_info_to_dict
+
+
+@dataclass
+class SnapshotInfo:
+    """One recorded topology snapshot."""
+    snapshot_id: int
+    taken_at: float
+    scope: str
+    host_count: int
+
+
+@dataclass
+class HostChange:
+    """Differences of one host between two snapshots."""
+    ports_opened: List[int] = field(default_factory=list)
+    ports_closed: List[int] = field(default_factory=list)
+    services_changed: Dict[str, Tuple[Optional[str], Optional[str]]] = field(default_factory=dict)
+    fields_changed: Dict[str, Tuple] = field(default_factory=dict)  # other fields: (old, new)
+
+
+@dataclass
+class TopologyDiff:
+    """Differences between two snapshots, keyed by host address."""
+    old_snapshot: Optional[int]
+    new_snapshot: Optional[int]
+    added: Dict[str, Dict] = field(default_factory=dict)
+    removed: Dict[str, Dict] = field(default_factory=dict)
+    changed: Dict[str, HostChange] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class TopologyHistory:
+    """SQLite store of topology snapshots, delta-encoded per scope (e.g. subnet).
+
+    Each snapshot stores only the hosts that appeared, changed or disappeared since the
+    previous snapshot of its scope; every KEYFRAME_INTERVAL-th snapshot stores all hosts
+    so rebuilding any snapshot replays a bounded number of deltas. Per-run values (RTT,
+    probe timeouts) are not recorded, so unchanged hosts cost nothing.
+    """
+
+    KEYFRAME_INTERVAL = 32
+
+    # ServerInfo fields that change on every probe and are not part of the topology
+    VOLATILE_FIELDS = ("ping_time", "probe_timeout", "type_confidence")
+    # Fields filled in asynchronously (reverse DNS) that a scan may finish without; an
+    # empty value keeps the previously recorded one instead of counting as a change
+    STICKY_FIELDS = ("hostname",)
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            taken_at REAL NOT NULL,
+            scope TEXT NOT NULL,
+            keyframe INTEGER NOT NULL,
+            host_count INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS snapshots_scope ON snapshots (scope, id);
+        CREATE TABLE IF NOT EXISTS host_records (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+            host TEXT NOT NULL,
+            record TEXT,
+            PRIMARY KEY (snapshot_id, host)
+        );
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else self.default_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(self.SCHEMA)
+
+    @staticmethod
+    def default_path() -> Path:
+        """History database location (honours XDG_DATA_HOME)."""
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+        return Path(data_home) / "unification" / "topology_history.sqlite3"
+
+    def close(self) -> None:
+        self._db.close()
+
+    def record(self, servers: Iterable[ServerInfo], scope: str = "topology",
+               taken_at: Optional[float] = None) -> int:
+        """Append a snapshot of servers; return its id."""
+        hosts = {s.ip_address: self._host_record(s) for s in servers}
+        taken_at = time.time() if taken_at is None else taken_at
+
+        with self._lock, self._db:
+            previous = self._db.execute(
+                "SELECT id FROM snapshots WHERE scope = ? ORDER BY id DESC LIMIT 1", (scope,)).fetchone()
+            if previous is None:
+                keyframe, old = True, {}
+            else:
+                keyframe = self._deltas_since_keyframe(previous[0]) + 1 >= self.KEYFRAME_INTERVAL
+                old = self._load(previous[0])
+            self._keep_known_fields(hosts, old)
+
+            # (host, record) rows; a None record marks a host that disappeared
+            rows: List[Tuple[str, Optional[str]]]
+            if keyframe:
+                rows = [(host, json.dumps(record, sort_keys=True)) for host, record in hosts.items()]
+            else:
+                rows = [(host, json.dumps(record, sort_keys=True)) for host, record in hosts.items()
+                        if old.get(host) != record]
+                rows.extend((host, None) for host in old if host not in hosts)
+
+            cursor = self._db.execute(
+                "INSERT INTO snapshots (taken_at, scope, keyframe, host_count) VALUES (?, ?, ?, ?)",
+                (taken_at, scope, int(keyframe), len(hosts)))
+            assert cursor.lastrowid is not None, "INSERT did not produce a snapshot id"
+            snapshot_id = cursor.lastrowid
+            self._db.executemany("INSERT INTO host_records (snapshot_id, host, record) VALUES (?, ?, ?)",
+                                 [(snapshot_id, host, record) for host, record in rows])
+        self.logger.debug(f"Recorded topology snapshot {snapshot_id} ({scope}): {len(rows)} host records")
+        return snapshot_id
+
+    def snapshots(self, scope: Optional[str] = None) -> List[SnapshotInfo]:
+        """Recorded snapshots, oldest first."""
+        query = "SELECT id, taken_at, scope, host_count FROM snapshots"
+        params: Tuple = ()
+        if scope is not None:
+            query += " WHERE scope = ?"
+            params = (scope,)
+        with self._lock:
+            return [SnapshotInfo(*row) for row in self._db.execute(query + " ORDER BY id", params)]
+
+    def snapshot_at(self, timestamp: float, scope: str = "topology") -> Optional[int]:
+        """Id of the last snapshot of scope taken at or before timestamp."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id FROM snapshots WHERE scope = ? AND taken_at <= ? ORDER BY id DESC LIMIT 1",
+                (scope, timestamp)).fetchone()
+        return row[0] if row else None
+
+    def latest(self, scope: str = "topology") -> Optional[int]:
+        """Id of the most recent snapshot of scope."""
+        return self.snapshot_at(float("inf"), scope)
+
+    def load(self, snapshot_id: int) -> Dict[str, Dict]:
+        """Hosts of a snapshot (address -> recorded server fields)."""
+        with self._lock:
+            return self._load(snapshot_id)
+
+    def diff(self, old_id: Optional[int], new_id: Optional[int]) -> TopologyDiff:
+        """Compare two snapshots of one scope; None stands for an empty topology."""
+        with self._lock:
+            old = self._load(old_id) if old_id is not None else {}
+            new = self._load(new_id) if new_id is not None else {}
+            touched = self._touched_hosts(old_id, new_id)
+        return self.diff_hosts(old, new, touched, old_id, new_id)
+
+    def changes_since(self, timestamp: float, scope: str = "topology") -> TopologyDiff:
+        """What changed between the topology known at timestamp and the latest snapshot."""
+        return self.diff(self.snapshot_at(timestamp, scope), self.latest(scope))
+
+    @classmethod
+    def diff_hosts(cls, old: Dict[str, Dict], new: Dict[str, Dict], candidates: Optional[Set[str]] = None,
+                   old_id: Optional[int] = None, new_id: Optional[int] = None) -> TopologyDiff:
+        """Diff two host maps; only candidates (default: all hosts) are compared."""
+        diff = TopologyDiff(old_snapshot=old_id, new_snapshot=new_id)
+        hosts = candidates if candidates is not None else set(old) | set(new)
+        for host in sorted(hosts):
+            before, after = old.get(host), new.get(host)
+            if before == after:
+                continue
+            if before is not None and after is not None:
+                diff.changed[host] = cls._host_change(before, after)
+            elif after is not None:
+                diff.added[host] = after
+            elif before is not None:
+                diff.removed[host] = before
+        return diff
+
+    @staticmethod
+    def _host_change(before: Dict, after: Dict) -> HostChange:
+        old_ports, new_ports = set(before.get("open_ports", [])), set(after.get("open_ports", []))
+        old_services, new_services = before.get("services", {}), after.get("services", {})
+        change = HostChange(
+            ports_opened=sorted(new_ports - old_ports),
+            ports_closed=sorted(old_ports - new_ports),
+            services_changed={port: (old_services.get(port), new_services.get(port))
+                              for port in sorted(set(old_services) | set(new_services))
+                              if old_services.get(port) != new_services.get(port)},
+        )
+        for name in sorted(set(before) | set(after)):
+            if name not in ("open_ports", "services") and before.get(name) != after.get(name):
+                change.fields_changed[name] = (before.get(name), after.get(name))
+        return change
+
+    def _host_record(self, server: ServerInfo) -> Dict:
+        record = server_info_to_dict(server)
+        for name in self.VOLATILE_FIELDS:
+            record.pop(name, None)
+        return record
+
+    def _keep_known_fields(self, hosts: Dict[str, Dict], old: Dict[str, Dict]) -> None:
+        for host, record in hosts.items():
+            previous = old.get(host)
+            if previous is None:
+                continue
+            for name in self.STICKY_FIELDS:
+                if not record.get(name) and previous.get(name):
+                    record[name] = previous[name]
+
+    def _deltas_since_keyframe(self, snapshot_id: int) -> int:
+        scope, = self._db.execute("SELECT scope FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+        keyframe_id, = self._db.execute(
+            "SELECT MAX(id) FROM snapshots WHERE scope = ? AND keyframe = 1 AND id <= ?",
+            (scope, snapshot_id)).fetchone()
+        count, = self._db.execute(
+            "SELECT COUNT(*) FROM snapshots WHERE scope = ? AND id > ? AND id <= ?",
+            (scope, keyframe_id, snapshot_id)).fetchone()
+        return count
+
+    def _load(self, snapshot_id: int) -> Dict[str, Dict]:
+        """Rebuild a snapshot from its keyframe and the deltas after it. Caller holds the lock."""
+        row = self._db.execute("SELECT scope FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown topology snapshot: {snapshot_id}")
+        keyframe_id, = self._db.execute(
+            "SELECT MAX(id) FROM snapshots WHERE scope = ? AND keyframe = 1 AND id <= ?",
+            (row[0], snapshot_id)).fetchone()
+
+        hosts: Dict[str, Dict] = {}
+        records = self._db.execute(
+            "SELECT r.host, r.record FROM host_records r JOIN snapshots s ON s.id = r.snapshot_id "
+            "WHERE s.scope = ? AND s.id >= ? AND s.id <= ? ORDER BY s.id",
+            (row[0], keyframe_id, snapshot_id))
+        for host, record in records:
+            if record is None:
+                hosts.pop(host, None)
+            else:
+                hosts[host] = json.loads(record)
+        return hosts
+
+    def _touched_hosts(self, old_id: Optional[int], new_id: Optional[int]) -> Optional[Set[str]]:
+        """Hosts with records between two snapshots of one scope, None when a full compare is needed."""
+        if old_id is None or new_id is None or new_id < old_id:
+            return None
+        rows = self._db.execute("SELECT id, scope FROM snapshots WHERE id IN (?, ?)", (old_id, new_id))
+        scopes = {row[1] for row in rows}
+        if len(scopes) != 1:
+            return None
+        scope = scopes.pop()
+        keyframes, = self._db.execute(
+            "SELECT COUNT(*) FROM snapshots WHERE scope = ? AND keyframe = 1 AND id > ? AND id <= ?",
+            (scope, old_id, new_id)).fetchone()
+        if keyframes:
+            return None  # A keyframe lists every host, compare them all
+        return {host for host, in self._db.execute(
+            "SELECT DISTINCT r.host FROM host_records r JOIN snapshots s ON s.id = r.snapshot_id "
+            "WHERE s.scope = ? AND s.id > ? AND s.id <= ?", (scope, old_id, new_id))}
@@ -13,8 +13,11 @@ from typing import Dict, List
 from dataclasses import dataclass
 
 from tools.system_detector import SystemDetector
+from tools.detection_cache import DetectionCache
 from tools.dependency_resolver import DependencyResolver
 from tools.network_scanner import NetworkScanner
+from tools.hostname_resolver import HostnameResolver
+from tools.topology_cache import TopologyCache
 from tools.config_validator import ConfigValidator
 
 
@@ -111,9 +114,11 @@ class WorkstationWizard:
     def __init__(self, language: str = "en"):
         """Initialize workstation wizard."""
         self.language = language
-        self.system_detector = SystemDetector()
-        self.dependency_resolver = DependencyResolver()
-        self.network_scanner = NetworkScanner()
+        detection_cache = DetectionCache(path=DetectionCache.default_path())
+        self.system_detector = SystemDetector(cache=detection_cache)
+        self.dependency_resolver = DependencyResolver(detection_cache=detection_cache)
+        self.network_scanner = NetworkScanner(
+            cache=TopologyCache(), resolver=HostnameResolver(path=HostnameResolver.default_path()))
         self.config_validator = ConfigValidator()
         self.setup_logging()
 
@@ -224,9 +229,10 @@ class WorkstationWizard:
         self.logger.info("Analyzing system configuration")
 
         # Detect system information
-        system_info = self.system_detector.detect_comprehensive_info()
-        thermal_info = self.system_detector.detect_thermal_capabilities()
-        security_info = self.system_detector.detect_security_features()
+        detected = self.system_detector.detect_all()
+        system_info = detected["system"]
+        thermal_info = detected["thermal"]
+        security_info = detected["security"]
 
         # Detect network topology
         network_topology = self.network_scanner.discover_network_topology()